@@ -0,0 +1,40 @@
+import argparse
+import materia as mtr
+import numpy as np
+import timeit
+
+SCALAR = 2.4 * mtr.meter
+OTHER = -3.9 * mtr.meter
+ARRAY = np.arange(1000.0) * mtr.meter
+POSITIONS = np.random.default_rng(0).random((100, 3))
+
+BENCHMARKS = {
+    "add scalar": lambda: SCALAR + OTHER,
+    "subtract scalar": lambda: SCALAR - OTHER,
+    "add array": lambda: ARRAY + ARRAY,
+    "multiply by unit": lambda: 2 * mtr.meter,
+    "multiply quantities": lambda: SCALAR * OTHER,
+    "divide quantities": lambda: SCALAR / mtr.second,
+    "power": lambda: SCALAR ** 2,
+    "convert": lambda: mtr.hartree.convert(mtr.ev),
+    "unit": lambda: SCALAR.unit,
+    "compare": lambda: SCALAR < OTHER,
+    "dimension multiply": lambda: mtr.Dimension(L=1) * mtr.Dimension(T=1),
+    "index": lambda: ARRAY[5],
+    "atom": lambda: mtr.Atom(element="C", position=(0.0, 1.0, 2.0) * mtr.angstrom),
+    "structure positions": lambda: mtr.Structure(
+        *(mtr.Atom(element="C", position=p * mtr.angstrom) for p in POSITIONS)
+    ).atomic_positions,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, f in BENCHMARKS.items():
+        number = args.number // 100 if name == "structure positions" else args.number
+        best = min(timeit.repeat(f, repeat=args.repeat, number=number)) / number
+        print(f"{name:<24}{1e6 * best:10.2f} us")
@@ -0,0 +1,62 @@
+import argparse
+import materia as mtr
+import numpy as np
+import tempfile
+import time
+
+
+def water(seed):
+    rng = np.random.default_rng(seed)
+    positions = np.array(
+        [[0.0, 0.0, 0.1173], [0.0, 0.7572, -0.4692], [0.0, -0.7572, -0.4692]]
+    ) + 0.01 * rng.standard_normal((3, 3))
+
+    atoms = (
+        mtr.Atom(element=Z, position=p * mtr.angstrom)
+        for Z, p in zip(("O", "H", "H"), positions)
+    )
+
+    return mtr.Molecule(mtr.Structure(*atoms))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_molecules", type=int, default=10000)
+    parser.add_argument(
+        "--compute",
+        action="store_true",
+        help="also run the single points (requires a QChem installation)",
+    )
+    args = parser.parse_args()
+
+    molecules = [water(i) for i in range(args.num_molecules)]
+
+    settings = mtr.Settings()
+    settings["rem", "basis"] = "def2-svp"
+
+    qchem = mtr.QChem()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        start = time.perf_counter()
+        tasks = qchem.map(
+            "single_point", molecules, work_dir, settings=settings, name="sp"
+        )
+        mapped = time.perf_counter()
+        wf = mtr.Workflow(*tasks)
+        discovered = time.perf_counter()
+        wf.fingerprints()
+        fingerprinted = time.perf_counter()
+        # graph construction as done by compute, without running any task
+        wf._build()
+        built = time.perf_counter()
+        if args.compute:
+            wf.compute()
+        computed = time.perf_counter()
+
+    print(f"{len(tasks)} tasks, {len(wf.tasks)} graph nodes")
+    print(f"QChem.map:      {mapped - start:.3f} s")
+    print(f"task discovery: {discovered - mapped:.3f} s")
+    print(f"fingerprints:   {fingerprinted - discovered:.3f} s")
+    print(f"dask graph:     {built - fingerprinted:.3f} s")
+    if args.compute:
+        print(f"compute:        {computed - built:.3f} s")
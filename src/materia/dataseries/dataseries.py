@@ -2,19 +2,93 @@ from __future__ import annotations
 from typing import Callable, Iterable, Optional, Tuple, Union
 
 import copy
+import functools
+import hashlib
 import materia as mtr
-from ..utils import memoize
+from ..utils import Cached, cached_method, cached_property
 import numpy as np
 import scipy.integrate
 import scipy.interpolate
+import scipy.special
 
 # import matplotlib.pyplot as plt
 import warnings
 
 # __all__ = []
 
+_simpson = getattr(scipy.integrate, "simpson", None) or scipy.integrate.simps
+
+
+def _simpson_weights(x: np.ndarray) -> np.ndarray:
+    # weights w such that w @ y is Simpson's rule for samples y on the grid x,
+    # as in scipy.integrate.simpson, which corrects the last interval of grids
+    # with an even number of points
+    n = len(x)
+    h = np.diff(x)
+    w = np.zeros(n)
+
+    if n == 2:
+        w[:] = h[0] / 2
+    elif n > 2:
+        stop = n - 2 if n % 2 else n - 3
+        i = np.arange(0, stop, 2)
+        h0, h1 = h[i], h[i + 1]
+        hsum = h0 + h1
+        w[i] += hsum / 6 * (2 - h1 / h0)
+        w[i + 1] += hsum ** 3 / (6 * h0 * h1)
+        w[i + 2] += hsum / 6 * (2 - h0 / h1)
+
+        if n % 2 == 0:
+            a, b = h[-2], h[-1]
+            w[-1] += (2 * b ** 2 + 3 * a * b) / (6 * (a + b))
+            w[-2] += (b ** 2 + 3 * a * b) / (6 * a)
+            w[-3] -= b ** 3 / (6 * a * (a + b))
+
+    return w
+
+
+class _Grid:
+    # hashable wrapper keying cached resamplings by the contents of a grid
+    __slots__ = ("x", "_key")
+
+    def __init__(self, x: np.ndarray) -> None:
+        self.x = np.ascontiguousarray(x, dtype=float)
+        self._key = (
+            self.x.shape,
+            hashlib.blake2b(self.x.tobytes(), digest_size=16).digest(),
+        )
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Grid) and self._key == other._key
+
+
+def _resample_values(
+    x: np.ndarray,
+    y: np.ndarray,
+    x_to: np.ndarray,
+    spline: Optional[scipy.interpolate.CubicSpline] = None,
+) -> np.ndarray:
+    # cubic spline interpolation along the last axis of y, with linear
+    # extrapolation from the end slopes beyond the ends of x
+    if spline is None:
+        spline = scipy.interpolate.CubicSpline(x=x, y=y, axis=-1)
+    below, above = x_to < x[0], x_to > x[-1]
 
-class DataSeries:
+    values = spline(x_to)
+    values[..., below] = y[..., :1] + (y[..., 1:2] - y[..., :1]) / (x[1] - x[0]) * (
+        x_to[below] - x[0]
+    )
+    values[..., above] = y[..., -1:] + (y[..., -1:] - y[..., -2:-1]) / (
+        x[-1] - x[-2]
+    ) * (x_to[above] - x[-1])
+
+    return values
+
+
+class DataSeries(Cached):
     def __init__(self, x: mtr.Quantity, y: mtr.Quantity) -> None:
         self.x = x
         self.y = y
@@ -24,16 +98,110 @@ class DataSeries:
     #     plt.show()
 
 
+def broaden_lines(
+    centers: Union[np.ndarray, mtr.Quantity],
+    strengths: np.ndarray,
+    x: Union[np.ndarray, mtr.Quantity],
+    sigma: Optional[Union[float, mtr.Quantity]] = None,
+    gamma: Optional[Union[float, mtr.Quantity]] = None,
+    chunk_size: Optional[int] = 2 ** 22,
+) -> Union[np.ndarray, mtr.Quantity]:
+    """Broaden line spectra into continuous spectra.
+
+    Each line is replaced by a normalized Gaussian (only `sigma` given),
+    Lorentzian (only `gamma` given) or Voigt (both given) profile, and the
+    profiles of all lines are summed on the grid `x`. The profiles are
+    evaluated as a single NumPy kernel over lines and grid points, in blocks
+    of bounded size.
+
+    Parameters
+    ----------
+    centers : Union[np.ndarray, mtr.Quantity]
+        (..., N) positions of N lines for any number of spectra.
+    strengths : np.ndarray
+        Strengths of the lines, broadcastable to `centers`.
+    x : Union[np.ndarray, mtr.Quantity]
+        (M,) grid on which the broadened spectra are evaluated.
+    sigma : Optional[Union[float, mtr.Quantity]], optional
+        Standard deviation of the Gaussian component, by default None
+    gamma : Optional[Union[float, mtr.Quantity]], optional
+        Half width at half maximum of the Lorentzian component, by default None
+    chunk_size : Optional[int], optional
+        Maximum number of profile values held in memory at once,
+        by default 2 ** 22
+
+    Returns
+    -------
+    Union[np.ndarray, mtr.Quantity]
+        (..., M) broadened spectra, per unit of `x` if `x` is a quantity.
+
+    Raises
+    ------
+    ValueError
+        Raised if neither `sigma` nor `gamma` is given.
+    """
+    if sigma is None and gamma is None:
+        raise ValueError("Provide sigma, gamma, or both to broaden lines.")
+
+    unit = x.unit if isinstance(x, mtr.Quantity) else None
+
+    def _value(q):
+        if not isinstance(q, mtr.Quantity):
+            return q
+        return q.value if unit is None else q.convert(unit).value
+
+    x = np.asarray(_value(x), dtype=float)
+    centers = np.asarray(_value(centers), dtype=float)
+    sigma, gamma = _value(sigma), _value(gamma)
+    strengths = np.broadcast_to(np.asarray(strengths, dtype=float), centers.shape)
+
+    if gamma is None:
+
+        def profile(dx):
+            return np.exp(-0.5 * (dx / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+    elif sigma is None:
+
+        def profile(dx):
+            return gamma / (np.pi * (dx ** 2 + gamma ** 2))
+
+    else:
+
+        def profile(dx):
+            return scipy.special.voigt_profile(dx, sigma, gamma)
+
+    *batch_shape, num_lines = centers.shape
+    centers = centers.reshape(-1, num_lines)
+    strengths = strengths.reshape(-1, num_lines)
+    num_spectra, num_points = len(centers), len(x)
+
+    # block over spectra and lines so that at most chunk_size values are live
+    spectra_step = max(1, min(num_spectra, chunk_size // max(num_points, 1)))
+    lines_step = max(1, chunk_size // (spectra_step * max(num_points, 1)))
+
+    out = np.zeros((num_spectra, num_points))
+    for i in range(0, num_spectra, spectra_step):
+        rows = slice(i, i + spectra_step)
+        for j in range(0, num_lines, lines_step):
+            cols = slice(j, j + lines_step)
+            p = profile(x[None, None, :] - centers[rows, cols, None])
+            out[rows] += (strengths[rows, None, cols] @ p)[:, 0]
+
+    out = out.reshape(*batch_shape, num_points)
+
+    return out if unit is None else out / unit
+
+
 def broaden_gaussian(
     self, fwhm: mtr.Quantity
 ) -> Callable[Iterable[Union[int, float]], Iterable[Union[int, float]]]:
     def f(energies: mtr.Quantity) -> Iterable[Union[int, float]]:
-        s = 0
-        for excitation in self.excitations:
-            x = (energies - excitation.energy) / fwhm
-            x = np.array([e.value for e in x])
-            s += excitation.oscillator_strength * np.exp(-0.5 * x ** 2)
-        return s / (np.sqrt(2 * np.pi) * fwhm)
+        return broaden_lines(
+            [e.energy.convert(energies.unit).value for e in self.excitations],
+            [e.oscillator_strength for e in self.excitations],
+            energies,
+            sigma=fwhm,
+        )
 
     return f
 
@@ -43,7 +211,9 @@ def broaden_lorentzian(gamma):
         return gamma * omega / ((w ** 2 - omega ** 2) ** 2 + omega ** 2 * gamma ** 2)
 
     def f(omega, fs, ws):
-        return (fs[None, :] @ np.vstack([_f(omega, gamma, w) for w in ws])).squeeze()
+        return np.asarray(fs) @ _f(
+            np.asarray(omega)[None, :], gamma, np.asarray(ws)[:, None]
+        )
 
     return f
 
@@ -114,6 +284,39 @@ class TimeSeries(DataSeries):
 
 
 class Spectrum(DataSeries):
+    def resample(self, x: mtr.Quantity) -> mtr.Quantity:
+        """Values of the spectrum on another grid.
+
+        Values are interpolated with a cubic spline, which is built once per
+        spectrum, and linearly extrapolated beyond the ends of the spectrum.
+        Resampled values are cached per grid until `x` or `y` is reassigned.
+
+        Parameters
+        ----------
+        x : mtr.Quantity
+            Grid on which to evaluate the spectrum.
+
+        Returns
+        -------
+        mtr.Quantity
+            Read-only values of the spectrum on `x`.
+        """
+        values = self._resample(_Grid(x.convert(self.x.unit).value))
+        return mtr.Quantity._new(values, self.y.prefactor, self.y.dimension)
+
+    @cached_property
+    def _spline(self) -> scipy.interpolate.CubicSpline:
+        return scipy.interpolate.CubicSpline(x=self.x.value, y=self.y.value)
+
+    @cached_method(maxsize=16)
+    def _resample(self, grid: _Grid) -> np.ndarray:
+        values = _resample_values(
+            x=self.x.value, y=self.y.value, x_to=grid.x, spline=self._spline
+        )
+        values.setflags(write=False)
+
+        return values
+
     def match(self, match_to, in_place=True, interp_method="cubic_spline"):
         return self.extrapolate(x_extrap_to=match_to.x, in_place=in_place).interpolate(
             x_interp_to=match_to.x, in_place=in_place, method=interp_method
@@ -188,52 +391,36 @@ class AbsorptionSpectrum(Spectrum):
 
 class ReflectanceSpectrum(Spectrum):
     def reflect_illuminant(self, illuminant):
-        new_spectrum = copy.deepcopy(illuminant)
+        # x and y are reassigned, so a shallow copy leaves illuminant untouched
+        new_spectrum = copy.copy(illuminant)
         new_spectrum.x = self.x
-        new_spectrum.y = self.y * illuminant.match(match_to=self, in_place=False).y
+        new_spectrum.y = self.y * illuminant.resample(self.x)
         return new_spectrum
 
 
 class TransmittanceSpectrum(Spectrum):
     def transmit_illuminant(self, illuminant):
-        new_spectrum = copy.deepcopy(illuminant)
+        new_spectrum = copy.copy(illuminant)
         new_spectrum.x = self.x
-        new_spectrum.y = self.y * illuminant.match(match_to=self, in_place=False).y
+        new_spectrum.y = self.y * illuminant.resample(self.x)
         return new_spectrum
 
     def avt(self):
         from .data import ASTMG173
 
-        photopic = PhotopicResponse().match(match_to=self)
-        astmg = ASTMG173().match(match_to=self)
-        num = scipy.integrate.simps(
-            y=(self.y * astmg.y * photopic.y).value, x=self.x.value
-        )
-        denom = scipy.integrate.simps(y=(astmg.y * photopic.y).value, x=astmg.x.value)
+        photopic = resample_reference(PhotopicResponse, self.x)
+        astmg = resample_reference(ASTMG173, self.x)
+        num = _simpson(y=(self.y * astmg * photopic).value, x=self.x.value)
+        denom = _simpson(y=(astmg * photopic).value, x=self.x.value)
 
         return num / denom
 
 
 class SPDSpectrum(Spectrum):
-    @property
-    @memoize
+    @cached_property
     def XYZ(self) -> Tuple[float, float, float]:
-        # FIXME: this is an ugly workaround to avoid circular import - change it!!
-        from .data import (
-            CIE1931ColorMatchingFunctionX,
-            CIE1931ColorMatchingFunctionY,
-            CIE1931ColorMatchingFunctionZ,
-        )
-
-        xbar = CIE1931ColorMatchingFunctionX().match(match_to=self, in_place=True)
-        ybar = CIE1931ColorMatchingFunctionY().match(match_to=self, in_place=True)
-        zbar = CIE1931ColorMatchingFunctionZ().match(match_to=self, in_place=True)
-
-        X = scipy.integrate.simps(y=(self.y * xbar.y).value, x=self.x.value)
-        Y = scipy.integrate.simps(y=(self.y * ybar.y).value, x=self.x.value)
-        Z = scipy.integrate.simps(y=(self.y * zbar.y).value, x=self.x.value)
-
-        return X / Y, 1.0, Z / Y
+        X, Y, Z = spd_XYZ(x=self.x, spds=self.y.value)
+        return X, Y, Z
 
     # FIXME: verify correctness with test case
     def von_kries_XYZ(self, source_illuminant, destination_illuminant):
@@ -314,139 +501,22 @@ class SPDSpectrum(Spectrum):
 
     @property
     def CCT_DC(self) -> Tuple[mtr.Quantity, float]:
-        u, v = self.uv
-        uvT = planckian_locus_ucs(exact=True)
-
-        def _error(T):
-            uT, vT = uvT(T=T)
-            return (uT - u) ** 2 + (vT - v) ** 2
-
-        CCT, DC_squared, _, _ = scipy.optimize.fminbound(
-            func=_error, x1=1000, x2=15000, full_output=True
-        )
-
-        return CCT * mtr.K, np.sqrt(DC_squared)
+        CCT, DC = correlated_color_temperature(self.uv)
+        return float(CCT) * mtr.K, float(DC)
 
     def cri(self, strict=True):
-        # FIXME: this is an ugly workaround to avoid circular import - change it!!
-        from .data import CIEIlluminantDSeries
-        from .data import (
-            CIE1995TestColorSample01,
-            CIE1995TestColorSample02,
-            CIE1995TestColorSample03,
-            CIE1995TestColorSample04,
-            CIE1995TestColorSample05,
-            CIE1995TestColorSample06,
-            CIE1995TestColorSample07,
-            CIE1995TestColorSample08,
-        )
-
-        CCT, DC = self.CCT_DC
-
-        if DC > 5.4e-3:
-            if strict:
-                raise ValueError(
-                    """Distance from UCS Planckian locus too high.
-                        Illuminant is insufficiently white for accurate
-                        CRI determination."""
-                )
-            else:
-                warnings.warn(
-                    """Distance from UCS Planckian locus too high.
-                        Illuminant is insufficiently white for accurate
-                        CRI determination."""
-                )
-
-        if CCT < 5000 * mtr.K:
-            from .data import BlackbodySPD
-
-            reference_illuminant = BlackbodySPD(T=CCT, normalize_to=1)
-        else:
-            reference_illuminant = CIEIlluminantDSeries(T=CCT, normalize_to=1)
-
-        samples = (
-            CIE1995TestColorSample01(),
-            CIE1995TestColorSample02(),
-            CIE1995TestColorSample03(),
-            CIE1995TestColorSample04(),
-            CIE1995TestColorSample05(),
-            CIE1995TestColorSample06(),
-            CIE1995TestColorSample07(),
-            CIE1995TestColorSample08(),
-        )
-
-        u_ref, v_ref = reference_illuminant.uv
-
-        R_mean = np.mean(
-            tuple(
-                self.R_score(
-                    test_illuminant=self,
-                    reference_illuminant=reference_illuminant,
-                    sample_reflectance=sample,
-                )
-                for sample in samples
-            )
-        )
-        # (TCS01,TCS02,TCS03,TCS04,TCS05,TCS06,TCS07,TCS08)))
-
-        return R_mean
+        return float(color_rendering_index(x=self.x, spds=self.y, strict=strict))
 
     def R_score(self, test_illuminant, reference_illuminant, sample_reflectance):
-        u_ref, v_ref = reference_illuminant.uv
-
-        reflected_reference_illuminant = sample_reflectance.reflect_illuminant(
-            reference_illuminant
-        )
-        u_sample_ref, v_sample_ref = reflected_reference_illuminant.uv
-
-        _, reference_Y, _ = reference_illuminant.XYZ
-        reflected_X, reflected_Y, reflected_Z = reflected_reference_illuminant.XYZ
-
-        X_sample_ref = reflected_X * 100 / reference_Y
-        Y_sample_ref = reflected_Y * 100 / reference_Y
-        Z_sample_ref = reflected_Z * 100 / reference_Y
-        U_ref, V_ref, W_ref = self._XYZ_to_UVW(
-            X=X_sample_ref, Y=Y_sample_ref, Z=Z_sample_ref, white_point=(u_ref, v_ref)
-        )
-
-        reflected_test_illuminant = sample_reflectance.reflect_illuminant(
-            illuminant=test_illuminant
-        )
-        u_sample_test, v_sample_test = reflected_test_illuminant.uv
-        u_sample_adapted, v_sample_adapted = self.von_kries_uv(
-            u=u_sample_test,
-            v=v_sample_test,
-            source_illuminant=test_illuminant,
-            destination_illuminant=reference_illuminant,
-        )
-
-        _, test_Y, _ = test_illuminant.XYZ
-        (
-            reflected_test_X,
-            reflected_test_Y,
-            reflected_test_Z,
-        ) = reflected_test_illuminant.XYZ
-
-        X_sample_test = reflected_test_X * 100 / test_Y
-        Y_sample_test = reflected_test_Y * 100 / test_Y
-        Z_sample_test = reflected_test_Z * 100 / test_Y
-        U_test, V_test, W_test = self._XYZ_to_UVW(
-            X=X_sample_test,
-            Y=Y_sample_test,
-            Z=Z_sample_test,
-            white_point=(u_ref, v_ref),
-        )
-        # FIXME: using the next three lines improves the answer for
-        # high temp blackbodies but they seem wrong...
-        # W_test = 25*np.power(Y_sample_test,1/3) - 17
-        # U_test = 13*W_test*(u_sample_adapted - u_ref)
-        # V_test = 13*W_test*(v_sample_adapted - v_ref)
-
-        distance = np.sqrt(
-            (U_ref - U_test) ** 2 + (V_ref - V_test) ** 2 + (W_ref - W_test) ** 2
+        x = sample_reflectance.x
+        [R] = _special_color_rendering_indices(
+            x=x,
+            test=test_illuminant.resample(x).value,
+            reference=reference_illuminant.resample(x).value,
+            samples=sample_reflectance.y.value[None],
         )
 
-        return 100 - 4.6 * distance
+        return R
 
     def von_kries_uv(self, u, v, source_illuminant, destination_illuminant):
         u_s, v_s = source_illuminant.uv
@@ -491,6 +561,383 @@ def hunt_pointer_estevez_transform() -> np.ndarray:
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _reference_spectrum(cls: type) -> Spectrum:
+    return cls()
+
+
+def resample_reference(cls: type, x: mtr.Quantity) -> mtr.Quantity:
+    """Values of a tabulated reference spectrum on a grid.
+
+    Reference spectra, e.g. `CIE1931ColorMatchingFunctionX` or `ASTMG173`, are
+    instantiated once per class and shared, so that their interpolating
+    splines and resampled values are reused across calls.
+
+    Parameters
+    ----------
+    cls : type
+        Spectrum class taking no arguments.
+    x : mtr.Quantity
+        Grid on which to evaluate the reference spectrum.
+
+    Returns
+    -------
+    mtr.Quantity
+        Read-only values of the reference spectrum on `x`.
+    """
+    return _reference_spectrum(cls).resample(x)
+
+
+def tristimulus_weights(x: mtr.Quantity) -> np.ndarray:
+    """Quadrature weights for the CIE 1931 tristimulus values on a wavelength grid.
+
+    The color matching functions are resampled onto `x` and multiplied by
+    Simpson's rule weights, so that the tristimulus values of any spectrum
+    sampled on `x` are a single matrix product with the returned weights.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid.
+
+    Returns
+    -------
+    np.ndarray
+        (M,3) read-only weights for X, Y and Z.
+    """
+    return _tristimulus_weights(_Grid(x.convert(mtr.nm).value))
+
+
+@functools.lru_cache(maxsize=16)
+def _tristimulus_weights(grid: _Grid) -> np.ndarray:
+    # FIXME: this is an ugly workaround to avoid circular import - change it!!
+    from .data import (
+        CIE1931ColorMatchingFunctionX,
+        CIE1931ColorMatchingFunctionY,
+        CIE1931ColorMatchingFunctionZ,
+    )
+
+    x = grid.x * mtr.nm
+    cmfs = np.stack(
+        [
+            resample_reference(cmf, x).value
+            for cmf in (
+                CIE1931ColorMatchingFunctionX,
+                CIE1931ColorMatchingFunctionY,
+                CIE1931ColorMatchingFunctionZ,
+            )
+        ],
+        axis=-1,
+    )
+
+    weights = _simpson_weights(grid.x)[:, None] * cmfs
+    weights.setflags(write=False)
+
+    return weights
+
+
+def spd_XYZ(x: mtr.Quantity, spds: Union[np.ndarray, mtr.Quantity]) -> np.ndarray:
+    """Relative CIE 1931 tristimulus values of many SPDs at once.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid shared by all spectra.
+    spds : Union[np.ndarray, mtr.Quantity]
+        (..., M) spectral power distributions sampled on `x`.
+
+    Returns
+    -------
+    np.ndarray
+        (..., 3) tristimulus values X, Y, Z normalized so that Y = 1.
+    """
+    if isinstance(spds, mtr.Quantity):
+        spds = spds.value
+
+    XYZ = np.asarray(spds, dtype=float) @ tristimulus_weights(x)
+
+    return XYZ / XYZ[..., 1:2]
+
+
+def spd_xy(x: mtr.Quantity, spds: Union[np.ndarray, mtr.Quantity]) -> np.ndarray:
+    """CIE 1931 chromaticity coordinates of many SPDs at once.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid shared by all spectra.
+    spds : Union[np.ndarray, mtr.Quantity]
+        (..., M) spectral power distributions sampled on `x`.
+
+    Returns
+    -------
+    np.ndarray
+        (..., 2) chromaticity coordinates x, y.
+    """
+    XYZ = spd_XYZ(x=x, spds=spds)
+    return XYZ[..., :2] / XYZ.sum(axis=-1, keepdims=True)
+
+
+def spd_uv(x: mtr.Quantity, spds: Union[np.ndarray, mtr.Quantity]) -> np.ndarray:
+    """CIE 1960 UCS chromaticity coordinates of many SPDs at once.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid shared by all spectra.
+    spds : Union[np.ndarray, mtr.Quantity]
+        (..., M) spectral power distributions sampled on `x`.
+
+    Returns
+    -------
+    np.ndarray
+        (..., 2) chromaticity coordinates u, v.
+    """
+    xy = spd_xy(x=x, spds=spds)
+    denom = -2 * xy[..., 0] + 12 * xy[..., 1] + 3
+    return np.stack((4 * xy[..., 0] / denom, 6 * xy[..., 1] / denom), axis=-1)
+
+
+def spd_LMS(x: mtr.Quantity, spds: Union[np.ndarray, mtr.Quantity]) -> np.ndarray:
+    """Hunt-Pointer-Estevez cone responses of many SPDs at once.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid shared by all spectra.
+    spds : Union[np.ndarray, mtr.Quantity]
+        (..., M) spectral power distributions sampled on `x`.
+
+    Returns
+    -------
+    np.ndarray
+        (..., 3) cone responses L, M, S.
+    """
+    return spd_XYZ(x=x, spds=spds) @ hunt_pointer_estevez_transform().T
+
+
+def _blackbody(x: np.ndarray, T: np.ndarray) -> np.ndarray:
+    # unnormalized Planck spectra on wavelengths x (nm) for temperatures T (K)
+    c2 = (mtr.h * mtr.c / mtr.kB).convert(mtr.nm * mtr.K).value
+    T = np.asarray(T, dtype=float)[..., None]
+
+    return x ** (-5) / np.expm1(c2 / (x * T))
+
+
+def _daylight(x: np.ndarray, T: np.ndarray) -> np.ndarray:
+    # unnormalized CIE daylight spectra on wavelengths x (nm) for
+    # temperatures T (K) between 4000 K and 25000 K
+    # FIXME: this is an ugly workaround to avoid circular import - change it!!
+    from .data import SimmonsDSeriesPCA0, SimmonsDSeriesPCA1, SimmonsDSeriesPCA2
+
+    # equations taken from http://www.brucelindbloom.com/Eqn_T_to_xy.html
+    T = np.asarray(T, dtype=float)
+    xD = np.where(
+        T <= 7000,
+        -4.6070e9 / T ** 3 + 2.9678e6 / T ** 2 + 0.09911e3 / T + 0.244063,
+        -2.0064e9 / T ** 3 + 1.9018e6 / T ** 2 + 0.24748e3 / T + 0.237040,
+    )
+    yD = -3.000 * xD ** 2 + 2.870 * xD - 0.275
+
+    # equations taken from
+    # http://www.brucelindbloom.com/index.html?Eqn_DIlluminant.html
+    M = 0.0241 + 0.2562 * xD - 0.7341 * yD
+    M1 = (-1.3515 - 1.7703 * xD + 5.9114 * yD) / M
+    M2 = (0.0300 - 31.4424 * xD + 30.0717 * yD) / M
+
+    x = x * mtr.nm
+    S0, S1, S2 = (
+        resample_reference(cls, x).value
+        for cls in (SimmonsDSeriesPCA0, SimmonsDSeriesPCA1, SimmonsDSeriesPCA2)
+    )
+
+    return S0 + M1[..., None] * S1 + M2[..., None] * S2
+
+
+@functools.lru_cache(maxsize=None)
+def _planckian_locus_table() -> Tuple[np.ndarray, np.ndarray]:
+    # Planckian locus in the CIE 1960 UCS, tabulated at geometrically spaced
+    # temperatures from exact blackbody spectra on the BlackbodySPD grid
+    x = np.linspace(380, 780, 1001)
+    T = np.geomspace(1000, 15000, 2001)
+    uv = spd_uv(x=x * mtr.nm, spds=_blackbody(x=x, T=T))
+
+    T.setflags(write=False)
+    uv.setflags(write=False)
+
+    return T, uv
+
+
+def correlated_color_temperature(
+    uv: Union[Tuple[float, float], np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Correlated color temperatures and distances from the Planckian locus.
+
+    The closest point of a precomputed Planckian locus table between 1000 K and
+    15000 K is refined by parabolic interpolation of the squared distance.
+
+    Parameters
+    ----------
+    uv : Union[Tuple[float, float], np.ndarray]
+        (..., 2) CIE 1960 UCS chromaticity coordinates.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        (...) correlated color temperatures in kelvin and (...) distances
+        from the Planckian locus in the UCS.
+    """
+    T, uv_T = _planckian_locus_table()
+    uv = np.asarray(uv, dtype=float)
+
+    d = ((uv[..., None, :] - uv_T) ** 2).sum(axis=-1)
+    i = np.clip(d.argmin(axis=-1), 1, len(T) - 2)[..., None]
+    d0, d1, d2 = (np.take_along_axis(d, i + k, axis=-1)[..., 0] for k in (-1, 0, 1))
+
+    # vertex of the parabola through the three closest points, which are
+    # evenly spaced in log(T)
+    a = 0.5 * (d0 + d2) - d1
+    b = 0.5 * (d2 - d0)
+    safe_a = np.where(a > 0, a, 1.0)
+    t = np.where(a > 0, np.clip(-b / (2 * safe_a), -1, 1), 0.0)
+    d_min = d1 + b * t + a * t ** 2
+
+    log_T = np.log(T)
+    CCT = np.exp(log_T[i[..., 0]] + t * (log_T[1] - log_T[0]))
+
+    return CCT, np.sqrt(np.maximum(d_min, 0))
+
+
+def _uv(XYZ: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    X, Y, Z = np.moveaxis(XYZ, -1, 0)
+    denom = X + 15 * Y + 3 * Z
+    return 4 * X / denom, 6 * Y / denom
+
+
+def _special_color_rendering_indices(
+    x: mtr.Quantity, test: np.ndarray, reference: np.ndarray, samples: np.ndarray
+) -> np.ndarray:
+    # CIE 13.3 special color rendering indices of (..., K) test illuminants
+    # against (..., K) reference illuminants for (S, K) sample reflectances,
+    # all sampled on the wavelength grid x
+    w = tristimulus_weights(x)
+
+    def _colorimetry(illuminant):
+        XYZ_white = illuminant @ w
+        XYZ = (illuminant[..., None, :] * samples) @ w
+        Y = 100 * XYZ[..., 1] / XYZ_white[..., 1:2]
+        (u_white, v_white), (u, v) = _uv(XYZ_white), _uv(XYZ)
+        return u_white[..., None], v_white[..., None], u, v, Y
+
+    u_r, v_r, u_ri, v_ri, Y_ri = _colorimetry(reference)
+    u_k, v_k, u_ki, v_ki, Y_ki = _colorimetry(test)
+
+    # von Kries chromatic adaptation of the samples under the test illuminant
+    def _cd(u, v):
+        return (4 - u - 10 * v) / v, (1.708 * v + 0.404 - 1.481 * u) / v
+
+    (c_r, d_r), (c_k, d_k), (c_ki, d_ki) = _cd(u_r, v_r), _cd(u_k, v_k), _cd(u_ki, v_ki)
+    c, d = c_r / c_k * c_ki, d_r / d_k * d_ki
+    denom = 16.518 + 1.481 * c - d
+    u_ki, v_ki = (10.872 + 0.404 * c - 4 * d) / denom, 5.520 / denom
+
+    def _UVW(u, v, Y):
+        W = 25 * np.cbrt(Y) - 17
+        return np.stack((13 * W * (u - u_r), 13 * W * (v - v_r), W), axis=-1)
+
+    distance = np.linalg.norm(_UVW(u_ri, v_ri, Y_ri) - _UVW(u_ki, v_ki, Y_ki), axis=-1)
+
+    return 100 - 4.6 * distance
+
+
+def color_rendering_index(
+    x: mtr.Quantity, spds: Union[np.ndarray, mtr.Quantity], strict: bool = True
+) -> np.ndarray:
+    """CIE 13.3 general color rendering indices of many SPDs at once.
+
+    Correlated color temperatures are looked up from a precomputed Planckian
+    locus, and the test illuminants, their Planckian or daylight reference
+    illuminants and the eight test color samples are evaluated together on the
+    wavelength grid of the test color samples.
+
+    Parameters
+    ----------
+    x : mtr.Quantity
+        (M,) wavelength grid shared by all spectra.
+    spds : Union[np.ndarray, mtr.Quantity]
+        (..., M) spectral power distributions sampled on `x`.
+    strict : bool, optional
+        Whether to raise rather than warn if an SPD is too far from the
+        Planckian locus for an accurate result, by default True
+
+    Returns
+    -------
+    np.ndarray
+        (...) general color rendering indices.
+
+    Raises
+    ------
+    ValueError
+        Raised if `strict` and an SPD is too far from the Planckian locus.
+    """
+    # FIXME: this is an ugly workaround to avoid circular import - change it!!
+    from .data import (
+        CIE1995TestColorSample01,
+        CIE1995TestColorSample02,
+        CIE1995TestColorSample03,
+        CIE1995TestColorSample04,
+        CIE1995TestColorSample05,
+        CIE1995TestColorSample06,
+        CIE1995TestColorSample07,
+        CIE1995TestColorSample08,
+    )
+
+    if isinstance(spds, mtr.Quantity):
+        spds = spds.value
+    spds = np.asarray(spds, dtype=float)
+
+    CCT, DC = correlated_color_temperature(spd_uv(x=x, spds=spds))
+
+    if np.any(DC > 5.4e-3):
+        message = """Distance from UCS Planckian locus too high.
+                Illuminant is insufficiently white for accurate
+                CRI determination."""
+        if strict:
+            raise ValueError(message)
+        warnings.warn(message)
+
+    samples = tuple(
+        _reference_spectrum(cls)
+        for cls in (
+            CIE1995TestColorSample01,
+            CIE1995TestColorSample02,
+            CIE1995TestColorSample03,
+            CIE1995TestColorSample04,
+            CIE1995TestColorSample05,
+            CIE1995TestColorSample06,
+            CIE1995TestColorSample07,
+            CIE1995TestColorSample08,
+        )
+    )
+    grid = samples[0].x.convert(mtr.nm)
+
+    test = _resample_values(x=x.convert(mtr.nm).value, y=spds, x_to=grid.value)
+    reference = np.where(
+        CCT[..., None] < 5000,
+        _blackbody(x=grid.value, T=CCT),
+        _daylight(x=grid.value, T=np.maximum(CCT, 4000)),
+    )
+
+    R = _special_color_rendering_indices(
+        x=grid,
+        test=test,
+        reference=reference,
+        samples=np.stack([sample.resample(grid).value for sample in samples]),
+    )
+
+    return R.mean(axis=-1)
+
+
 def planckian_locus_xyz(
     exact: Optional[bool] = False,
 ) -> Callable[mtr.Quantity, Tuple[float, float]]:
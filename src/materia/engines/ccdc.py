@@ -116,4 +116,6 @@ class CCDCUnitCellStructure(ExternalTask):
             input_string += "        pass\n\n"
             mtr.CCDCInput(ccdc_script=input_string).write(io.inp)
 
-            return self.engine.execute(self.io)
+            return self.engine.execute(
+                self.io, return_output=True, monitors=self.monitors()
+            )
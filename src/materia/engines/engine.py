@@ -1,11 +1,152 @@
 from __future__ import annotations
-from typing import Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+import asyncio
+import contextlib
 import materia
+import os
 import shlex
 import subprocess
+import time
+import weakref
 
-__all__ = ["Engine"]
+__all__ = ["Engine", "ExecutionLimiter"]
+
+
+class ExecutionLimiter:
+    """Bound the number of external processes run concurrently by `execute_async`.
+
+    The limit applies per event loop, so one limiter can be shared by any number
+    of engines and coroutines.
+
+    Parameters
+    ----------
+    max_executions : Optional[int], optional
+        Maximum number of concurrently running processes, by default the number
+        of CPUs.
+    """
+
+    def __init__(self, max_executions: Optional[int] = None) -> None:
+        self.max_executions = max_executions or os.cpu_count() or 1
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # semaphores are bound to the loop they are first used in
+        loop = asyncio.get_running_loop()
+        try:
+            return self._semaphores[loop]
+        except KeyError:
+            return self._semaphores.setdefault(
+                loop, asyncio.Semaphore(self.max_executions)
+            )
+
+    async def __aenter__(self) -> ExecutionLimiter:
+        await self._semaphore().acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._semaphore().release()
+
+
+_DEFAULT_LIMITER = ExecutionLimiter()
+
+
+# seconds between checks of the output of monitored executions
+_POLL_INTERVAL = 0.1
+
+
+@contextlib.contextmanager
+def _tail(filepath: str):
+    # yields a function returning the lines appended to filepath since its
+    # last call, holding back an incomplete last line until final is set
+    partial = ""
+
+    with open(filepath, "r") as f:
+
+        def lines(final: bool) -> List[str]:
+            nonlocal partial
+            *complete, partial = (partial + f.read()).split("\n")
+            if final and partial:
+                complete.append(partial)
+                partial = ""
+            return complete
+
+        yield lines
+
+
+def _call(
+    cmd: Iterable[str],
+    input: Optional[str] = None,
+    output: Optional[str] = None,
+    monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    **kwargs: Any,
+) -> int:
+    if not monitors:
+        return subprocess.run(
+            cmd, input=None if input is None else input.encode(), **kwargs
+        ).returncode
+
+    if input is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    with subprocess.Popen(cmd, **kwargs) as process, _tail(output) as tail:
+        try:
+            if input is not None:
+                process.stdin.write(input.encode())
+                process.stdin.close()
+            while True:
+                finished = process.poll() is not None
+                for line in tail(final=finished):
+                    for monitor in monitors:
+                        monitor(line)
+                if finished:
+                    return process.returncode
+                time.sleep(_POLL_INTERVAL)
+        except BaseException:
+            # a monitor gave up on the job
+            process.kill()
+            raise
+
+
+async def _call_async(
+    cmd: Iterable[str],
+    input: Optional[str] = None,
+    output: Optional[str] = None,
+    monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    **kwargs: Any,
+) -> int:
+    if input is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+    try:
+        if not monitors:
+            await process.communicate(None if input is None else input.encode())
+            return process.returncode
+
+        if input is not None:
+            process.stdin.write(input.encode())
+            await process.stdin.drain()
+            process.stdin.close()
+        with _tail(output) as tail:
+            while True:
+                finished = process.returncode is not None
+                for line in tail(final=finished):
+                    for monitor in monitors:
+                        monitor(line)
+                if finished:
+                    return process.returncode
+                await asyncio.sleep(_POLL_INTERVAL)
+    except BaseException:
+        # do not leave orphaned processes behind cancelled executions
+        # or jobs which a monitor gave up on
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+
+def _read(filepath: str) -> str:
+    with open(filepath, "r") as f:
+        return f.read()
 
 
 class Engine:
@@ -25,6 +166,20 @@ class Engine:
     def env(self) -> Dict[str, str]:
         return None
 
+    def _env(self, io: materia.utils._IO) -> Dict[str, str]:
+        # environment of a single execution, which may depend on its IO
+        return self.env()
+
+    def resources(self) -> Dict[str, float]:
+        """Return the resources claimed by a single execution of this Engine.
+
+        Returns
+        -------
+        Dict[str, float]
+            Resource requirements, e.g. {"cores": 4}.
+        """
+        return {"cores": (self.num_processors or 1) * (self.num_threads or 1)}
+
     def command(
         self,
         inp: str,
@@ -37,18 +192,96 @@ class Engine:
         # FIXME: shlex.quote should be used but it doesn't work...
         return shlex.split(f"{self.executable} {arg_str}")
 
-    def execute(self, io: materia.IO, arguments: Optional[Iterable[str]] = None) -> str:
+    def execute(
+        self,
+        io: materia.IO,
+        arguments: Optional[Iterable[str]] = None,
+        return_output: Optional[bool] = False,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> Optional[str]:
+        """Run the engine on an input file, writing its output to a file.
+
+        Parameters
+        ----------
+        io : materia.IO
+            Input file, output file and working directory.
+        arguments : Optional[Iterable[str]], optional
+            Arguments passed in addition to the engine's own, by default None
+        return_output : Optional[bool], optional
+            Whether to read and return the output file, by default False
+        monitors : Optional[Iterable[Callable[[str], Any]]], optional
+            Callables fed each line of the output file, without its newline, as
+            it is written. An exception raised by a monitor kills the process
+            and is propagated, by default None
+
+        Returns
+        -------
+        Optional[str]
+            Contents of the output file if `return_output`, otherwise None.
+        """
         with io() as _io:
             cmd = self.command(_io.inp, _io.out, _io.work_dir, arguments)
-            with open(_io.inp, "r") as inp:
-                with open(_io.out, "w") as out:
-                    env = self.env()
-                    if env is None:
-                        subprocess.call(cmd, stdin=inp, stdout=out, cwd=io.work_dir)
-                    else:
-                        subprocess.call(
-                            cmd, stdin=inp, stdout=out, env=self.env(), cwd=io.work_dir
-                        )
-
-            with open(_io.out, "r") as f:
-                return "".join(f.readlines())
+            with open(_io.inp, "r") as inp, open(_io.out, "w") as out:
+                _call(
+                    cmd,
+                    output=_io.out,
+                    monitors=monitors,
+                    stdin=inp,
+                    stdout=out,
+                    env=self._env(_io),
+                    cwd=_io.work_dir,
+                )
+
+            return _read(_io.out) if return_output else None
+
+    async def execute_async(
+        self,
+        io: materia.IO,
+        arguments: Optional[Iterable[str]] = None,
+        return_output: Optional[bool] = False,
+        limiter: Optional[ExecutionLimiter] = None,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> Optional[str]:
+        """Run the engine as a coroutine, like `execute`.
+
+        Many executions can be awaited concurrently from a single thread, e.g.
+        with `asyncio.gather`; each needs its own `materia.IO`.
+
+        Parameters
+        ----------
+        io : materia.IO
+            Input file, output file and working directory.
+        arguments : Optional[Iterable[str]], optional
+            Arguments passed in addition to the engine's own, by default None
+        return_output : Optional[bool], optional
+            Whether to read and return the output file, by default False
+        limiter : Optional[ExecutionLimiter], optional
+            Limiter bounding the number of concurrent processes, by default a
+            limiter shared by all engines allowing one process per CPU.
+        monitors : Optional[Iterable[Callable[[str], Any]]], optional
+            Callables fed each line of the output file, without its newline, as
+            it is written. An exception raised by a monitor kills the process
+            and is propagated, by default None
+
+        Returns
+        -------
+        Optional[str]
+            Contents of the output file if `return_output`, otherwise None.
+        """
+        # files are only opened once a slot is free, so that any number of
+        # executions can be awaited at once
+        async with limiter or _DEFAULT_LIMITER:
+            with io() as _io:
+                cmd = self.command(_io.inp, _io.out, _io.work_dir, arguments)
+                with open(_io.inp, "r") as inp, open(_io.out, "w") as out:
+                    await _call_async(
+                        cmd,
+                        output=_io.out,
+                        monitors=monitors,
+                        stdin=inp,
+                        stdout=out,
+                        env=self._env(_io),
+                        cwd=_io.work_dir,
+                    )
+
+                return _read(_io.out) if return_output else None
@@ -4,7 +4,6 @@ from typing import Iterable, Optional, Tuple
 import materia as mtr
 import pathlib
 import shlex
-import subprocess
 
 from .engine import Engine
 from ..tasks import ExternalTask
@@ -32,18 +31,6 @@ class FragIt(Engine):
         # FIXME: shlex.quote should be used but it doesn't work...
         return shlex.split(f"{self.executable} {inp} {arg_str}")
 
-    def execute(self, io_params: mtr.IO) -> str:
-        with io_params() as io:
-            cmd = self.command(io.inp, io.out, io.work_dir)
-            with open(io.inp, "r") as inp:
-                with open(io.out, "w") as out:
-                    subprocess.call(
-                        cmd, stdin=inp, stdout=out, env=self.env(), cwd=io.work_dir
-                    )
-
-            with open(io.out, "r") as f:
-                return "".join(f.readlines())
-
     def fragment(
         self,
         io: mtr.IO,
@@ -68,7 +55,7 @@ class FragItFragment(ExternalTask):
         with self.io() as io:
             molecule.structure.write(io.inp)
 
-            self.engine.execute(self.io)
+            self.engine.execute(self.io, monitors=self.monitors())
             name = pathlib.Path(io.inp).stem
 
             return tuple(
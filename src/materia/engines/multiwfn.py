@@ -1,11 +1,11 @@
 from __future__ import annotations
-from typing import Any, Iterable, Optional, Tuple, Union
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
 
 import materia as mtr
 import re
 import subprocess
 
-from .engine import Engine
+from .engine import _DEFAULT_LIMITER, Engine, _call, _call_async, _read
 from ..tasks import ExternalTask
 
 __all__ = ["Multiwfn", "MultiwfnInput", "MultiwfnOutput"]
@@ -70,38 +70,61 @@ class Multiwfn(Engine):
     ) -> None:
         super().__init__(executable, num_processors, num_threads, arguments)
 
-    def execute(self, io_params: mtr.IO) -> str:
-        env = self.env()
+    def _input(self, inp: str) -> str:
+        with open(inp, "r") as f:
+            input_lines = f.read()
 
-        with io_params() as io:
-            cmd = self.command(io.inp, io.out, io.work_dir)
+        if self.num_processors is not None:
+            # set the number of threads through Multiwfn's settings menu first
+            input_lines = f"1000\n10\n{self.num_processors}\n" + input_lines
 
-            with open(io.inp, "r") as inp:
-                input_lines = "".join(inp.readlines())
+        return input_lines
 
-            if self.num_processors is not None:
-                input_lines = ["1000\n", "10\n", f"{self.num_processors}\n"]
+    def execute(
+        self,
+        io_params: mtr.IO,
+        return_output: Optional[bool] = False,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> Optional[str]:
+        with io_params() as io:
+            cmd = self.command(io.inp, io.out, io.work_dir)
 
             with open(io.out, "w") as out:
-                # For Multiwfn 3.6
-                # FIXME: printf is system-specific -
-                # is there any other way to pipe in input_lines?
-                pipe_command_string = subprocess.Popen(
-                    args=["printf", input_lines],
-                    stdout=subprocess.PIPE,
-                    encoding="utf-8",
-                    env=env,
-                )
-                multiwfn = subprocess.Popen(
+                _call(
                     cmd,
-                    stdin=pipe_command_string.stdout,
+                    input=self._input(io.inp),
                     stdout=out,
                     stderr=subprocess.STDOUT,
-                    encoding="utf-8",
-                    env=env,
+                    env=self._env(io),
+                    output=io.out,
+                    monitors=monitors,
                 )
-                pipe_command_string.stdout.close()
-                multiwfn.communicate()
+
+            return _read(io.out) if return_output else None
+
+    async def execute_async(
+        self,
+        io_params: mtr.IO,
+        return_output: Optional[bool] = False,
+        limiter: Optional[mtr.ExecutionLimiter] = None,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> Optional[str]:
+        async with limiter or _DEFAULT_LIMITER:
+            with io_params() as io:
+                cmd = self.command(io.inp, io.out, io.work_dir)
+
+                with open(io.out, "w") as out:
+                    await _call_async(
+                        cmd,
+                        input=self._input(io.inp),
+                        stdout=out,
+                        stderr=subprocess.STDOUT,
+                        env=self._env(io),
+                        output=io.out,
+                        monitors=monitors,
+                    )
+
+                return _read(io.out) if return_output else None
 
     def nto(
         self,
@@ -133,7 +156,7 @@ class MultiwfnBaseTask(ExternalTask):
         with self.io() as io:
             inp.write(io.inp)
 
-            self.engine.execute(self.io)
+            self.engine.execute(self.io, monitors=self.monitors())
 
             return self.parse(io.out)
 
@@ -167,7 +190,7 @@ class MultiwfnNTO(MultiwfnBaseTask):
             )
             inp.write(io.inp)
 
-            self.engine.execute(self.io)
+            self.engine.execute(self.io, monitors=self.monitors())
 
             return self.parse(io.out)
 
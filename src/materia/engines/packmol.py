@@ -87,7 +87,7 @@ class PackmolSolvate(ExternalTask):
 
                 inp.write(io.inp)
 
-                self.engine.execute(self.io)
+                self.engine.execute(self.io, monitors=self.monitors())
 
                 return mtr.Molecule(mtr.expand(path="packed.xyz", dir=io.work_dir))
 
@@ -3,22 +3,27 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import ast
 import cclib
+import contextlib
 import copy
 import functools
+import itertools
 import materia as mtr
+import mmap
 import numpy as np
 import os
 import re
 import scipy.spatial
 import shlex
 import subprocess
+import tempfile
+import threading
 
-from materia.utils import memoize
+from materia.utils import cached_property
 from materia.workflow import Workflow
 from .engine import Engine
 from ..tasks import ExternalTask, Task
 
-__all__ = ["QChem", "QChemInput", "QChemOutput"]
+__all__ = ["QChem", "QChemInput", "QChemOutput", "QChemTrajectory"]
 
 
 class QChemInput:
@@ -160,27 +165,81 @@ def _xc_functional_str(*functional_tuples: Tuple[str, str, str]) -> str:
 # --------------------------- OUTPUT ----------------------------- #
 
 
+# byte patterns marking the start of each section of a Q-Chem output which
+# QChemOutput knows how to parse, combined so that the file is indexed
+# in a single pass
+_SECTION_PATTERNS = {
+    "job": rb"Running Job\s+\d+\s+of\s+\d+",
+    "electrons": rb"There are\s+\d+\s+alpha and\s+\d+\s+beta electrons",
+    "geometry": rb"Standard Nuclear Orientation",
+    "scf_energy": rb"Total energy in the final basis set",
+    "orbital_energies": rb"Orbital Energies \(a\.u\.\)",
+    "excitations": rb"(?:TDDFT(?:/TDA)?|CIS|RPA) Excitation Energies",
+    "polarizability": rb"Polarizability (?:Matrix \(a\.u\.\)|tensor)",
+    "job_time": rb"Total job time",
+}
+_SECTIONS = re.compile(
+    b"|".join(b"(?P<%s>%s)" % (k.encode(), v) for k, v in _SECTION_PATTERNS.items())
+)
+_FLOAT = re.compile(r"-?\d+\.\d+(?:[eEdD][-+]?\d+)?")
+
+
 class QChemOutput:
     def __init__(self, filepath: str) -> None:
         self.filepath = mtr.expand(filepath)
 
-    @property
-    @memoize
+    @cached_property
     def cclib_out(self):
         return cclib.io.ccread(self.filepath)
 
+    @cached_property
+    def sections(self) -> Dict[str, List[int]]:
+        """Byte offsets of each recognized section, indexed in a single pass.
+
+        Returns
+        -------
+        Dict[str, List[int]]
+            Offsets of the lines starting each section, by section name.
+        """
+        sections = {k: [] for k in _SECTION_PATTERNS}
+
+        with open(self.filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return sections
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in _SECTIONS.finditer(mm):
+                    line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                    sections[match.lastgroup].append(line_start)
+
+        return sections
+
+    def _lines(self, offset: int) -> Iterable[str]:
+        # lazily read lines from the given offset onwards
+        with open(self.filepath, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                yield line.decode(errors="replace").rstrip("\n")
+
+    def _last(self, section: str) -> int:
+        try:
+            return self.sections[section][-1]
+        except IndexError:
+            raise AttributeError(
+                f"{self.filepath} contains no {section.replace('_', ' ')} section."
+            )
+
     @property
     def footer(
         self,
     ) -> Dict[mtr.Quantity, mtr.Quantity, Tuple[int, str, int, int, int, int, str]]:
-        with open(self.filepath, "r") as f:
-            lines = "".join(f.readlines())
+        # the footer is two lines long
+        lines = "\n".join(itertools.islice(self._lines(self._last("job_time")), 2))
         s = r"""\s*Total\s*job\s*time\s*:\s*(\d*\.\d*)
                 \s*s\s*\(\s*wall\s*\)\s*,\s*(\d*\.\d*)
                 \s*s\s*\(\s*cpu\s*\)\s*(\w*)\s*(\w*)
                 \s*(\d*)\s*(\d*)\s*:\s*(\d*)\s*:\s*
                 (\d*)\s*(\d*)\s*"""
-        pattern = re.compile(s)
+        pattern = re.compile(s, re.VERBOSE)
         (
             walltime,
             cputime,
@@ -200,64 +259,348 @@ class QChemOutput:
         return {"walltime": walltime, "cputime": cputime, "date": date}
 
     @property
-    def frontier_energies(self) -> Dict[mtr.Quantity, mtr.Quantity]:
-        moenergies = self.cclib_out.moenergies
-        homo_indices = self.cclib_out.homos
+    def num_electrons(self) -> Tuple[int, int]:
+        line = next(self._lines(self._last("electrons")))
+        n_alpha, n_beta = re.findall(r"\d+", line)
 
-        homos = []
-        lumos = []
+        return int(n_alpha), int(n_beta)
 
-        for moe, h in zip(moenergies, homo_indices):
-            homo, lumo = moe[h : h + 2]
-            homos.append(homo)
-            lumos.append(lumo)
+    @property
+    def orbital_energies(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Occupied and virtual orbital energies (in hartree) of the final SCF.
+
+        Returns
+        -------
+        Dict[str, Tuple[np.ndarray, np.ndarray]]
+            Occupied and virtual orbital energies, by spin ("alpha"/"beta").
+        """
+        orbitals = {}
+        spin = "alpha"
+        occupied = True
+        dashes = 0
+
+        for line in self._lines(self._last("orbital_energies")):
+            if line.strip().startswith("-----"):
+                dashes += 1
+                # the block is framed by a dashed line after its title and one
+                # closing it, with dashed subheadings (-- Occupied --) between
+                if dashes == 2:
+                    break
+            elif "Alpha MOs" in line:
+                spin = "alpha"
+            elif "Beta MOs" in line:
+                spin = "beta"
+            elif "Occupied" in line:
+                occupied = True
+            elif "Virtual" in line:
+                occupied = False
+            else:
+                occ, virt = orbitals.setdefault(spin, ([], []))
+                # overflowing values are printed as asterisks
+                values = [
+                    np.inf if v.startswith("*") else float(v)
+                    for v in re.findall(r"-?\d+\.\d+|\*+", line)
+                ]
+                (occ if occupied else virt).extend(values)
+
+        return {k: (np.array(o), np.array(v)) for k, (o, v) in orbitals.items()}
 
-        homo = max(homos) * mtr.eV
-        lumo = min(lumos) * mtr.eV
+    @property
+    def frontier_energies(self) -> Dict[mtr.Quantity, mtr.Quantity]:
+        orbitals = self.orbital_energies.values()
 
-        return {"homo": homo, "lumo": lumo}
+        homo = max(o.max() for o, _ in orbitals if len(o) > 0)
+        lumo = min(v.min() for _, v in orbitals if len(v) > 0)
+
+        return {
+            "homo": (homo * mtr.hartree).convert(mtr.eV),
+            "lumo": (lumo * mtr.hartree).convert(mtr.eV),
+        }
 
     @property
     def polarizability(self) -> mtr.Polarizability:
-        *_, pol = self.cclib_out.polarizabilities
+        rows = []
+        for line in itertools.islice(
+            self._lines(self._last("polarizability")), 1, None
+        ):
+            values = _FLOAT.findall(line)
+            if len(values) >= 3:
+                rows.append([float(v.replace("D", "E")) for v in values[-3:]])
+            if len(rows) == 3:
+                break
 
-        return mtr.Polarizability(polarizability_tensor=pol * mtr.au_volume)
+        return mtr.Polarizability(polarizability_tensor=np.array(rows) * mtr.au_volume)
 
     @property
     def structure(self) -> mtr.Structure:
-        coords = self.cclib_out.atomcoords[-1, :, :] * mtr.angstrom
-        zs = self.cclib_out.atomnos
+        symbols = []
+        coords = []
+        dashes = 0
+
+        for line in self._lines(self._last("geometry")):
+            if line.strip().startswith("-----"):
+                dashes += 1
+                if dashes == 2:
+                    break
+            elif dashes == 1:
+                _, symbol, x, y, z = line.split()[:5]
+                symbols.append(symbol)
+                coords.append([float(x), float(y), float(z)])
+
+        return mtr.Structure.from_arrays(symbols, coords, mtr.angstrom)
 
-        atoms = (mtr.Atom(element=Z, position=p) for Z, p in zip(zs, coords))
+    @property
+    def electronic_excitations(self) -> mtr.ExcitationSpectrum:
+        n_alpha, n_beta = self.num_electrons
+
+        excitations = []
+        state = None
+
+        for line in self._lines(self._last("excitations")):
+            stripped = line.strip()
+
+            if stripped.startswith("Excited state"):
+                state = {"contributions": []}
+                excitations.append(state)
+                state["energy"] = float(stripped.rsplit("=", 1)[-1]) * mtr.eV
+            elif state is None:
+                # title of the block
+                continue
+            elif stripped.startswith("-----"):
+                break
+            elif stripped.startswith("Total energy for state"):
+                state["total_energy"] = (
+                    float(_FLOAT.findall(stripped)[-1]) * mtr.hartree
+                )
+            elif stripped.startswith("Multiplicity"):
+                state["symmetry"] = stripped.split(":", 1)[-1].strip()
+            elif stripped.startswith("Trans. Mom."):
+                state["transition_moment"] = [
+                    float(v) for v in _FLOAT.findall(stripped)
+                ] * mtr.au_dipole_moment
+            elif stripped.startswith("Strength"):
+                state["oscillator_strength"] = float(_FLOAT.findall(stripped)[-1])
+            elif stripped.startswith(("D(", "S(", "X: D(", "X: S(")):
+                state["contributions"].append(
+                    _excitation_contribution(stripped, n_alpha, n_beta)
+                )
 
-        return mtr.Structure(*atoms)
+        return mtr.ExcitationSpectrum(tuple(mtr.Excitation(**e) for e in excitations))
 
     @property
-    def electronic_excitations(self) -> mtr.ExcitationSpectrum:
-        engs = self.cclib_out.etenergies / mtr.cm
-        engs = (mtr.h * mtr.c * engs).convert(mtr.eV)
-        excitations = tuple(
-            mtr.Excitation(
-                energy=eng, oscillator_strength=osc, symmetry=sym, contributions=cont
-            )
-            for eng, osc, sym, cont in zip(
-                engs,
-                self.cclib_out.etoscs,
-                self.cclib_out.etsyms,
-                self.cclib_out.etsecs,
-            )
-        )
-        return mtr.ExcitationSpectrum(excitations)
+    def trajectory(self) -> QChemTrajectory:
+        return QChemTrajectory(self.filepath, self.sections["geometry"])
 
     @property
     def total_energy(self) -> mtr.Quantity:
-        return self.cclib_out.scfenergies * mtr.eV
+        energies = [
+            float(_FLOAT.findall(next(self._lines(offset)))[-1])
+            for offset in self.sections["scf_energy"]
+        ]
+        if len(energies) == 0:
+            raise AttributeError(f"{self.filepath} contains no SCF energy.")
+
+        return (np.array(energies) * mtr.hartree).convert(mtr.eV)
+
+
+class QChemTrajectory:
+    """Random-access reader of the geometries in a Q-Chem output.
+
+    Frames are parsed on demand from a memory map of the output, so that
+    long AIMD trajectories can be analyzed without reading the whole file
+    into memory. Positions are given in angstroms.
+
+    Attributes
+    ----------
+    filepath : str
+        Path to the Q-Chem output.
+    offsets : List[int]
+        Byte offsets of the geometry block of each frame.
+    """
+
+    def __init__(self, filepath: str, offsets: Iterable[int]) -> None:
+        self.filepath = mtr.expand(filepath)
+        self.offsets = list(offsets)
+        self._frames = None
+        self._symbols = None
+
+    @contextlib.contextmanager
+    def _mmap(self):
+        with open(self.filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def _rows(self, mm: mmap.mmap, offset: int) -> np.ndarray:
+        # rows of the table between the two dashed lines following the title
+        start = mm.find(b"\n", mm.find(b"-----", offset)) + 1
+        end = mm.rfind(b"\n", start, mm.find(b"-----", start))
+        tokens = np.array(mm[start:end].split())
+
+        # columns: index, atomic symbol, x, y, z
+        return tokens.reshape(-1, 5)
+
+    def _read(self, mm: mmap.mmap, i: int, out: np.ndarray) -> np.ndarray:
+        out[:] = self._rows(mm, self.offsets[i])[:, 2:].astype(np.float64)
+        return out
+
+    @property
+    def atomic_symbols(self) -> Tuple[str, ...]:
+        if self._symbols is None:
+            with self._mmap() as mm:
+                self._symbols = tuple(
+                    s.decode() for s in self._rows(mm, self.offsets[0])[:, 1]
+                )
+
+        return self._symbols
+
+    @property
+    def num_atoms(self) -> int:
+        return len(self.atomic_symbols)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, key: Union[int, slice]) -> np.ndarray:
+        if isinstance(key, slice):
+            return self.to_array(range(len(self))[key])
+
+        i = range(len(self))[key]
+        if self._frames is not None:
+            return self._frames[i]
+
+        with self._mmap() as mm:
+            return self._read(mm, i, np.empty((self.num_atoms, 3)))
+
+    def __iter__(self) -> Iterable[np.ndarray]:
+        if self._frames is not None:
+            yield from self._frames
+            return
+
+        with self._mmap() as mm:
+            for i in range(len(self)):
+                yield self._read(mm, i, np.empty((self.num_atoms, 3)))
+
+    def to_array(
+        self,
+        indices: Optional[Iterable[int]] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Read frames into a (num_frames, num_atoms, 3) array.
+
+        Parameters
+        ----------
+        indices : Optional[Iterable[int]], optional
+            Frames to read, by default all frames
+        out : Optional[np.ndarray], optional
+            Preallocated array to fill, by default None
+
+        Returns
+        -------
+        np.ndarray
+            Positions of each atom in each frame, in angstroms.
+        """
+        indices = range(len(self)) if indices is None else list(indices)
+        if out is None:
+            out = np.empty((len(indices), self.num_atoms, 3))
+
+        if self._frames is not None:
+            out[:] = self._frames[indices]
+            return out
+
+        with self._mmap() as mm:
+            for k, i in enumerate(indices):
+                self._read(mm, i, out[k])
+
+        return out
+
+    def load(self) -> QChemTrajectory:
+        """Read all frames into memory, after which the output is no longer needed.
+
+        Returns
+        -------
+        QChemTrajectory
+            This trajectory.
+        """
+        self.atomic_symbols
+        self._frames = self.to_array()
+
+        return self
+
+    def structure(self, i: int) -> mtr.Structure:
+        return mtr.Structure.from_arrays(self.atomic_symbols, self[i], mtr.angstrom)
+
+
+def _excitation_contribution(
+    line: str, n_alpha: int, n_beta: int
+) -> Tuple[Tuple[int, int], Tuple[int, int], float]:
+    # e.g. "D(    5) --> V(    1) amplitude =  0.9950 beta"
+    # zero-based orbital indices as in cclib: D(i) is the i-th doubly
+    # occupied orbital, S(i) the i-th singly occupied orbital and
+    # V(i) the i-th virtual orbital of the given spin
+    spin = 1 if line.endswith("beta") else 0
+    (kind_from, i), (kind_to, j) = re.findall(r"([DSV])\(\s*(\d+)\)", line)
+    amplitude = float(_FLOAT.findall(line.split("=", 1)[-1])[0])
+
+    n_occupied = n_alpha if spin == 0 else n_beta
+
+    def _index(kind: str, k: str) -> int:
+        if kind == "V":
+            return n_occupied + int(k) - 1
+        elif kind == "S":
+            return n_beta + int(k) - 1
+        else:
+            return int(k) - 1
+
+    return (
+        (_index(kind_from, i), spin),
+        (_index(kind_to, j), spin),
+        amplitude,
+    )
 
 
 # ------------------------ ENGINE -------------------------- #
 
 
+_QCENV_LOCK = threading.Lock()
+_QCENV_ENVIRONMENTS: Dict[Tuple[str, str, int, int], Dict[str, str]] = {}
+
+
+def _qcenv_key(qcenv: str) -> Tuple[str, str, int, int]:
+    [path] = shlex.split(qcenv)
+    stat = os.stat(path)
+
+    return qcenv, path, stat.st_mtime_ns, stat.st_size
+
+
+def _source_qcenv(key: Tuple[str, str, int, int]) -> Dict[str, str]:
+    # environment after sourcing qcenv, computed once per version of the file
+    with _QCENV_LOCK:
+        try:
+            return _QCENV_ENVIRONMENTS[key]
+        except KeyError:
+            pass
+
+        qcenv, *_ = key
+        # FIXME: shell=True needs to be avoided!!
+        d = ast.literal_eval(
+            re.match(
+                r"environ\((.*)\)",
+                subprocess.check_output(
+                    f". {qcenv}; python -c 'import os; print(os.environ)'",
+                    shell=True,
+                )
+                .decode()
+                .strip(),
+            ).group(1)
+        )
+        _QCENV_ENVIRONMENTS[key] = d
+
+        return d
+
+
 class QChem(Engine):
+    _environment = None
+
     def __init__(
         self,
         executable: Optional[str] = "qchem",
@@ -285,18 +628,12 @@ class QChem(Engine):
             return None
 
         if self.qcenv is not None:
-            # FIXME: shell=True needs to be avoided!!
-            d = ast.literal_eval(
-                re.match(
-                    r"environ\((.*)\)",
-                    subprocess.check_output(
-                        f". {self.qcenv}; python -c 'import os; print(os.environ)'",
-                        shell=True,
-                    )
-                    .decode()
-                    .strip(),
-                ).group(1)
-            )
+            # the sourced environment travels with pickled engines, so workers
+            # only need to check that qcenv has not changed since
+            key = _qcenv_key(self.qcenv)
+            if self._environment is None or self._environment[0] != key:
+                self._environment = key, _source_qcenv(key)
+            d = dict(self._environment[1])
         else:
             d = {}
 
@@ -305,6 +642,15 @@ class QChem(Engine):
 
         return d
 
+    def _env(self, io: mtr.utils._IO) -> Dict[str, str]:
+        # jobs with their own scratch directory, e.g. from an IO with a
+        # ScratchManager, do not share QCSCRATCH with concurrent jobs
+        d = self.env()
+        if io.scratch_dir is not None:
+            d = dict(os.environ if d is None else d, QCSCRATCH=io.scratch_dir)
+
+        return d
+
     def command(
         self,
         inp: str,
@@ -393,14 +739,39 @@ class QChem(Engine):
     ) -> QChemLRTDDFT:
         return QChemLRTDDFT(engine=self, io=io, handlers=handlers, name=name)
 
+    def map(
+        self,
+        method: str,
+        molecules: Iterable[mtr.Molecule],
+        work_dir: str,
+        settings: Optional[mtr.Settings] = None,
+        handlers: Optional[Iterable[mtr.Handler]] = None,
+        name: Optional[str] = None,
+        temp: Optional[bool] = False,
+    ) -> List[Task]:
+        factory = functools.partial(getattr(self, method), handlers=handlers)
+        factory.__name__ = method
+
+        return mtr.map_tasks(
+            factory,
+            molecules,
+            work_dir,
+            inp=f"{method}.in",
+            out=f"{method}.out",
+            name=name,
+            temp=temp,
+            settings=settings,
+        )
+
     def minimize_koopman_error(
         self,
         io: mtr.IO,
         handlers: Optional[Iterable[mtr.Handler]] = None,
         name: Optional[str] = None,
+        cache: Optional[mtr.ResultCache] = None,
     ) -> QChemMinimizeKoopmanError:
         return QChemMinimizeKoopmanError(
-            engine=self, io=io, handlers=handlers, name=name
+            engine=self, io=io, handlers=handlers, name=name, cache=cache
         )
 
     # def minimize_koopman_error_lpscf(
@@ -457,26 +828,50 @@ class QChem(Engine):
 
 
 class QChemBaseTask(ExternalTask):
+    def __init__(
+        self,
+        engine: mtr.Engine,
+        io: mtr.IO,
+        name: Optional[str] = None,
+        handlers: Optional[Iterable[mtr.Handler]] = None,
+        resources: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__(
+            engine=engine, io=io, name=name, handlers=handlers, resources=resources
+        )
+        # settings of the most recent run, which actions such as
+        # QChemIncreaseSCFIterations modify before the task is rerun
+        self.settings = None
+        self._input_settings = None
+
     def defaults(self, settings: mtr.Settings) -> mtr.Settings:
         raise NotImplementedError
 
     def parse(self, output: str) -> Any:
         raise NotImplementedError
 
+    def _settings(self, settings: Optional[mtr.Settings] = None) -> mtr.Settings:
+        s = mtr.Settings() if settings is None else copy.deepcopy(settings)
+
+        # keep any repairs made to self.settings unless the input itself changed
+        if self.settings is None or s != self._input_settings:
+            self._input_settings = copy.deepcopy(s)
+            self.settings = self.defaults(s)
+
+        return self.settings
+
     def compute(
         self,
         molecule: mtr.Molecule,
         settings: Optional[mtr.Settings] = None,
         arguments: Optional[Iterable[str]] = None,
     ) -> Any:
-        s = mtr.Settings() if settings is None else copy.deepcopy(settings)
-
-        inp = mtr.QChemInput(molecule, settings=self.defaults(s))
+        inp = mtr.QChemInput(molecule, settings=self._settings(settings))
 
         with self.io() as io:
             inp.write(io.inp)
 
-            self.engine.execute(self.io, arguments=arguments)
+            self.engine.execute(self.io, arguments=arguments, monitors=self.monitors())
 
             return self.parse(io.out)
 
@@ -488,9 +883,22 @@ class QChemBaseTask(ExternalTask):
 
 
 class QChemAIMD(QChemBaseTask):
+    def compute(
+        self,
+        molecule: mtr.Molecule,
+        settings: Optional[mtr.Settings] = None,
+        arguments: Optional[Iterable[str]] = None,
+    ) -> Any:
+        # outputs in temporary directories are deleted once compute returns,
+        # so their trajectories are loaded eagerly
+        self._load = self.io.temporary
+
+        return super().compute(molecule, settings=settings, arguments=arguments)
+
     def parse(self, output: str) -> Any:
-        with open(output, "r") as f:
-            return "".join(f.readlines())
+        trajectory = QChemOutput(output).trajectory
+
+        return trajectory.load() if getattr(self, "_load", False) else trajectory
 
     def defaults(self, settings: mtr.Settings) -> mtr.Settings:
         if ("rem", "exchange") not in settings and (
@@ -558,7 +966,7 @@ class QChemAIMD(QChemBaseTask):
 #         with self.io() as io:
 #             inp.write(io.inp)
 
-#             self.engine.execute(self.io)
+#             self.engine.execute(self.io, monitors=self.monitors())
 
 #             return self.parse(io.out)
 
@@ -616,6 +1024,7 @@ class QChemKoopmanError(Task):
         self,
         molecule: mtr.Molecule,
         settings: Optional[mtr.Settings] = None,
+        resources: Optional[Dict[str, float]] = None,
     ) -> mtr.Quantity:
         s = mtr.Settings() if settings is None else copy.deepcopy(settings)
         input_settings = self.defaults(s)
@@ -647,7 +1056,8 @@ class QChemKoopmanError(Task):
 
         wf = Workflow(neutral_sp, cation_sp, anion_sp)
 
-        out = wf.compute()
+        # resources bounds the share of the machine used by the single points
+        out = wf.compute(resources=resources)
 
         neutral, homo, lumo = out["neutral"]
         cation = out["cation"]
@@ -795,9 +1205,9 @@ class QChemLRTDDFT(QChemBaseTask):
         n_y: Optional[int] = 50,
         n_z: Optional[int] = 50,
     ) -> mtr.Molecule:
-        s = mtr.Settings() if settings is None else copy.deepcopy(settings)
+        s = self._settings(settings)
 
-        inp = mtr.QChemInput(molecule, settings=self.defaults(s))
+        inp = mtr.QChemInput(molecule, settings=s)
 
         if num_nto_pairs > 0:
             inp += _nto_pairs(molecule, s, num_nto_pairs, n_x, n_y, n_z)
@@ -805,7 +1215,7 @@ class QChemLRTDDFT(QChemBaseTask):
         with self.io() as io:
             inp.write(io.inp)
 
-            self.engine.execute(self.io)
+            self.engine.execute(self.io, monitors=self.monitors())
 
             molecule.electronic_excitations = self.parse(io.out)
 
@@ -819,6 +1229,7 @@ class QChemMinimizeKoopmanError(Task):
         io: mtr.IO,
         handlers: Optional[Iterable[mtr.Handler]] = None,
         name: Optional[str] = None,
+        cache: Optional[mtr.ResultCache] = None,
     ) -> None:
         super().__init__(
             handlers=handlers,
@@ -826,6 +1237,16 @@ class QChemMinimizeKoopmanError(Task):
         )
         self.engine = engine
         self.io = io
+        self.cache = cache
+
+    def fingerprint(self) -> Tuple[Any, ...]:
+        # the molecule and settings are inputs of compute,
+        # and as such covered by the fingerprints of the requirements
+        return super().fingerprint() + (
+            self.engine.__class__.__qualname__,
+            self.engine.executable,
+            tuple(self.engine.arguments or ()),
+        )
 
     def defaults(self, settings: mtr.Settings) -> mtr.Settings:
         if ("rem", "basis") not in settings:
@@ -848,7 +1269,12 @@ class QChemMinimizeKoopmanError(Task):
         epsilon: Optional[Union[int, float]] = 1.0,
         alpha: Optional[float] = None,
         num_evals: Optional[int] = 5,
+        batch_size: Optional[int] = 1,
     ) -> Tuple[float, float, mtr.Quantity]:
+        # concurrently evaluated points divide the machine between
+        # their workflows rather than each claiming all of its cores
+        resources = {"cores": max((os.cpu_count() or 1) // max(batch_size, 1), 1)}
+
         def _objective(omega: float, _alpha: float) -> float:
             beta = 1 / epsilon - _alpha
             s = mtr.Settings() if settings is None else copy.deepcopy(settings)
@@ -864,24 +1290,41 @@ class QChemMinimizeKoopmanError(Task):
             omega = int(round(1000 * omega))
             s["rem", "omega"] = s["rem", "omega2"] = omega
 
-            wd = mtr.expand(f"{io.work_dir}/{omega}")
-
-            gs_io = mtr.IO("gs.in", "gs.out", wd)
-            cation_io = mtr.IO("cation.in", "cation.out", wd)
-            anion_io = mtr.IO("anion.in", "anion.out", wd)
-
-            ke = self.engine.koopman_error(gs_io, cation_io, anion_io)
-
-            return ke.compute(molecule, s).value
+            # each evaluation gets its own directory, since concurrently
+            # evaluated points may round to the same omega and alpha,
+            # which is removed once its value has been read
+            with tempfile.TemporaryDirectory(
+                prefix=f"{omega}_{s['rem', 'hf_sr']}_", dir=io.work_dir
+            ) as wd:
+                gs_io = mtr.IO("gs.in", "gs.out", wd)
+                cation_io = mtr.IO("cation.in", "cation.out", wd)
+                anion_io = mtr.IO("anion.in", "anion.out", wd)
+
+                ke = self.engine.koopman_error(gs_io, cation_io, anion_io)
+
+                return ke.compute(molecule, s, resources=resources).value
+
+        # evaluations depend on the molecule, settings and executable, not on io
+        key = (
+            type(self.engine).__qualname__,
+            self.engine.executable,
+            molecule,
+            settings,
+            epsilon,
+            alpha,
+        )
 
         with self.io() as io:
             if alpha is None:
-                [omega, alpha], J = mtr.MaxLIPOTR(_objective).compute(
-                    x_min=[1e-3, 0], x_max=[1, 1 / epsilon], num_evals=num_evals
-                )
+                [omega, alpha], J = mtr.MaxLIPOTR(
+                    _objective, batch_size=batch_size, cache=self.cache, key=key
+                ).compute(x_min=[1e-3, 0], x_max=[1, 1 / epsilon], num_evals=num_evals)
             else:
                 [omega], J = mtr.MaxLIPOTR(
-                    functools.partial(_objective, _alpha=alpha)
+                    functools.partial(_objective, _alpha=alpha),
+                    batch_size=batch_size,
+                    cache=self.cache,
+                    key=key,
                 ).compute(x_min=1e-3, x_max=1, num_evals=num_evals)
 
         return omega, alpha, J * mtr.eV
@@ -993,13 +1436,9 @@ class QChemOptimize(QChemBaseTask):
 class QChemPolarizability(QChemBaseTask):
     def parse(self, output: str) -> Any:
         try:
-            polarizability = (
-                cclib.io.ccread(output).polarizabilities[-1] * mtr.au_volume
-            )
+            return QChemOutput(output).polarizability
         except AttributeError:
-            polarizability = None
-
-        return mtr.Polarizability(polarizability)
+            return mtr.Polarizability(None)
 
     def defaults(self, settings: mtr.Settings) -> mtr.Settings:
         if ("rem", "exchange") not in settings and (
@@ -1161,7 +1600,7 @@ class QChemVolume(QChemBaseTask):
 class QChemSinglePoint(QChemBaseTask):
     def parse(self, output: str) -> Any:
         try:
-            energy = cclib.io.ccread(output).scfenergies * mtr.eV
+            energy = QChemOutput(output).total_energy
         except AttributeError:
             energy = None
 
@@ -1184,22 +1623,12 @@ class QChemSinglePoint(QChemBaseTask):
 class QChemSinglePointFrontier(QChemBaseTask):
     def parse(self, output: str) -> Any:
         try:
-            out = cclib.io.ccread(output)
-            energy = out.scfenergies * mtr.eV
-            moenergies = out.moenergies
-            homo_indices = out.homos
-
-            homos = []
-            lumos = []
-
-            for moe, h in zip(moenergies, homo_indices):
-                homo, lumo = moe[h : h + 2]
-                homos.append(homo)
-                lumos.append(lumo)
-
-            homo = max(homos) * mtr.eV
-            lumo = min(lumos) * mtr.eV
-        except AttributeError:
+            out = QChemOutput(output)
+            energy = out.total_energy
+            frontier = out.frontier_energies
+            homo = frontier["homo"]
+            lumo = frontier["lumo"]
+        except (AttributeError, ValueError):
             energy = None
             homo = None
             lumo = None
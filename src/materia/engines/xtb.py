@@ -1,13 +1,14 @@
 from __future__ import annotations
-from typing import Iterable, Optional
+from typing import Any, Callable, Iterable, List, Optional, Union
 
+import asyncio
 import materia as mtr
 import pathlib
 import re
 import shlex
 import subprocess
 
-from .engine import Engine
+from .engine import _DEFAULT_LIMITER, Engine, _call, _call_async, _read
 from ..tasks import ExternalTask
 
 __all__ = ["XTB"]
@@ -34,27 +35,150 @@ class XTB(Engine):
         return shlex.split(f"{self.executable} {coord} {arg_str}")
 
     def execute(
-        self, coord: str, io: mtr.IO, arguments: Optional[Iterable[str]] = None
-    ) -> str:
+        self,
+        coord: str,
+        io: mtr.IO,
+        arguments: Optional[Iterable[str]] = None,
+        return_output: Optional[bool] = False,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+        check: Optional[bool] = False,
+    ) -> Optional[str]:
         with io() as _io:
             cmd = self.command(_io.out, _io.work_dir, mtr.expand(coord), arguments)
             with open(_io.out, "w") as out:
-                env = self.env()
-                if env is None:
-                    subprocess.call(
-                        cmd, stdout=out, stderr=subprocess.STDOUT, cwd=io.work_dir
-                    )
-                else:
-                    subprocess.call(
+                returncode = _call(
+                    cmd,
+                    stdout=out,
+                    stderr=subprocess.STDOUT,
+                    env=self._env(_io),
+                    output=_io.out,
+                    monitors=monitors,
+                    cwd=_io.work_dir,
+                )
+            if check and returncode:
+                raise subprocess.CalledProcessError(returncode, cmd)
+
+            return _read(_io.out) if return_output else None
+
+    async def execute_async(
+        self,
+        coord: str,
+        io: mtr.IO,
+        arguments: Optional[Iterable[str]] = None,
+        return_output: Optional[bool] = False,
+        limiter: Optional[mtr.ExecutionLimiter] = None,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+        check: Optional[bool] = False,
+    ) -> Optional[str]:
+        async with limiter or _DEFAULT_LIMITER:
+            with io() as _io:
+                cmd = self.command(_io.out, _io.work_dir, mtr.expand(coord), arguments)
+                with open(_io.out, "w") as out:
+                    returncode = await _call_async(
                         cmd,
                         stdout=out,
                         stderr=subprocess.STDOUT,
-                        env=self.env(),
-                        cwd=io.work_dir,
+                        env=self._env(_io),
+                        output=_io.out,
+                        monitors=monitors,
+                        cwd=_io.work_dir,
                     )
+                if check and returncode:
+                    raise subprocess.CalledProcessError(returncode, cmd)
+
+                return _read(_io.out) if return_output else None
+
+    async def optimize_structures_async(
+        self,
+        structures: Iterable[mtr.Structure],
+        work_dir: str,
+        out: Optional[str] = "xtb.out",
+        arguments: Optional[Iterable[str]] = None,
+        limiter: Optional[mtr.ExecutionLimiter] = None,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> List[Union[mtr.Structure, Exception]]:
+        """Optimize many structures with concurrent xtb processes.
+
+        Each structure is optimized in its own numbered subdirectory of
+        `work_dir`, and its optimized geometry is read directly from the
+        xtbopt.xyz file written by xtb. A failed optimization does not affect
+        the others; its exception is returned in place of its structure.
+
+        Parameters
+        ----------
+        structures : Iterable[mtr.Structure]
+            Structures to optimize.
+        work_dir : str
+            Directory in which the subdirectories are created.
+        out : Optional[str], optional
+            Name of the xtb log in each subdirectory, by default "xtb.out"
+        arguments : Optional[Iterable[str]], optional
+            Arguments passed in addition to --opt, by default None
+        limiter : Optional[mtr.ExecutionLimiter], optional
+            Limiter bounding the number of concurrent xtb processes, by default
+            the limiter shared by all engines.
+        monitors : Optional[Iterable[Callable[[str], Any]]], optional
+            Callables fed each line of each xtb log as it is written; an
+            exception raised by a monitor stops only that optimization, by
+            default None
+
+        Returns
+        -------
+        List[Union[mtr.Structure, Exception]]
+            Optimized structures, or the exceptions raised by failed
+            optimizations (e.g. subprocess.CalledProcessError), in the order of
+            `structures`.
+        """
+        structures = list(structures)
+        width = len(str(max(len(structures) - 1, 0)))
+        arguments = ["--opt", *(arguments or [])]
 
-            with open(_io.out, "r") as f:
-                return "".join(f.readlines())
+        async def _optimize(i: int, structure: mtr.Structure) -> mtr.Structure:
+            io = mtr.IO(out=out, work_dir=pathlib.Path(work_dir, f"{i:0{width}d}"))
+            with io() as _io:
+                coord = pathlib.Path(_io.work_dir, "coord.xyz")
+                structure.write(str(coord), overwrite=True)
+
+            await self.execute_async(
+                coord,
+                io,
+                arguments=arguments,
+                limiter=limiter,
+                monitors=monitors,
+                check=True,
+            )
+
+            return mtr.Structure.read(str(coord.with_name("xtbopt.xyz")))
+
+        return await asyncio.gather(
+            *(_optimize(i, s) for i, s in enumerate(structures)),
+            return_exceptions=True,
+        )
+
+    def optimize_structures(
+        self,
+        structures: Iterable[mtr.Structure],
+        work_dir: str,
+        out: Optional[str] = "xtb.out",
+        arguments: Optional[Iterable[str]] = None,
+        limiter: Optional[mtr.ExecutionLimiter] = None,
+        monitors: Optional[Iterable[Callable[[str], Any]]] = None,
+    ) -> List[Union[mtr.Structure, Exception]]:
+        """Optimize many structures with concurrent xtb processes.
+
+        Blocking version of `optimize_structures_async`, which must not be
+        called from a running event loop.
+        """
+        return asyncio.run(
+            self.optimize_structures_async(
+                structures,
+                work_dir,
+                out=out,
+                arguments=arguments,
+                limiter=limiter,
+                monitors=monitors,
+            )
+        )
 
     def optimize(
         self,
@@ -64,6 +188,14 @@ class XTB(Engine):
     ) -> XTBOptimize:
         return XTBOptimize(engine=self, io=io, handlers=handlers, name=name)
 
+    def optimize_many(
+        self,
+        io: mtr.IO,
+        handlers: Optional[Iterable[mtr.Handler]] = None,
+        name: Optional[str] = None,
+    ) -> XTBOptimizeMany:
+        return XTBOptimizeMany(engine=self, io=io, handlers=handlers, name=name)
+
 
 class XTBOptimize(ExternalTask):
     def parse(self, output: str) -> mtr.Structure:
@@ -78,7 +210,41 @@ class XTBOptimize(ExternalTask):
     def compute(self, molecule: mtr.Molecule) -> mtr.Molecule:
         with self.io() as io:
             with molecule.structure.tempfile(suffix=".xyz", dir=io.work_dir) as f:
-                self.engine.execute(f.name, self.io, arguments=["--opt"])
+                self.engine.execute(
+                    f.name, self.io, arguments=["--opt"], monitors=self.monitors()
+                )
 
             molecule.structure = self.parse(io.out)
             return molecule
+
+
+class XTBOptimizeMany(ExternalTask):
+    def compute(
+        self, molecules: Iterable[mtr.Molecule]
+    ) -> List[Union[mtr.Molecule, Exception]]:
+        molecules = list(molecules)
+
+        with self.io() as io:
+            out = pathlib.Path(io.out).name if io.out is not None else "xtb.out"
+            structures = self.engine.optimize_structures(
+                [molecule.structure for molecule in molecules],
+                io.work_dir,
+                out=out,
+                monitors=self.monitors(),
+            )
+
+        # a handler which stopped one of the jobs repairs the whole batch
+        signal = next((s for s in structures if isinstance(s, mtr.ActionSignal)), None)
+        if signal is not None:
+            raise signal
+
+        results = []
+        for molecule, structure in zip(molecules, structures):
+            if isinstance(structure, Exception):
+                # failed optimizations are reported per molecule
+                results.append(structure)
+            else:
+                molecule.structure = structure
+                results.append(molecule)
+
+        return results
@@ -1,8 +1,9 @@
 import abc
+import re
 
 import materia as mtr
 
-__all__ = ["Handler"]
+__all__ = ["Handler", "QChemResponseDIISConvergence", "QChemSCFConvergence"]
 
 
 class Handler(abc.ABC):
@@ -12,6 +13,20 @@ class Handler(abc.ABC):
                 result=result, actions=self.handle(result=result, task=task)
             )
 
+    def run_line(self, line, task):
+        if self.check_line(line=line, task=task):
+            raise mtr.ActionSignal(
+                message=f"Output line {line!r} failed {type(self).__name__}.",
+                actions=self.handle(result=None, task=task),
+            )
+
+    def check_line(self, line, task):
+        # input: line of output written by the running task (without newline)
+        # and the task object itself
+        # output: True if the line already shows that self.handle should be
+        # called, so that the external process can be stopped early, else False
+        return False
+
     @abc.abstractmethod
     def check(self, result, task):
         # input: result of task to be checked and the task object itself
@@ -26,67 +41,55 @@ class Handler(abc.ABC):
         return []
 
 
-# import re
-
-
-# import materia
+def _search_output(pattern: re.Pattern, task) -> bool:
+    # outputs of tasks run in temporary directories are kept until their
+    # handlers have run; a job which never wrote its output shows no failure
+    try:
+        with open(mtr.expand(task.io.out, task.io.work_dir), "r") as f:
+            return re.search(pattern, f.read()) is not None
+    except FileNotFoundError:
+        return False
 
 
-# from materia.handler import Handler
-# from materia.actions import (
-#     QChemModifyRSHParameter,
-#     QChemIncreaseResponseIterations,
-#     QChemIncreaseSCFIterations,
-#     Rerun,
-# )
+class QChemResponseDIISConvergence(Handler):
+    pattern = re.compile(
+        r"DIIS\s*failed\s*to\s*converge\s*within"
+        r"\s*the\s*given\s*number\s*of\s*iterations"
+    )
 
-# #
-# __all__ = [
-#     "QChemResponseDIISConvergence",
-#     "QChemSCFConvergence",
-# ]
+    def __init__(self, increase_factor=2):
+        self.increase_factor = increase_factor
 
+    def check(self, result, task):
+        return _search_output(self.pattern, task)
 
-# class QChemResponseDIISConvergence(Handler):
-#     def __init__(self, increase_factor=2):
-#         self.increase_factor = increase_factor
-
-#     def check(self, result, task):
-#         with open(task.io.out, "r") as f:
-#             if re.search(
-#                 r"DIIS\s*failed\s*to\s*converge\s*within\s*the\s*given\s*number\s*of\s*iterations",
-#                 "".join(f.readlines()),
-#             ):
-#                 return True
+    def check_line(self, line, task):
+        return self.pattern.search(line) is not None
 
-#         return False
+    def handle(self, result, task):
+        return [
+            mtr.QChemIncreaseResponseIterations(increase_factor=self.increase_factor),
+            mtr.Rerun(),
+        ]
 
-#     def handle(self, result, task):
-#         return [
-#             QChemIncreaseResponseIterations(increase_factor=self.increase_factor),
-#             Rerun(),
-#         ]
 
+class QChemSCFConvergence(Handler):
+    pattern = re.compile(r"gen_scfman_exception:\s*SCF\s*failed\s*to\s*converge")
 
-# class QChemSCFConvergence(Handler):
-#     def __init__(self, increase_factor=2):
-#         self.increase_factor = increase_factor
+    def __init__(self, increase_factor=2):
+        self.increase_factor = increase_factor
 
-#     def check(self, result, task):
-#         with open(task.output_path, "r") as f:
-#             if re.search(
-#                 r"gen_scfman_exception:\s*SCF\s*failed\s*to\s*converge",
-#                 "".join(f.readlines()),
-#             ):
-#                 return True
+    def check(self, result, task):
+        return _search_output(self.pattern, task)
 
-#         return False
+    def check_line(self, line, task):
+        return self.pattern.search(line) is not None
 
-#     def handle(self, result, task):
-#         return [
-#             QChemIncreaseSCFIterations(increase_factor=self.increase_factor),
-#             Rerun(),
-#         ]
+    def handle(self, result, task):
+        return [
+            mtr.QChemIncreaseSCFIterations(increase_factor=self.increase_factor),
+            mtr.Rerun(),
+        ]
 
 
 # # FIXME: implement a handler
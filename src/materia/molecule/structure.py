@@ -1,10 +1,10 @@
 from __future__ import annotations
-from typing import Dict, IO, Optional, Tuple, Union
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
 
 import contextlib
 import numpy as np
 import materia as mtr
-from materia.utils import memoize
+from materia.utils import Cached, cached_property
 import networkx as nx
 from openbabel import openbabel as ob
 import pubchempy as pcp
@@ -12,14 +12,137 @@ import rdkit
 import rdkit.Chem
 import rdkit.Chem.AllChem
 import scipy.linalg
+import scipy.sparse
+import scipy.spatial
+import scipy.spatial.distance
 import tempfile
 
+from .atom import _atomic_masses, _atomic_numbers
+
 __all__ = ["Structure"]
 
+# lookup tables indexed by atomic number
+_atomic_symbols = {Z: symbol for symbol, Z in _atomic_numbers.items()}
+_masses = np.array(
+    [
+        _atomic_masses[_atomic_symbols[Z]] if Z in _atomic_symbols else 0.0
+        for Z in range(max(_atomic_symbols) + 1)
+    ]
+)
+
+
+class Structure(Cached):
+    """Atomic structure stored as arrays of atomic numbers and positions.
+
+    Atoms are only materialized as Atom objects when `atoms` is accessed, so
+    large structures built with `from_arrays` stay compact.
+
+    Parameters
+    ----------
+    *atoms : mtr.Atom
+        Atoms comprising the structure.
+    """
+
+    _atoms = None
+    _numbers = None
+    _positions = None
+    _unit = None
 
-class Structure:
     def __init__(self, *atoms: mtr.Atom) -> None:
-        self.atoms = tuple(atoms)
+        self._atoms = tuple(atoms)
+
+    @staticmethod
+    def from_arrays(
+        atomic_numbers: Iterable[Union[int, str]],
+        positions: Union[np.ndarray, mtr.Qty],
+        unit: Optional[mtr.Qty] = None,
+    ) -> Structure:
+        """Construct structure from arrays without creating Atom objects.
+
+        Parameters
+        ----------
+        atomic_numbers : Iterable[Union[int, str]]
+            Atomic number or symbol of each atom.
+        positions : Union[np.ndarray, mtr.Qty]
+            (N,3) array of atomic positions.
+        unit : Optional[mtr.Qty], optional
+            Unit of `positions` if not a quantity, by default angstrom
+
+        Returns
+        -------
+        Structure
+            Structure with the given atoms.
+
+        Raises
+        ------
+        ValueError
+            Raised if the number of positions does not match the number of atoms.
+        """
+        if isinstance(positions, mtr.Quantity):
+            positions, unit = positions.value, positions.unit
+
+        numbers = np.array(
+            [
+                _atomic_numbers[Z] if isinstance(Z, str) else int(Z)
+                for Z in atomic_numbers
+            ],
+            dtype=np.int64,
+        )
+        positions = np.ascontiguousarray(positions, dtype=np.float64).reshape(-1, 3)
+
+        if len(numbers) != len(positions):
+            raise ValueError(
+                "Number of atomic positions does not match number of atoms."
+            )
+
+        structure = Structure.__new__(Structure)
+        structure._numbers = numbers
+        structure._positions = positions
+        structure._unit = mtr.angstrom if unit is None else unit
+
+        return structure
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # atoms are derived from the arrays, so that equal structures pickle
+        # (and are fingerprinted) identically however they were built or used
+        state = super().__getstate__()
+        try:
+            numbers, positions, unit = self._arrays()
+        except ValueError:
+            # atoms without a common unit are kept as they are
+            return state
+
+        state.pop("_atoms", None)
+        state.update(_numbers=numbers, _positions=positions, _unit=unit)
+
+        return state
+
+    @property
+    def atoms(self) -> Tuple[mtr.Atom, ...]:
+        if self._atoms is None:
+            self._atoms = tuple(
+                mtr.Atom(element=symbol, position=p * self._unit)
+                for symbol, p in zip(self.atomic_symbols, self._positions)
+            )
+
+        return self._atoms
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray, mtr.Qty]:
+        if self._positions is None:
+            atoms = self.atoms
+            unit_set = set(atom.position.unit for atom in atoms)
+            try:
+                (unit,) = tuple(unit_set)
+            except ValueError:
+                raise ValueError("Atomic positions do not have a common unit.")
+
+            self._numbers = np.array([atom.Z for atom in atoms], dtype=np.int64)
+            self._positions = np.array(
+                [atom.position.value.ravel() for atom in atoms], dtype=np.float64
+            ).reshape(-1, 3)
+            self._unit = unit
+
+        return self._numbers, self._positions, self._unit
 
     @staticmethod
     def read(filepath: str) -> Structure:
@@ -42,28 +165,38 @@ class Structure:
             raise ValueError("Cannot read file with given extension.")
 
     def __add__(self, other: mtr.Structure) -> mtr.Structure:
-        return mtr.Structure((*self.atoms, *other.atoms))
+        numbers, positions, unit = self._arrays()
+        other_positions = other.atomic_positions.T.convert(unit).value
 
-    @property
-    def bonds(self) -> Dict[int, int]:
-        obmol = self.to_obmol()
+        return Structure.from_arrays(
+            np.concatenate([numbers, other._arrays()[0]]),
+            np.vstack([positions, other_positions]),
+            unit,
+        )
 
-        bonds = {k: [] for k in range(self.num_atoms)}
+    @cached_property
+    def connectivity(self) -> scipy.sparse.csr_matrix:
+        return mtr.covalent_connectivity(
+            self._arrays()[0], self.atomic_positions.convert(mtr.angstrom).value.T
+        )
 
-        for bond in ob.OBMolBondIter(obmol):
-            a, b = bond.GetBeginAtomIdx() - 1, bond.GetEndAtomIdx() - 1
-            bonds[a].append(b)
-            bonds[b].append(a)
+    @property
+    def bonds(self) -> Dict[int, List[int]]:
+        c = self.connectivity
 
-        return bonds
+        return {
+            i: c.indices[c.indptr[i] : c.indptr[i + 1]].tolist()
+            for i in range(self.num_atoms)
+        }
 
     def to_obmol(self, explicit_hydrogen: Optional[bool] = True) -> ob.OBMol:
         obmol = ob.OBMol()
 
-        for a in self.atoms:
+        numbers, positions, _ = self._arrays()
+        for Z, position in zip(numbers.tolist(), positions.tolist()):
             obatom = ob.OBAtom()
-            obatom.SetAtomicNum(a.Z)
-            obatom.SetVector(*a.position.squeeze())
+            obatom.SetAtomicNum(Z)
+            obatom.SetVector(*position)
             obmol.AddAtom(obatom)
 
         obmol.ConnectTheDots()
@@ -79,52 +212,32 @@ class Structure:
         return obmol
 
     def to_graph(self, explicit_hydrogen: Optional[bool] = True) -> nx.Graph:
-        g = nx.Graph()
+        numbers = self._arrays()[0]
+        connectivity = self.connectivity
+        positions = self.atomic_positions
 
-        bonds = self.bonds
+        if explicit_hydrogen:
+            nodes = np.arange(self.num_atoms)
+        else:
+            # hydrogens are dropped and counted on the atoms they are bonded to
+            nodes = np.flatnonzero(numbers != 1)
+            num_H = np.asarray(connectivity[:, numbers == 1].sum(axis=1)).ravel()
 
-        if not explicit_hydrogen:
-            non_hydrogens = [i for i, Z in enumerate(self.atomic_numbers) if Z != 1]
-            g.add_nodes_from(non_hydrogens)
-
-            edges = [
-                (i, j)
-                for i, v in bonds.items()
-                for j in v
-                if (i in non_hydrogens and j in non_hydrogens)
-            ]
-            g.add_edges_from(edges)
-
-            hydrogens = [i for i, Z in enumerate(self.atomic_numbers) if Z == 1]
-
-            nx.set_node_attributes(
-                G=g,
-                values={
-                    i: {
-                        "Z": self.atomic_numbers[i],
-                        "position": self.atomic_positions[:, i],
-                        "num_H": sum(1 for x in bonds[i] if x in hydrogens),
-                    }
-                    for i in non_hydrogens
-                },
-            )
+        g = nx.Graph()
+        g.add_nodes_from(range(len(nodes)))
 
-            g = nx.relabel_nodes(
-                g, {k: v for k, v in zip(g.nodes, range(len(g.nodes)))}
-            )
-        else:
-            g.add_nodes_from(range(len(self.atomic_numbers)))
+        i, j = scipy.sparse.triu(connectivity[nodes][:, nodes]).nonzero()
+        g.add_edges_from(zip(i.tolist(), j.tolist()))
 
-            edges = [(i, j) for i, v in bonds.items() for j in v]
-            g.add_edges_from(edges)
+        values = {
+            k: {"Z": int(numbers[n]), "position": positions[:, n]}
+            for k, n in enumerate(nodes)
+        }
+        if not explicit_hydrogen:
+            for k, n in enumerate(nodes):
+                values[k]["num_H"] = int(num_H[n])
 
-            nx.set_node_attributes(
-                G=g,
-                values={
-                    i: {"Z": Z, "position": self.atomic_positions[:, i]}
-                    for i, Z in enumerate(self.atomic_numbers)
-                },
-            )
+        nx.set_node_attributes(G=g, values=values)
 
         return g
 
@@ -261,52 +374,34 @@ class Structure:
 
     @property
     def num_atoms(self) -> int:
-        return len(self.atoms)
+        return len(self._arrays()[0])
 
-    @property
-    @memoize
+    @cached_property
     def atomic_symbols(self) -> Tuple[str]:
-        return tuple(atom.atomic_symbol for atom in self.atoms)
+        return tuple(_atomic_symbols[Z] for Z in self._arrays()[0])
 
-    @property
-    @memoize
+    @cached_property
     def atomic_positions(self) -> mtr.Qty:
-        value = np.hstack([atom.position.value for atom in self.atoms])
-        unit_set = set(atom.position.unit for atom in self.atoms)
-        try:
-            (unit,) = tuple(unit_set)
-        except ValueError:
-            raise ValueError("Atomic positions do not have a common unit.")
+        _, positions, unit = self._arrays()
 
-        return value * unit
+        return positions.T * unit
 
-    @property
-    @memoize
+    @cached_property
     def atomic_numbers(self) -> Tuple[int]:
-        return tuple(atom.Z for atom in self.atoms)
+        return tuple(self._arrays()[0].tolist())
 
-    @property
-    @memoize
+    @cached_property
     def atomic_masses(self) -> mtr.Qty:
-        value = tuple(atom.mass.value for atom in self.atoms)
-        unit_set = set(atom.mass.unit for atom in self.atoms)
-        try:
-            (unit,) = tuple(unit_set)
-        except ValueError:
-            raise ValueError("Atomic masses do not have a common unit.")
+        return _masses[self._arrays()[0]] * mtr.amu
 
-        return value * unit
-
-    @property
-    @memoize
+    @cached_property
     def mass(self) -> mtr.Qty:
         value = sum(self.atomic_masses.value)
         unit = self.atomic_masses.unit
 
         return value * unit
 
-    @property
-    @memoize
+    @cached_property
     def center_of_mass(self) -> mtr.Qty:
         return (
             (self.atomic_masses.value * self.atomic_positions.value)
@@ -316,16 +411,17 @@ class Structure:
             / self.mass.value
         )
 
-    @property
-    @memoize
+    @cached_property
     def centered_atomic_positions(self) -> mtr.Qty:
         return self.atomic_positions - self.center_of_mass
 
     def element_substructure(self, Z: int) -> mtr.Structure:
-        return Structure(*(atom for atom in self.atoms if atom.Z == Z))
+        numbers, positions, unit = self._arrays()
+        mask = numbers == Z
 
-    @property
-    @memoize
+        return Structure.from_arrays(numbers[mask], positions[mask], unit)
+
+    @cached_property
     def inertia_tensor(self) -> mtr.Qty:
         ms = self.atomic_masses
         rs = self.centered_atomic_positions
@@ -338,18 +434,102 @@ class Structure:
             * rs.unit ** 2
         )
 
-    @property
-    @memoize
-    def distance_matrix(self):
-        # NOTE: equation taken from https://arxiv.org/pdf/1804.04310.pdf
-        pp = self.atomic_positions.T @ self.atomic_positions
+    @cached_property
+    def distance_matrix(self) -> mtr.Qty:
+        """Squared distances between all pairs of atoms.
+
+        As it always has, this holds squared distances, in the square of the
+        unit of `atomic_positions`; so do the blocks of `distance_matrix_blocks`.
+        `neighbor_pairs` and `sparse_distance_matrix` give plain distances.
+        """
+        _, positions, unit = self._arrays()
 
-        pp_repeat = np.tile(np.diag(pp.value), (self.num_atoms, 1)) * pp.unit
+        return scipy.spatial.distance.cdist(positions, positions, "sqeuclidean") * (
+            unit ** 2
+        )
 
-        return pp_repeat + pp_repeat.T - 2 * pp
+    def _cutoff(self, cutoff: Union[float, mtr.Qty]) -> float:
+        if isinstance(cutoff, mtr.Quantity):
+            return cutoff.convert(self._arrays()[2]).value.item()
 
-    @property
-    @memoize
+        return float(cutoff)
+
+    def neighbor_pairs(
+        self, cutoff: Union[float, mtr.Qty]
+    ) -> Tuple[np.ndarray, mtr.Qty]:
+        """Find all pairs of atoms within a cutoff distance of each other.
+
+        Parameters
+        ----------
+        cutoff : Union[float, mtr.Qty]
+            Maximum distance, in the unit of `atomic_positions` if not a quantity.
+
+        Returns
+        -------
+        Tuple[np.ndarray, mtr.Qty]
+            (M,2) array of atom indices i < j and the M distances between them.
+        """
+        _, positions, unit = self._arrays()
+
+        tree = scipy.spatial.cKDTree(positions)
+        pairs = tree.query_pairs(r=self._cutoff(cutoff), output_type="ndarray")
+        pairs = pairs[np.lexsort(pairs.T[::-1])]
+        i, j = pairs.T
+
+        return pairs, np.linalg.norm(positions[i] - positions[j], axis=1) * unit
+
+    def sparse_distance_matrix(
+        self, cutoff: Union[float, mtr.Qty]
+    ) -> scipy.sparse.csr_matrix:
+        """Compute distances between atoms within a cutoff distance of each other.
+
+        Parameters
+        ----------
+        cutoff : Union[float, mtr.Qty]
+            Maximum distance, in the unit of `atomic_positions` if not a quantity.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Symmetric (N,N) matrix of distances in the unit of `atomic_positions`.
+            Pairs farther apart than `cutoff` are not stored.
+        """
+        pairs, d = self.neighbor_pairs(cutoff)
+        i, j = pairs.T
+
+        return scipy.sparse.csr_matrix(
+            (np.concatenate([d.value, d.value]), (np.r_[i, j], np.r_[j, i])),
+            shape=(self.num_atoms, self.num_atoms),
+        )
+
+    def distance_matrix_blocks(
+        self, chunk_size: Optional[int] = 1024
+    ) -> Iterator[Tuple[slice, mtr.Qty]]:
+        """Compute `distance_matrix` a block of rows at a time.
+
+        Like `distance_matrix`, the blocks hold squared distances. At most
+        `chunk_size` x N of them are held in memory at once.
+
+        Parameters
+        ----------
+        chunk_size : Optional[int], optional
+            Number of rows per block, by default 1024
+
+        Yields
+        ------
+        Tuple[slice, mtr.Qty]
+            Rows of the distance matrix covered by the block and the block
+            of squared distances itself.
+        """
+        _, positions, unit = self._arrays()
+
+        for start in range(0, self.num_atoms, chunk_size):
+            rows = slice(start, min(start + chunk_size, self.num_atoms))
+            yield rows, scipy.spatial.distance.cdist(
+                positions[rows], positions, "sqeuclidean"
+            ) * (unit ** 2)
+
+    @cached_property
     def inertia_aligned_atomic_positions(self) -> mtr.Qty:
         # FIXME: examine and clean this one up
         if self.num_atoms == 1:
@@ -366,21 +546,18 @@ class Structure:
 
         return R @ self.centered_atomic_positions
 
-    @property
-    @memoize
+    @cached_property
     def principal_moments(self) -> mtr.Qty:
         return (
             scipy.linalg.eigvalsh(self.inertia_tensor.value) * self.inertia_tensor.unit
         )
 
-    @property
-    @memoize
+    @cached_property
     def principal_axes(self) -> np.ndarray:
         _, axes = scipy.linalg.eigh(self.inertia_tensor.value)
         return axes
 
-    @property
-    @memoize
+    @cached_property
     def diameter(self) -> mtr.Qty:
         hull = scipy.spatial.ConvexHull(self.atomic_positions.value)
         # only look at atoms on the convex hull
@@ -393,8 +570,7 @@ class Structure:
         )
 
     # FIXME: fix this, annotation too
-    @property
-    @memoize
+    @cached_property
     def pointgroup(self):
         sf = mtr.symfinder.SymmetryFinder()
         return sf.molecular_pointgroup(
@@ -403,8 +579,7 @@ class Structure:
         )
 
     # FIXME: fix this, annotation too
-    @property
-    @memoize
+    @cached_property
     def maximally_symmetric_spanning_set(self):
         """
         Finds a set of vectors which span R^3 and which are related to one another
@@ -448,27 +623,20 @@ def _read_xyz(filepath: str, coordinate_unit: str = "angstrom") -> Structure:
             )
         )
 
-    atomic_symbols = atom_data[:, 0]
-    atomic_positions = (
-        np.asarray(p, dtype="float64") * getattr(mtr, coordinate_unit)
-        for p in atom_data[:, 1:]
+    return Structure.from_arrays(
+        atom_data[:, 0],
+        atom_data[:, 1:].astype("float64"),
+        getattr(mtr, coordinate_unit),
     )
-    atoms = (
-        mtr.Atom(element=symbol, position=position)
-        for symbol, position in zip(atomic_symbols, atomic_positions)
-    )
-
-    return Structure(*atoms)
 
 
 def _structure_from_pubchem_compound(compound: pcp.Compound) -> mtr.Structure:
     # FIXME: assumes the pubchem distance unit is angstrom - is this correct??
-    atom_generator = (
-        (a.element, (a.x, a.y, a.z) * mtr.angstrom) for a in compound.atoms
+    return Structure.from_arrays(
+        [a.element for a in compound.atoms],
+        [(a.x, a.y, a.z) for a in compound.atoms],
+        mtr.angstrom,
     )
-    atoms = (mtr.Atom(element=symb, position=pos) for symb, pos in atom_generator)
-
-    return mtr.Structure(*atoms)
 
 
 def _structure_from_identifier(
@@ -539,12 +707,8 @@ def _structure_from_identifier(
     # FIXME: assumes the RDKIT distance unit is angstrom - is this correct??
     # NOTE: using conformer.GetPositions sometimes causes
     # a seg fault (RDKit) - use GetAtomPosition instead
-    atoms = (
-        mtr.Atom(
-            element=symbol,
-            position=conformer.GetAtomPosition(i) * mtr.angstrom,
-        )
-        for i, symbol in enumerate(symbols)
+    return Structure.from_arrays(
+        list(symbols),
+        [tuple(conformer.GetAtomPosition(i)) for i in range(conformer.GetNumAtoms())],
+        mtr.angstrom,
     )
-
-    return mtr.Structure(*atoms)
@@ -4,17 +4,16 @@ from typing import Callable, Iterable, Optional, Union
 import numpy as np
 
 import materia as mtr
-from materia.utils import memoize
+from materia.utils import Cached, cached_property
 
 __all__ = ["Dipole", "Excitation", "ExcitationSpectrum", "Polarizability"]
 
 
-class Dipole:
+class Dipole(Cached):
     def __init__(self, dipole_moment: mtr.Quantity) -> None:
         self.dipole_moment = dipole_moment
 
-    @property
-    @memoize
+    @cached_property
     def norm(self) -> mtr.Quantity:
         return np.linalg.norm(self.dipole_moment.value) * self.dipole_moment.unit
 
@@ -72,18 +71,57 @@ class ExcitationSpectrum:
     #     plt.show()
 
     def broaden(
-        self, fwhm: mtr.Quantity
+        self, fwhm: mtr.Quantity, gamma: Optional[mtr.Quantity] = None
     ) -> Callable[Iterable[Union[int, float]], Iterable[Union[int, float]]]:
+        # NOTE: fwhm is the standard deviation of the Gaussian component;
+        # gamma adds a Lorentzian component (half width), giving a Voigt profile
         def f(energies: mtr.Quantity) -> Iterable[Union[int, float]]:
-            s = 0
-            for excitation in self.excitations:
-                x = (energies - excitation.energy) / fwhm
-                x = np.array([e.value for e in x])
-                s += excitation.oscillator_strength * np.exp(-0.5 * x ** 2)
-            return s / (np.sqrt(2 * np.pi) * fwhm)
+            return mtr.broaden_lines(
+                self.energies, self.oscillator_strengths, energies, fwhm, gamma
+            )
 
         return f
 
+    @staticmethod
+    def broaden_many(
+        spectra: Iterable[ExcitationSpectrum],
+        energies: mtr.Quantity,
+        fwhm: mtr.Quantity,
+        gamma: Optional[mtr.Quantity] = None,
+    ) -> mtr.Quantity:
+        """Broaden many excitation spectra onto a common energy grid at once.
+
+        Parameters
+        ----------
+        spectra : Iterable[ExcitationSpectrum]
+            Spectra to broaden, possibly with different numbers of excitations.
+        energies : mtr.Quantity
+            (M,) energies at which the broadened spectra are evaluated.
+        fwhm : mtr.Quantity
+            Standard deviation of the Gaussian component.
+        gamma : Optional[mtr.Quantity], optional
+            Half width of the Lorentzian component, by default None
+
+        Returns
+        -------
+        mtr.Quantity
+            (len(spectra), M) broadened spectra.
+        """
+        spectra = list(spectra)
+        num_lines = max(len(s.excitations) for s in spectra)
+
+        # pad with zero-strength lines to a common number of lines
+        centers = np.zeros((len(spectra), num_lines))
+        strengths = np.zeros((len(spectra), num_lines))
+        for i, s in enumerate(spectra):
+            n = len(s.excitations)
+            centers[i, :n] = s.energies.convert(energies.unit).value
+            strengths[i, :n] = s.oscillator_strengths
+
+        return mtr.broaden_lines(
+            centers * energies.unit, strengths, energies, fwhm, gamma
+        )
+
     def dipole_strength(
         self, fwhm: mtr.Quantity
     ) -> Callable[Iterable[Union[int, float]], Iterable[Union[int, float]]]:
@@ -162,18 +200,16 @@ class Orbitals:
     pass
 
 
-class Polarizability:
+class Polarizability(Cached):
     def __init__(self, polarizability_tensor, applied_field=None) -> None:
         self.pol_tensor = polarizability_tensor
         self.applied_field = None
 
-    @property
-    @memoize
+    @cached_property
     def isotropic(self):
         return np.trace(self.pol_tensor.value) * self.pol_tensor.unit / 3
 
-    @property
-    @memoize
+    @cached_property
     def anisotropy(self) -> mtr.Quantity:
         # FIXME: verify accuracy of this method
         return (
@@ -186,8 +222,7 @@ class Polarizability:
             * self.pol_tensor.unit
         )
 
-    @property
-    @memoize
+    @cached_property
     def eigenvalues(self) -> mtr.Quantity:
         return np.linalg.eigvals(a=self.pol_tensor.value) * self.pol_tensor.unit
 
@@ -198,49 +233,43 @@ class Response:
         self.applied_field = applied_field
 
 
-class TDDipole:  # (TimeSeries):
+class TDDipole(Cached):  # (TimeSeries):
     def __init__(self, time, tddipole, applied_field=None):
         super().__init__(time=time, series=tddipole)
         self.tddipole = mtr.TimeSeries(x=time, y=tddipole)
 
-    @property
-    @memoize
+    @cached_property
     def dt(self):
         return self.tddipole.dt()
 
-    @property
-    @memoize
+    @cached_property
     def T(self):
         return self.tddipole.T()
 
     def damp(self, final_damp_value=1e-4):
         self.tddipole.damp(final_damp_value=final_damp_value)
 
-    @property
-    @memoize
+    @cached_property
     def fourier_transform(self, pad_len=None):
         return self.tddipole.fourier_transform(pad_len=pad_len)
 
 
-class TDPolarizability:  # (TimeSeries):
+class TDPolarizability(Cached):  # (TimeSeries):
     def __init__(self, time, td_polarizability):
         super().__init__(time=time, series=td_polarizability)
 
-    @property
-    @memoize
+    @cached_property
     def dt(self):
         return self.tddipole.dt()
 
-    @property
-    @memoize
+    @cached_property
     def T(self):
         return self.tddipole.T()
 
     def damp(self, final_damp_value=1e-4):
         self.tddipole.damp(final_damp_value=final_damp_value)
 
-    @property
-    @memoize
+    @cached_property
     def fourier_transform(self, pad_len=None):
         return self.tddipole.fourier_transform(pad_len=pad_len)
 
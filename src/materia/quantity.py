@@ -1,16 +1,30 @@
 from __future__ import annotations
-from typing import Any, Iterable, Optional, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
 import collections
+import functools
 import numpy as np
 
 
 __all__ = ["Dimension", "Quantity"]
 
 
-class Dimension(collections.abc.MutableMapping):
-    def __init__(
-        self,
+_BASE_DIMENSIONS = ("L", "T", "M", "A", "K", "N", "J")
+
+
+class Dimension(collections.abc.Mapping):
+    """Immutable exponents of the seven SI base dimensions.
+
+    Dimensions are interned, i.e. equal dimensions are the same object, so that
+    comparing and hashing them is cheap.
+    """
+
+    __slots__ = ("_exponents", "_hash")
+
+    _interned = {}
+
+    def __new__(
+        cls,
         L: Optional[int] = 0,
         T: Optional[int] = 0,
         M: Optional[int] = 0,
@@ -18,30 +32,36 @@ class Dimension(collections.abc.MutableMapping):
         K: Optional[int] = 0,
         N: Optional[int] = 0,
         J: Optional[int] = 0,
-    ) -> None:
+    ) -> Dimension:
+        return cls._from_exponents((L, T, M, A, K, N, J))
 
-        self._d = {
-            "L": L,
-            "T": T,
-            "M": M,
-            "A": A,
-            "K": K,
-            "N": N,
-            "J": J,
-        }
+    @classmethod
+    def _from_exponents(cls, exponents: Tuple[int, ...]) -> Dimension:
+        try:
+            return cls._interned[exponents]
+        except KeyError:
+            dimension = object.__new__(cls)
+            dimension._exponents = exponents
+            dimension._hash = hash(exponents)
+
+            return cls._interned.setdefault(exponents, dimension)
+
+    def __reduce__(self):
+        return Dimension, self._exponents
+
+    @property
+    def _d(self) -> Dict[str, int]:
+        return dict(zip(_BASE_DIMENSIONS, self._exponents))
 
     def __iter__(self):
         # FIXME: how to type annotate this?
-        return iter(self._d)
+        return iter(_BASE_DIMENSIONS)
 
     def __getitem__(self, k: str) -> int:
-        return self._d.__getitem__(k)
-
-    def __setitem__(self, k: str, v: int) -> None:
-        self._d.__setitem__(k, v)
-
-    def __delitem__(self, k: str) -> None:
-        del self[k]
+        try:
+            return self._exponents[_BASE_DIMENSIONS.index(k)]
+        except ValueError:
+            raise KeyError(k)
 
     def __len__(self) -> int:
         return 7
@@ -49,49 +69,41 @@ class Dimension(collections.abc.MutableMapping):
     # MULTIPLICATION
 
     def __mul__(self, other: Dimension) -> Dimension:
-        return Dimension(**{k: self._d[k] + other._d[k] for k in self._d})
-
-    def __rmul__(self, other: Dimension) -> Dimension:
-        return Dimension(**{k: self._d[k] + other._d[k] for k in self._d})
-
-    def __imul__(self, other: Dimension) -> Dimension:
-        for k, v in other._d.items():
-            self._d[k] += v
+        return Dimension._from_exponents(
+            tuple(a + b for a, b in zip(self._exponents, other._exponents))
+        )
 
-        return self
+    __rmul__ = __mul__
 
     # DIVISION
 
     def __truediv__(self, other: Dimension) -> Dimension:
-        return Dimension(**{k: self._d[k] - other._d[k] for k in self._d})
+        return Dimension._from_exponents(
+            tuple(a - b for a, b in zip(self._exponents, other._exponents))
+        )
 
     def __rtruediv__(self, other: Dimension) -> Dimension:
-        return Dimension(**{k: other._d[k] - self._d[k] for k in self._d})
-
-    def __itruediv__(self, other: Dimension) -> Dimension:
-        for k, v in other._d.items():
-            self._d[k] -= v
-
-        return self
+        return Dimension._from_exponents(
+            tuple(b - a for a, b in zip(self._exponents, other._exponents))
+        )
 
     # EXPONENTIATION
 
-    def __pow__(self, other: Dimension) -> Dimension:
-        return Dimension(**{k: v * other for k, v in self._d.items()})
-
-    def __ipow__(self, other: Dimension) -> Dimension:
-        for k in self._d:
-            self._d[k] *= other
-
-        return self
+    def __pow__(self, other: Union[int, float]) -> Dimension:
+        return Dimension._from_exponents(tuple(a * other for a in self._exponents))
 
     # COMPARISON
 
     def __eq__(self, other: Dimension) -> bool:
-        return self._d == other._d
+        if self is other:
+            return True
+        if not isinstance(other, Dimension):
+            return NotImplemented
+
+        return self._exponents == other._exponents
 
     def __hash__(self) -> int:
-        return hash(tuple(sorted(self._d.items())))
+        return self._hash
 
     def __str__(self) -> str:
         positive_power_strings = (
@@ -124,24 +136,55 @@ class Dimension(collections.abc.MutableMapping):
         return f"Dimension({kwargs_str})"
 
 
+_DIMENSIONLESS = Dimension()
+
+# units are shared between all quantities with the same prefactor and dimension
+_UNITS = {}
+_MAX_UNITS = 4096
+
+
+def _unit(prefactor: Union[int, float], dimension: Dimension) -> Quantity:
+    try:
+        return _UNITS[prefactor, dimension]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable prefactor, e.g. an array
+        return Quantity._new(np.array(1.0), prefactor, dimension)
+
+    unit = Quantity._new(np.array(1.0), prefactor, dimension)
+    # shared units must never be modified in place
+    unit.value.flags.writeable = False
+    if len(_UNITS) < _MAX_UNITS:
+        unit = _UNITS.setdefault((prefactor, dimension), unit)
+
+    return unit
+
+
 def _preconvert(func):
     def dec(self, other):
-        return func(self, other.convert(self.unit))
+        # skip conversion if units are already identical
+        if other.dimension is not self.dimension or other.prefactor != self.prefactor:
+            other = other.convert(self.unit)
+
+        return func(self, other)
 
     return dec
 
 
 def _precast(func):
     def dec(self, other):
-        try:
-            return func(self, other)
-        except AttributeError:
-            return func(self, Quantity(other))
+        if not isinstance(other, Quantity):
+            other = Quantity._new(np.asarray(other), 1.0, _DIMENSIONLESS)
+
+        return func(self, other)
 
     return dec
 
 
 class Quantity(collections.abc.Sequence):
+    __slots__ = ("value", "prefactor", "dimension")
+
     def __init__(
         self,
         value: Optional[Union[int, float, Iterable[int], Iterable[float]]] = 1.0,
@@ -159,59 +202,123 @@ class Quantity(collections.abc.Sequence):
         self.prefactor = prefactor
         self.dimension = Dimension(L=L, M=M, T=T, A=A, K=K, N=N, J=J)
 
+    @classmethod
+    def _new(
+        cls, value: Any, prefactor: Union[int, float], dimension: Dimension
+    ) -> Quantity:
+        # construct without copying value or rebuilding dimension
+        q = object.__new__(cls)
+        q.value = value if isinstance(value, np.ndarray) else np.array(value)
+        q.prefactor = prefactor
+        q.dimension = dimension
+
+        return q
+
     @property
     def magnitude(self):
         return self.value * self.prefactor
 
     @property
     def unit(self) -> Quantity:
-        return Quantity(prefactor=self.prefactor, **self.dimension)
+        return _unit(self.prefactor, self.dimension)
 
     def to_unit(self) -> Quantity:
         # FIXME: how to preserve value dtype?
-        return Quantity(prefactor=self.prefactor * self.value, **self.dimension)
+        return Quantity._new(np.array(1.0), self.prefactor * self.value, self.dimension)
 
     def convert(self, convert_to: Quantity) -> Quantity:
         if self.dimension != convert_to.dimension:
             raise ValueError("Cannot convert quantities with different dimensions.")
-        if self.unit != convert_to.unit:
+        if self.prefactor != convert_to.prefactor:
             # NOTE: can't write this as 'self.value *= ...' without
             # causing numpy unsafe casting error in some cases
-            return Quantity(
-                value=self.magnitude / convert_to.prefactor,
-                prefactor=convert_to.prefactor,
-                **convert_to.dimension,
+            return Quantity._new(
+                self.magnitude / convert_to.prefactor,
+                convert_to.prefactor,
+                convert_to.dimension,
             )
-        return Quantity(self.value, self.prefactor, **self.dimension)
+        return Quantity._new(self.value.copy(), self.prefactor, self.dimension)
 
     @property
     def T(self):
-        return self.value.T * self.unit
+        return Quantity._new(self.value.T.copy(), self.prefactor, self.dimension)
 
     def __getattr__(self, name: str) -> Any:
-        if name.startswith("__") and name.endswith("__"):
-            raise AttributeError
+        if (name.startswith("__") and name.endswith("__")) or name in (
+            "value",
+            "prefactor",
+            "dimension",
+        ):
+            raise AttributeError(name)
         # if not hasattr(self,name):
         return getattr(self.value, name)
 
     __array_priority__ = 1000
 
+    # NUMPY PROTOCOLS
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if kwargs.get("out") is not None:
+            return NotImplemented
+
+        if method == "__call__":
+            handler = _UFUNCS.get(ufunc)
+        elif method in ("reduce", "accumulate", "reduceat") and ufunc in _REDUCIBLE:
+            handler = _same_unit
+        else:
+            handler = None
+
+        if handler is None:
+            return NotImplemented
+
+        # as in arithmetic, operands without units are dimensionless
+        inputs = tuple(
+            x if isinstance(x, Quantity) else Quantity._new(x, 1.0, _DIMENSIONLESS)
+            for x in inputs
+        )
+
+        return handler(getattr(ufunc, method), *inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        if not all(issubclass(t, (Quantity, np.ndarray)) for t in types):
+            return NotImplemented
+
+        handler = _FUNCTIONS.get(func)
+        if handler is not None:
+            return handler(func, *args, **kwargs)
+
+        # dimensionless quantities are plain numbers to functions without unit
+        # rules; otherwise these are not supported, rather than silently
+        # dropping units
+        if any(q.dimension is not _DIMENSIONLESS for q in _quantities((args, kwargs))):
+            return NotImplemented
+        unitless = _unit(1.0, _DIMENSIONLESS)
+
+        return func(*_strip(args, unitless), **_strip(kwargs, unitless))
+
+    # NOTE: in-place operators modify the value of q in place, as for arrays;
+    # shared units have read-only values, so 'u += x' instead rebinds u to a
+    # new Quantity rather than modifying the unit of every other quantity
+
     # ADDITION
 
     @_precast
     @_preconvert
     def __add__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(self.value + other.value, self.prefactor, **self.dimension)
+        return Quantity._new(self.value + other.value, self.prefactor, self.dimension)
 
     @_precast
     @_preconvert
     def __radd__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(other.value + self.value, self.prefactor, **self.dimension)
+        return Quantity._new(other.value + self.value, self.prefactor, self.dimension)
 
     @_precast
     @_preconvert
     def __iadd__(self, other: Union[Quantity, int, float]) -> Quantity:
+        if not self.value.flags.writeable:
+            return self + other
         self.value += other.value
+
         return self
 
     # SUBTRACTION
@@ -219,42 +326,48 @@ class Quantity(collections.abc.Sequence):
     @_precast
     @_preconvert
     def __sub__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(self.value - other.value, self.prefactor, **self.dimension)
+        return Quantity._new(self.value - other.value, self.prefactor, self.dimension)
 
     @_precast
     @_preconvert
     def __rsub__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(other.value - self.value, self.prefactor, **self.dimension)
+        return Quantity._new(other.value - self.value, self.prefactor, self.dimension)
 
     @_precast
     @_preconvert
     def __isub__(self, other: Union[Quantity, int, float]) -> Quantity:
-        self.value -= other.convert(self.unit).value
+        if not self.value.flags.writeable:
+            return self - other
+        self.value -= other.value
+
         return self
 
     # MULTIPLICATION
 
     @_precast
     def __mul__(self, other: Union[Quantity, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             self.value * other.value,
             self.prefactor * other.prefactor,
-            **(self.dimension * other.dimension),
+            self.dimension * other.dimension,
         )
 
     @_precast
     def __rmul__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             other.value * self.value,
             other.prefactor * self.prefactor,
-            **(self.dimension * other.dimension),
+            self.dimension * other.dimension,
         )
 
     @_precast
     def __imul__(self, other: Union[Quantity, int, float]) -> Quantity:
+        if not self.value.flags.writeable:
+            return self * other
         self.value *= other.value
-        self.prefactor *= other.prefactor
-        self.dimension *= other.dimension
+        # dimensions are shared, so they are replaced rather than modified
+        self.prefactor = self.prefactor * other.prefactor
+        self.dimension = self.dimension * other.dimension
 
         return self
 
@@ -262,65 +375,63 @@ class Quantity(collections.abc.Sequence):
 
     @_precast
     def __matmul__(self, other: Union[Quantity, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             self.value @ other.value,
             self.prefactor * other.prefactor,
-            **(self.dimension * other.dimension),
+            self.dimension * other.dimension,
         )
 
     @_precast
     def __rmatmul__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             other.value @ self.value,
             other.prefactor * self.prefactor,
-            **(self.dimension * other.dimension),
+            self.dimension * other.dimension,
         )
 
-    @_precast
-    def __imatmul__(self, other: Union[Quantity, int, float]) -> Quantity:
-        self.value @= other.value
-        self.prefactor *= other.prefactor
-        self.dimension *= other.dimension
-
-        return self
-
     # DIVISION
 
     @_precast
     def __truediv__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             self.value / other.value,
             self.prefactor / other.prefactor,
-            **(self.dimension / other.dimension),
+            self.dimension / other.dimension,
         )
 
     @_precast
     def __rtruediv__(self, other: Union[Quantity, int, float]) -> Quantity:
-        return Quantity(
+        return Quantity._new(
             other.value / self.value,
             other.prefactor / self.prefactor,
-            **(other.dimension / self.dimension),
+            other.dimension / self.dimension,
         )
 
     @_precast
     def __itruediv__(self, other: Union[Quantity, int, float]) -> Quantity:
+        if not self.value.flags.writeable:
+            return self / other
         self.value /= other.value
-        self.prefactor /= other.prefactor
-        self.dimension /= other.dimension
+        self.prefactor = self.prefactor / other.prefactor
+        self.dimension = self.dimension / other.dimension
 
         return self
 
     # EXPONENTIATION
 
     def __pow__(self, other: Union[int, float]) -> Quantity:
-        return Quantity(
-            self.value ** other, self.prefactor ** other, **(self.dimension ** other)
+        return Quantity._new(
+            self.value ** other, self.prefactor ** other, self.dimension ** other
         )
 
     def __ipow__(self, other: Union[int, float]) -> Quantity:
+        if not self.value.flags.writeable:
+            return self ** other
         self.value **= other
-        self.prefactor **= other
-        self.dimension **= other
+        self.prefactor = self.prefactor ** other
+        self.dimension = self.dimension ** other
+
+        return self
 
     # COMPARISON
 
@@ -359,26 +470,30 @@ class Quantity(collections.abc.Sequence):
     # UNARY
 
     def __neg__(self) -> Quantity:
-        return Quantity(-self.value, self.prefactor, **self.dimension)
+        return Quantity._new(-self.value, self.prefactor, self.dimension)
 
     def __pos__(self) -> Quantity:
-        return Quantity(+self.value, self.prefactor, **self.dimension)
+        return Quantity._new(+self.value, self.prefactor, self.dimension)
 
     def __abs__(self) -> Quantity:
         # FIXME: should abs apply to the prefactor too?
-        return Quantity(abs(self.value), self.prefactor, **self.dimension)
+        return Quantity._new(abs(self.value), self.prefactor, self.dimension)
 
     def __invert__(self) -> Quantity:
         # FIXME: should ~ apply to the prefactor too?
-        return Quantity(~self.value, self.prefactor, **self.dimension)
+        return Quantity._new(~self.value, self.prefactor, self.dimension)
 
     # OTHER
 
     def __round__(self, number):
-        return Quantity(np.round(self.value, number), self.prefactor, **self.dimension)
+        return Quantity._new(
+            np.round(self.value, number), self.prefactor, self.dimension
+        )
 
     def __getitem__(self, index):
-        return Quantity(self.value[index], self.prefactor, **self.dimension)
+        return Quantity._new(
+            np.array(self.value[index]), self.prefactor, self.dimension
+        )
 
     def __len__(self):
         return len(self.value)
@@ -405,3 +520,428 @@ class Quantity(collections.abc.Sequence):
         dim_str = ",".join(f"{k}={v}" for k, v in self.dimension.items())
 
         return f"Quantity(value={self.value},prefactor={self.prefactor},{dim_str})"
+
+
+# ----- NumPy protocol helpers ----- #
+
+
+def _quantities(obj: Any) -> Iterable[Quantity]:
+    if isinstance(obj, Quantity):
+        yield obj
+    elif isinstance(obj, (list, tuple)):
+        for o in obj:
+            yield from _quantities(o)
+    elif isinstance(obj, dict):
+        for o in obj.values():
+            yield from _quantities(o)
+
+
+def _strip(obj: Any, unit: Optional[Quantity] = None) -> Any:
+    # replace quantities by their values, expressed in unit if given
+    if isinstance(obj, Quantity):
+        return obj.value if unit is None else obj.convert(unit).value
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_strip(o, unit) for o in obj)
+    if isinstance(obj, dict):
+        return {k: _strip(v, unit) for k, v in obj.items()}
+
+    return obj
+
+
+def _wrap(value: Any, unit: Quantity) -> Any:
+    if isinstance(value, (list, tuple)):
+        return type(value)(_wrap(v, unit) for v in value)
+
+    return Quantity._new(value, unit.prefactor, unit.dimension)
+
+
+def _same_unit(func, *args, **kwargs):
+    # operands share the unit of the first quantity, as does the result
+    unit = next(_quantities((args, kwargs))).unit
+
+    return _wrap(func(*_strip(args, unit), **_strip(kwargs, unit)), unit)
+
+
+def _matching_plain(func, *args, **kwargs):
+    # operands share the unit of the first quantity, the result is unitless
+    unit = next(_quantities((args, kwargs))).unit
+
+    return func(*_strip(args, unit), **_strip(kwargs, unit))
+
+
+def _plain(func, *args, **kwargs):
+    return func(*_strip(args), **_strip(kwargs))
+
+
+def _product(func, *args, **kwargs):
+    # the result unit is the product of the operand units
+    unit = functools.reduce(
+        lambda u, q: u * q.unit, _quantities((args, kwargs)), _unit(1.0, _DIMENSIONLESS)
+    )
+
+    return _wrap(func(*_strip(args), **_strip(kwargs)), unit)
+
+
+def _quotient(func, a, b, **kwargs):
+    unit_a = a.unit if isinstance(a, Quantity) else _unit(1.0, _DIMENSIONLESS)
+    unit_b = b.unit if isinstance(b, Quantity) else _unit(1.0, _DIMENSIONLESS)
+
+    return _wrap(func(_strip(a), _strip(b), **kwargs), unit_a / unit_b)
+
+
+def _dimensionless(func, *args, **kwargs):
+    # transcendental functions only accept dimensionless arguments
+    unitless = _unit(1.0, _DIMENSIONLESS)
+    for q in _quantities((args, kwargs)):
+        if q.dimension is not _DIMENSIONLESS:
+            name = getattr(func, "__self__", func).__name__
+            raise ValueError(f"{name} requires dimensionless arguments.")
+
+    return _wrap(func(*_strip(args, unitless), **_strip(kwargs, unitless)), unitless)
+
+
+def _equality(func, a, b, **kwargs):
+    # quantities of different dimensions are never equal
+    if a.dimension is not b.dimension:
+        shape = np.broadcast(a.value, b.value).shape
+        return np.full(shape, getattr(func, "__self__", func) is np.not_equal)
+
+    return func(a.value, b.convert(a.unit).value, **kwargs)
+
+
+def _power_of(exponent: Union[int, float]):
+    def handler(func, x, *args, **kwargs):
+        return _wrap(func(x.value, *args, **kwargs), x.unit ** exponent)
+
+    return handler
+
+
+def _power(func, x, p, **kwargs):
+    if isinstance(p, Quantity):
+        if p.dimension is not _DIMENSIONLESS:
+            raise ValueError("Exponent must be dimensionless.")
+        p = p.convert(_unit(1.0, _DIMENSIONLESS)).value
+    if not isinstance(x, Quantity):
+        return func(x, p, **kwargs)
+    if np.ndim(p) != 0:
+        raise ValueError("Exponent of a quantity must be a scalar.")
+
+    return _wrap(func(x.value, p, **kwargs), x.unit ** p.item())
+
+
+def _variance(func, a, *args, **kwargs):
+    return _wrap(func(a.value, *args, **kwargs), a.unit ** 2)
+
+
+def _interp(func, x, xp, fp, *args, **kwargs):
+    if isinstance(x, Quantity):
+        x = x.convert(xp.unit).value
+        xp = xp.value
+    if isinstance(fp, Quantity):
+        return _wrap(func(x, xp, fp.value, *args, **kwargs), fp.unit)
+
+    return func(x, xp, fp, *args, **kwargs)
+
+
+def _trapz(func, y, x=None, *args, **kwargs):
+    unit = y.unit if isinstance(y, Quantity) else _unit(1.0, _DIMENSIONLESS)
+    if isinstance(x, Quantity):
+        unit = unit * x.unit
+    elif isinstance(kwargs.get("dx"), Quantity):
+        unit = unit * kwargs["dx"].unit
+
+    return _wrap(func(_strip(y), _strip(x), *args, **_strip(kwargs)), unit)
+
+
+def _prod(func, a, axis=None, *args, **kwargs):
+    # the unit is raised to the number of factors in each product
+    if kwargs.get("where") is not None:
+        return NotImplemented
+    shape = np.shape(a.value)
+    axes = range(len(shape)) if axis is None else np.atleast_1d(axis)
+    n = int(np.prod([shape[i] for i in axes]))
+
+    return _wrap(func(a.value, axis, *args, **kwargs), a.unit ** n)
+
+
+def _det(func, a, **kwargs):
+    return _wrap(func(a.value, **kwargs), a.unit ** np.shape(a.value)[-1])
+
+
+def _solve(func, a, b, **kwargs):
+    # the solution x of a x = b has the unit of b / a
+    unit_a = a.unit if isinstance(a, Quantity) else _unit(1.0, _DIMENSIONLESS)
+    unit_b = b.unit if isinstance(b, Quantity) else _unit(1.0, _DIMENSIONLESS)
+
+    return _wrap(func(_strip(a), _strip(b), **kwargs), unit_b / unit_a)
+
+
+def _leading_unit(func, a, *args, **kwargs):
+    # the first (or only) output has the unit of a, the others (e.g.
+    # eigenvectors, indices or counts) are unitless
+    result = func(a.value, *args, **kwargs)
+    if not isinstance(result, tuple):
+        return _wrap(result, a.unit)
+
+    first = _wrap(result[0], a.unit)
+    if hasattr(result, "_replace"):
+        # named results such as EighResult
+        return result._replace(**{result._fields[0]: first})
+
+    return (first, *result[1:])
+
+
+def _each_unit(func, *args, **kwargs):
+    # the i-th output has the unit of the i-th operand
+    result = func(*_strip(args), **kwargs)
+
+    return type(result)(
+        _wrap(r, x.unit) if isinstance(x, Quantity) else r for r, x in zip(result, args)
+    )
+
+
+def _covariance(func, m, y=None, *args, **kwargs):
+    if isinstance(y, Quantity):
+        y = y.convert(m.unit).value
+
+    return _wrap(func(m.value, y, *args, **kwargs), m.unit ** 2)
+
+
+def _gradient(func, f, *varargs, **kwargs):
+    # derivatives along each axis have the unit of f per unit of its spacing
+    unitless = _unit(1.0, _DIMENSIONLESS)
+    unit = f.unit if isinstance(f, Quantity) else unitless
+    spacings = [h.unit if isinstance(h, Quantity) else unitless for h in varargs]
+
+    result = func(_strip(f), *_strip(varargs), **kwargs)
+    if not isinstance(result, (list, tuple)):
+        return _wrap(result, unit / (spacings or [unitless])[0])
+
+    spacings = spacings * len(result) if len(spacings) <= 1 else spacings
+    spacings = spacings or [unitless] * len(result)
+
+    return type(result)(_wrap(r, unit / h) for r, h in zip(result, spacings))
+
+
+def _histogram(func, a, bins=10, range=None, density=None, weights=None):
+    # counts are unitless unless weighted or normalized to a density,
+    # bin edges have the unit of a
+    unit = weights.unit if isinstance(weights, Quantity) else None
+    if density:
+        unit = (unit or _unit(1.0, _DIMENSIONLESS)) / a.unit
+
+    hist, edges = func(
+        a.value,
+        bins=_strip(bins, a.unit),
+        range=_strip(range, a.unit),
+        density=density,
+        weights=_strip(weights),
+    )
+
+    return (hist if unit is None else _wrap(hist, unit)), _wrap(edges, a.unit)
+
+
+_UFUNCS = {
+    **{
+        f: _same_unit
+        for f in (
+            np.add,
+            np.subtract,
+            np.negative,
+            np.positive,
+            np.absolute,
+            np.fabs,
+            np.conjugate,
+            np.rint,
+            np.floor,
+            np.ceil,
+            np.trunc,
+            np.maximum,
+            np.minimum,
+            np.fmax,
+            np.fmin,
+            np.hypot,
+            np.remainder,
+            np.fmod,
+        )
+    },
+    **{
+        f: _matching_plain
+        for f in (
+            np.less,
+            np.less_equal,
+            np.greater,
+            np.greater_equal,
+            np.arctan2,
+        )
+    },
+    **{f: _plain for f in (np.isfinite, np.isinf, np.isnan, np.sign, np.signbit)},
+    **{
+        f: _dimensionless
+        for f in (
+            np.exp,
+            np.expm1,
+            np.exp2,
+            np.log,
+            np.log2,
+            np.log10,
+            np.log1p,
+            np.sin,
+            np.cos,
+            np.tan,
+            np.arcsin,
+            np.arccos,
+            np.arctan,
+            np.sinh,
+            np.cosh,
+            np.tanh,
+            np.arcsinh,
+            np.arccosh,
+            np.arctanh,
+        )
+    },
+    np.equal: _equality,
+    np.not_equal: _equality,
+    np.multiply: _product,
+    np.matmul: _product,
+    np.divide: _quotient,
+    np.true_divide: _quotient,
+    np.reciprocal: _power_of(-1),
+    np.sqrt: _power_of(0.5),
+    np.cbrt: _power_of(1 / 3),
+    np.square: _power_of(2),
+    np.power: _power,
+}
+
+_REDUCIBLE = (np.add, np.maximum, np.minimum, np.fmax, np.fmin)
+
+_FUNCTIONS = {
+    **{
+        f: _same_unit
+        for f in (
+            np.sum,
+            np.nansum,
+            np.cumsum,
+            np.mean,
+            np.nanmean,
+            np.average,
+            np.median,
+            np.nanmedian,
+            np.percentile,
+            np.quantile,
+            np.std,
+            np.nanstd,
+            np.amin,
+            np.amax,
+            np.min,
+            np.max,
+            np.nanmin,
+            np.nanmax,
+            np.ptp,
+            np.sort,
+            np.round,
+            np.around,
+            np.clip,
+            np.diff,
+            np.trace,
+            np.diag,
+            np.diagonal,
+            np.copy,
+            np.reshape,
+            np.ravel,
+            np.squeeze,
+            np.transpose,
+            np.flip,
+            np.roll,
+            np.atleast_1d,
+            np.atleast_2d,
+            np.concatenate,
+            np.stack,
+            np.vstack,
+            np.hstack,
+            np.column_stack,
+            np.where,
+            np.linspace,
+            np.real,
+            np.imag,
+            np.zeros_like,
+            np.ones_like,
+            np.full_like,
+            np.empty_like,
+            np.linalg.norm,
+            np.linalg.eigvals,
+            np.linalg.eigvalsh,
+            np.expand_dims,
+            np.swapaxes,
+            np.moveaxis,
+            np.broadcast_to,
+            np.repeat,
+            np.tile,
+            np.take,
+            np.append,
+            np.split,
+            np.array_split,
+        )
+    },
+    **{
+        f: _plain
+        for f in (
+            np.shape,
+            np.ndim,
+            np.size,
+            np.nonzero,
+            np.flatnonzero,
+            np.argwhere,
+            np.count_nonzero,
+            np.any,
+            np.all,
+            np.isreal,
+            np.iscomplex,
+            np.isrealobj,
+            np.iscomplexobj,
+        )
+    },
+    **{
+        f: _matching_plain
+        for f in (
+            np.isclose,
+            np.allclose,
+            np.array_equal,
+            np.corrcoef,
+            np.argmin,
+            np.argmax,
+            np.argsort,
+            np.searchsorted,
+        )
+    },
+    **{
+        f: _product
+        for f in (
+            np.dot,
+            np.vdot,
+            np.inner,
+            np.outer,
+            np.cross,
+            np.tensordot,
+            np.kron,
+            np.einsum,
+        )
+    },
+    np.prod: _prod,
+    np.nanprod: _prod,
+    np.linalg.det: _det,
+    np.linalg.inv: _power_of(-1),
+    np.linalg.pinv: _power_of(-1),
+    np.linalg.solve: _solve,
+    np.var: _variance,
+    np.nanvar: _variance,
+    np.interp: _interp,
+    np.trapz: _trapz,
+    np.unique: _leading_unit,
+    np.linalg.eig: _leading_unit,
+    np.linalg.eigh: _leading_unit,
+    np.meshgrid: _each_unit,
+    np.cov: _covariance,
+    np.gradient: _gradient,
+    np.histogram: _histogram,
+}
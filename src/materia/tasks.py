@@ -1,18 +1,23 @@
 from __future__ import annotations
-from typing import Any, Callable, Iterable, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
+import concurrent.futures
 import dlib
 import functools
 import materia as mtr
-from materia.utils import memoize
+from materia.utils import cached_method
+from materia.workflow import _digest
+import os
 import re
 import shlex
 import subprocess
+import types
 
 __all__ = [
     "ExternalTask",
     "FunctionTask",
     "InputTask",
+    "map_tasks",
     "MaxLIPOTR",
     "ShellCommand",
     "Task",
@@ -31,11 +36,24 @@ class Task:
         List of Tasks required as args in compute.
     named_requirements : dict
         Dicionary of Tasks required as kwargs in compute.
+    handlers : list
+        Handlers which check the result of compute and repair the Task
+        through actions when it failed.
+    max_retries : int
+        Number of times a Task may be repaired and rerun in a Workflow
+        before giving up.
+    resources : dict
+        Resources (e.g. cores, memory in bytes, scratch in bytes)
+        claimed by compute, used for scheduling in Workflows.
     """
 
+    max_retries = 3
+
     def __init__(
         self,
         name: Optional[str] = None,
+        handlers: Optional[Iterable[mtr.Handler]] = None,
+        resources: Optional[Dict[str, float]] = None,
     ) -> None:
         """Initialize Task.
 
@@ -43,6 +61,10 @@ class Task:
         ----------
         name : Optional[str], optional
             Name for use in Workflows, by default None
+        handlers : Optional[Iterable[mtr.Handler]], optional
+            Handlers checking the result of compute, by default None
+        resources : Optional[Dict[str, float]], optional
+            Resources claimed by compute, by default None
         """
         self.name = (
             name
@@ -54,6 +76,8 @@ class Task:
 
         self.requirements = []
         self.named_requirements = {}
+        self.handlers = list(handlers or [])
+        self.resources = dict(resources or {})
 
     def requires(self, *args: Task, **kwargs: Task) -> None:
         """Register Task dependencies."""
@@ -65,6 +89,21 @@ class Task:
         self.requirements += new_reqs
         self.named_requirements = dict(**self.named_requirements, **new_named_reqs)
 
+    def fingerprint(self) -> Tuple[Any, ...]:
+        """Return the configuration which determines the output of compute.
+
+        Used together with the fingerprints of its requirements to identify
+        results in a ResultCache. Subclasses whose output depends on instance
+        attributes (e.g. an engine or a command) should extend this.
+
+        Returns
+        -------
+        Tuple[Any, ...]
+            Picklable identity of the Task, by default its class. None if the
+            Task cannot be identified, in which case its result is not cached.
+        """
+        return (self.__class__.__module__, self.__class__.__qualname__)
+
     def compute(self, **kwargs: Any) -> Any:
         """Execute Task using requirements as inputs.
 
@@ -106,6 +145,10 @@ class ExternalTask(Task):
         List of Tasks required as args in compute.
     named_requirements : dict
         Dicionary of Tasks required as kwargs in compute.
+    handlers : list
+        Handlers which check the result of compute.
+    resources : dict
+        Resources claimed by compute, by default those of the engine.
     """
 
     def __init__(
@@ -113,10 +156,41 @@ class ExternalTask(Task):
         engine: mtr.Engine,
         io: mtr.IO,
         name: Optional[str] = None,
+        handlers: Optional[Iterable[mtr.Handler]] = None,
+        resources: Optional[Dict[str, float]] = None,
     ) -> None:
         self.engine = engine
         self.io = io
-        super().__init__(name=name)
+        super().__init__(
+            name=name,
+            handlers=handlers,
+            resources={**engine.resources(), **(resources or {})},
+        )
+
+    def monitors(self) -> List[Callable[[str], None]]:
+        """Return callables checking output lines with this task's handlers.
+
+        Passed to the engine's execute method, they stop the external process as
+        soon as a handler recognizes failure from a line of its output, raising
+        an ActionSignal with the handler's repair actions.
+
+        Returns
+        -------
+        List[Callable[[str], None]]
+            Line checks of the handlers which implement `check_line`.
+        """
+        return [
+            functools.partial(h.run_line, task=self)
+            for h in self.handlers
+            if type(h).check_line is not mtr.Handler.check_line
+        ]
+
+    def fingerprint(self) -> Tuple[Any, ...]:
+        return super().fingerprint() + (
+            self.engine.__class__.__qualname__,
+            self.engine.executable,
+            tuple(self.engine.arguments or ()),
+        )
 
 
 class FunctionTask(Task):
@@ -142,10 +216,83 @@ class FunctionTask(Task):
         super().__init__(name=name)
         self.f = f
 
+    def fingerprint(self) -> Optional[Tuple[Any, ...]]:
+        f = _callable_fingerprint(self.f)
+
+        return None if f is None else super().fingerprint() + (f,)
+
     def compute(self, **kwargs: Any) -> Any:
         return self.f(**kwargs)
 
 
+def _code_fingerprint(code: types.CodeType) -> Tuple[Any, ...]:
+    # code objects cannot be pickled, but their bytecode, constants (including
+    # nested code objects, e.g. of inner functions) and names can
+    return (
+        code.co_code,
+        tuple(
+            _code_fingerprint(c) if isinstance(c, types.CodeType) else c
+            for c in code.co_consts
+        ),
+        code.co_names,
+    )
+
+
+def _callable_fingerprint(
+    f: Callable, closure: bool = True, _seen: Optional[Set[int]] = None
+) -> Optional[Tuple[Any, ...]]:
+    # identity of a callable covering what determines its output, so that
+    # distinct lambdas or closures created at the same place are told apart;
+    # None if it cannot be identified
+    _seen = set() if _seen is None else _seen
+    if id(f) in _seen:
+        # recursive closures refer to themselves
+        return ("recursive",)
+    _seen = _seen | {id(f)}
+
+    if isinstance(f, functools.partial):
+        func = _callable_fingerprint(f.func, closure, _seen)
+        if func is None:
+            return None
+        return ("partial", func, f.args, tuple(sorted(f.keywords.items())))
+
+    if isinstance(f, types.MethodType):
+        func = _callable_fingerprint(f.__func__, closure, _seen)
+        return None if func is None else ("method", func, f.__self__)
+
+    if isinstance(f, (types.BuiltinFunctionType, type)):
+        return (f.__module__, f.__qualname__)
+
+    if not isinstance(f, types.FunctionType):
+        # callable objects are identified by their class and state
+        return ("object", f)
+
+    cells = ()
+    if closure:
+        try:
+            contents = [c.cell_contents for c in f.__closure__ or ()]
+        except ValueError:
+            # closure over a variable which has not been assigned yet
+            return None
+        cells = []
+        for c in contents:
+            if isinstance(c, (types.FunctionType, functools.partial)):
+                c = _callable_fingerprint(c, closure, _seen)
+                if c is None:
+                    return None
+            cells.append(c)
+        cells = tuple(cells)
+
+    return (
+        f.__module__,
+        f.__qualname__,
+        _code_fingerprint(f.__code__),
+        f.__defaults__,
+        tuple(sorted((f.__kwdefaults__ or {}).items())),
+        cells,
+    )
+
+
 class InputTask(Task):
     """Task which returns a fixed value.
 
@@ -169,6 +316,9 @@ class InputTask(Task):
         super().__init__(name=name)
         self.value = value
 
+    def fingerprint(self) -> Tuple[Any, ...]:
+        return super().fingerprint() + (self.value,)
+
     def compute(self, *args: Any, **kwargs: Any) -> Any:
         return self.value
 
@@ -196,6 +346,9 @@ class ShellCommand(Task):
         super().__init__(name=name)
         self.command = command
 
+    def fingerprint(self) -> Tuple[Any, ...]:
+        return super().fingerprint() + (self.command,)
+
     def compute(self) -> None:
         subprocess.call(shlex.split(self.command))
 
@@ -210,6 +363,67 @@ def task(
     return FunctionTask(f=f, name=name)
 
 
+def map_tasks(
+    factory: Callable[..., Task],
+    molecules: Iterable[mtr.Molecule],
+    work_dir: str,
+    inp: str,
+    out: str,
+    name: Optional[str] = None,
+    temp: Optional[bool] = False,
+    **requirements: Any,
+) -> List[Task]:
+    """Instantiate one Task per molecule from a task factory.
+
+    Each Task gets its own working directory and requires its molecule as
+    `molecule`. The remaining requirements (e.g. settings) are wrapped in a
+    single InputTask shared by all Tasks, so that the resulting Workflow
+    stays linear in the number of molecules.
+
+    Parameters
+    ----------
+    factory : Callable[..., Task]
+        Callable accepting io and name keyword arguments, e.g. QChem.single_point.
+    molecules : Iterable[mtr.Molecule]
+        Molecules to map the factory over.
+    work_dir : str
+        Directory under which per-task working directories are created.
+    inp : str
+        Name of the input file of each Task.
+    out : str
+        Name of the output file of each Task.
+    name : Optional[str], optional
+        Prefix of Task names and working directories, by default
+        the name of the factory
+    temp : Optional[bool], optional
+        Whether each Task runs in a temporary directory, by default False
+
+    Returns
+    -------
+    List[Task]
+        One Task per molecule, in order.
+    """
+    molecules = list(molecules)
+    name = name or getattr(factory, "__name__", "task")
+    width = len(str(max(len(molecules) - 1, 0)))
+
+    shared = {
+        k: v if isinstance(v, Task) else InputTask(v) for k, v in requirements.items()
+    }
+
+    tasks = []
+    for i, molecule in enumerate(molecules):
+        task_name = f"{name}-{i:0{width}d}"
+        t = factory(
+            io=mtr.IO(inp, out, os.path.join(work_dir, task_name), temp=temp),
+            name=task_name,
+        )
+        t.requires(molecule=molecule, **shared)
+        tasks.append(t)
+
+    return tasks
+
+
 T = Union[int, float]
 
 
@@ -222,6 +436,15 @@ class MaxLIPOTR(Task):
         Objective function to be minimized.
     name : str
         Name for use in Workflows.
+    batch_size : int
+        Number of points proposed and evaluated concurrently per iteration.
+    cache : Optional[mtr.ResultCache]
+        Store of objective evaluations shared across runs. Prior evaluations
+        warm start the search and are never repeated.
+    key : Any
+        Picklable identifier of the objective's inputs, e.g. a molecule and
+        its settings, distinguishing otherwise identical objectives in the
+        cache. If None, the contents of the objective's closure are used.
     requirements : list
         List of Tasks required as args in compute.
     named_requirements : dict
@@ -232,11 +455,24 @@ class MaxLIPOTR(Task):
         self,
         objective_function: Callable[T, T],
         name: Optional[str] = None,
+        batch_size: int = 1,
+        cache: Optional[mtr.ResultCache] = None,
+        key: Any = None,
     ) -> None:
         super().__init__(name)
         self.objective_function = objective_function
+        self.batch_size = batch_size
+        self.cache = cache
+        self.key = key
+
+    def fingerprint(self) -> Optional[Tuple[Any, ...]]:
+        # bounds and number of evaluations are inputs of compute,
+        # and as such covered by the fingerprints of the requirements
+        f = _callable_fingerprint(self.objective_function)
 
-    @memoize
+        return None if f is None else super().fingerprint() + (f, self.key)
+
+    @cached_method
     def _evaluate_objective(self, *args: T) -> T:
         return self.objective_function(*args)
 
@@ -247,14 +483,84 @@ class MaxLIPOTR(Task):
         num_evals: int,
         epsilon: Optional[float] = 0,
     ) -> Tuple[T, Union[int, float]]:
-
-        return dlib.find_min_global(
-            self._evaluate_objective,
-            x_min if isinstance(x_min, list) else [x_min],
-            x_max if isinstance(x_max, list) else [x_max],
-            num_evals,
-            solver_epsilon=epsilon,
-        )
+        x_min = x_min if isinstance(x_min, list) else [x_min]
+        x_max = x_max if isinstance(x_max, list) else [x_max]
+
+        if self.batch_size <= 1 and self.cache is None:
+            return dlib.find_min_global(
+                self._evaluate_objective,
+                x_min,
+                x_max,
+                num_evals,
+                solver_epsilon=epsilon,
+            )
+
+        return self._search(x_min, x_max, num_evals, epsilon)
+
+    def _cache_key(self) -> Optional[str]:
+        # the key stands in for the objective's closure, which may
+        # capture inputs irrelevant to its values (e.g. working directories)
+        f = _callable_fingerprint(self.objective_function, closure=self.key is None)
+
+        return None if f is None else _digest((f, self.key))
+
+    def _load_evaluations(self) -> Dict[Tuple[float, ...], float]:
+        key = None if self.cache is None else self._cache_key()
+        if key is None:
+            return {}
+
+        try:
+            return self.cache[key]
+        except KeyError:
+            return {}
+
+    def _store_evaluations(self, evaluations: Dict[Tuple[float, ...], float]) -> None:
+        key = None if self.cache is None else self._cache_key()
+        if key is not None:
+            # merge with evaluations stored by concurrent runs in the meantime
+            self.cache[key] = {**self._load_evaluations(), **evaluations}
+
+    def _search(
+        self, x_min: List[T], x_max: List[T], num_evals: int, epsilon: float
+    ) -> Tuple[T, Union[int, float]]:
+        known = self._load_evaluations()
+        spec = dlib.function_spec(list(map(float, x_min)), list(map(float, x_max)))
+
+        # global_function_search maximizes
+        initial = [
+            dlib.function_evaluation(list(x), -y)
+            for x, y in known.items()
+            if all(lo <= xi <= hi for lo, xi, hi in zip(x_min, x, x_max))
+        ]
+        search = dlib.global_function_search([spec], [initial], 0.001)
+        search.set_solver_epsilon(epsilon)
+
+        # ask for a batch of points before telling the solver any of their values,
+        # so that each batch can be evaluated concurrently
+        batch_size = max(self.batch_size, 1)
+        with concurrent.futures.ThreadPoolExecutor(batch_size) as executor:
+            while num_evals > 0:
+                requests = [
+                    search.get_next_x() for _ in range(min(batch_size, num_evals))
+                ]
+                points = [tuple(r.x) for r in requests]
+                new = {x: None for x in points if x not in known}
+                new.update(
+                    zip(new, executor.map(lambda x: self._evaluate_objective(*x), new))
+                )
+                known.update(new)
+
+                for r, x in zip(requests, points):
+                    r.set(-known[x])
+
+                if new:
+                    self._store_evaluations(new)
+
+                num_evals -= len(requests)
+
+        x, y, _ = search.get_best_function_eval()
+
+        return list(x), -y
 
     # def plot_results(self):
     #     x, y = zip(*sorted(self.evaluate_objective.cache.items()))
@@ -180,3 +180,10 @@ kB = scipy.constants.k * joule / kelvin
 epsilon_0 = scipy.constants.epsilon_0 * farad / meter
 m_e = scipy.constants.m_e * kilogram
 N_A = scipy.constants.N_A / mole
+
+# units and constants are shared by all their users, so in-place operators
+# rebind rather than modify them (see Quantity.__iadd__)
+for _quantity in list(globals().values()):
+    if isinstance(_quantity, mtr.Quantity):
+        _quantity.value.flags.writeable = False
+del _quantity
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 import collections
 import contextlib
@@ -10,21 +10,30 @@ import networkx as nx
 import numpy as np
 import os
 import pathlib
+import shutil
 import tempfile
+import threading
+import weakref
 import rdkit
 import rdkit.Chem
 import rdkit.Chem.AllChem
 import scipy.interpolate
+import scipy.sparse
 import scipy.spatial
 
 
 __all__ = [
+    "Cached",
+    "cached_method",
+    "cached_property",
+    "covalent_connectivity",
     "expand",
     "extrapolate",
     "interpolate",
+    "invalidate",
     "IO",
-    "memoize",
     "mkdir_safe",
+    "ScratchManager",
     "Settings",
     "temporary_seed",
     "work_dir",
@@ -136,7 +145,117 @@ def interpolate_sprague(x, y, x_interp_to):
     return x_interp_to, y_interp
 
 
-_IO = collections.namedtuple("IOParams", ["work_dir", "inp", "out"])
+_IO = collections.namedtuple(
+    "IOParams", ["work_dir", "inp", "out", "scratch_dir"], defaults=(None,)
+)
+
+
+class ScratchManager:
+    """Allocate per-job scratch directories on a fast filesystem.
+
+    Every allocation is a fresh, uniquely named directory below a directory
+    private to the manager and the current process, and is deleted once the
+    job is done. Sizes reserved by concurrent allocations are tracked against an
+    optional quota; allocations which would exceed it wait for others to finish.
+
+    Parameters
+    ----------
+    root : Optional[str], optional
+        Directory on the filesystem to use, e.g. a tmpfs or local disk, by
+        default /dev/shm if it exists and the system temporary directory
+        otherwise.
+    quota : Optional[float], optional
+        Maximum number of bytes reserved at once in this process, by default
+        unlimited.
+    job_size : Optional[float], optional
+        Number of bytes reserved per allocation unless specified otherwise,
+        by default 0.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        quota: Optional[float] = None,
+        job_size: Optional[float] = 0,
+    ) -> None:
+        if root is None:
+            root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self.root = expand(root)
+        self.quota = quota
+        self.job_size = job_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self.reserved = 0
+        self._condition = threading.Condition()
+        self._dir = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # reservations and directories are local to each process
+        return {"root": self.root, "quota": self.quota, "job_size": self.job_size}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset()
+
+    @property
+    def directory(self) -> str:
+        """Directory of this manager's allocations, removed at exit."""
+        with self._condition:
+            if self._dir is None:
+                mkdir_safe(self.root)
+                self._dir = tempfile.mkdtemp(prefix="materia-scratch-", dir=self.root)
+                weakref.finalize(self, shutil.rmtree, self._dir, ignore_errors=True)
+
+            return self._dir
+
+    def usage(self) -> int:
+        """Return the number of bytes currently used by all allocations."""
+        return sum(
+            os.path.getsize(os.path.join(dirpath, f))
+            for dirpath, _, filenames in os.walk(self.directory)
+            for f in filenames
+        )
+
+    @contextlib.contextmanager
+    def allocate(self, size: Optional[float] = None):
+        """Allocate a scratch directory for the duration of a job.
+
+        Parameters
+        ----------
+        size : Optional[float], optional
+            Number of bytes to reserve, by default `job_size`.
+
+        Yields
+        ------
+        str
+            Path to the new, empty scratch directory.
+
+        Raises
+        ------
+        ValueError
+            Raised if `size` exceeds the quota.
+        """
+        size = self.job_size if size is None else size
+        if self.quota is not None and size > self.quota:
+            raise ValueError(f"Scratch request of {size} bytes exceeds quota.")
+
+        directory = self.directory
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.quota is None or self.reserved + size <= self.quota
+            )
+            self.reserved += size
+        try:
+            scratch_dir = tempfile.mkdtemp(dir=directory)
+            try:
+                yield scratch_dir
+            finally:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+        finally:
+            with self._condition:
+                self.reserved -= size
+                self._condition.notify_all()
 
 
 class IO:
@@ -146,11 +265,27 @@ class IO:
         out: Optional[str] = None,
         work_dir: Optional[str] = ".",
         temp: Optional[bool] = False,
+        scratch: Optional[ScratchManager] = None,
     ) -> None:
         self.inp = inp
         self.out = out
         self.work_dir = expand(work_dir)
         self.temp = temp
+        self.scratch = scratch
+
+    # scratch directory allocated by the outermost of nested calls
+    _scratch_dir = None
+    # whether the outermost of nested calls runs in a temporary directory
+    _temporary = False
+
+    @property
+    def temporary(self) -> bool:
+        """Whether the working directory is deleted on leaving the outermost call.
+
+        Unlike `temp`, which is cleared inside calls so that nested calls share
+        the temporary directory, this remains set inside them.
+        """
+        return bool(self.temp or self._temporary)
 
     @contextlib.contextmanager
     def __call__(self):
@@ -161,41 +296,143 @@ class IO:
         else:
             cm = contextlib.nullcontext(self.work_dir)
 
-        with cm as wd:
+        if self.scratch is not None:
+            scratch_cm = self.scratch.allocate()
+        else:
+            scratch_cm = contextlib.nullcontext(self._scratch_dir)
+
+        temporary = self.temporary
+
+        with cm as wd, scratch_cm as scratch_dir:
             try:
+                old_temporary = self.__dict__.pop("_temporary", None)
+                self._temporary = temporary
                 old_temp, self.temp = copy.copy(self.temp), False
                 old_work_dir, self.work_dir = copy.copy(self.work_dir), wd
+                old_scratch, self.scratch = self.scratch, None
+                old_scratch_dir = self.__dict__.pop("_scratch_dir", None)
+                self._scratch_dir = scratch_dir
 
                 yield _IO(
                     wd,
                     expand(self.inp, wd) if self.inp is not None else None,
                     expand(self.out, wd) if self.out is not None else None,
+                    scratch_dir,
                 )
             finally:
                 self.temp, self.work_dir = old_temp, old_work_dir
+                self.scratch = old_scratch
+                self.__dict__.pop("_scratch_dir", None)
+                if old_scratch_dir is not None:
+                    self._scratch_dir = old_scratch_dir
+                self.__dict__.pop("_temporary", None)
+                if old_temporary is not None:
+                    self._temporary = old_temporary
+
+
+_CACHE_ATTRIBUTE = "_cached"
 
 
-class _Cache(collections.OrderedDict):
-    def last_result(self, n=1):
-        return tuple(self.values())[-n]
+def _instance_cache(obj: Any) -> Dict[str, Any]:
+    try:
+        return obj.__dict__[_CACHE_ATTRIBUTE]
+    except KeyError:
+        return obj.__dict__.setdefault(_CACHE_ATTRIBUTE, {})
+
 
-    def last_args(self, n=1):
-        args, kwarg_items = tuple(self.keys())[-n]
-        return args, dict(kwarg_items)
+def cached_property(func: Callable[[Any], Any]) -> property:
+    """Property computed once and then stored on its instance.
 
+    Unlike a module-level cache, the stored value lives and dies with the
+    instance. Use `invalidate` to discard it after mutating the instance.
+    """
 
-def memoize(func):
-    func.cache = _Cache()
+    @functools.wraps(func)
+    def getter(self):
+        cache = _instance_cache(self)
+        try:
+            return cache[func.__name__]
+        except KeyError:
+            value = cache[func.__name__] = func(self)
+            return value
+
+    return property(getter)
+
+
+def cached_method(
+    func: Optional[Callable[..., Any]] = None, maxsize: Optional[int] = None
+) -> Callable[..., Any]:
+    """Method whose results are stored on its instance, keyed by arguments.
+
+    Parameters
+    ----------
+    func : Optional[Callable[..., Any]], optional
+        Method to cache, by default None to configure the decorator instead
+    maxsize : Optional[int], optional
+        Maximum number of results stored per instance, after which the least
+        recently used result is discarded. Unbounded if None.
+    """
+    if func is None:
+        return functools.partial(cached_method, maxsize=maxsize)
 
     @functools.wraps(func)
-    def memoized(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
+        cache = _instance_cache(self).setdefault(
+            func.__name__, collections.OrderedDict()
+        )
         k = (args, frozenset(kwargs.items()))
-        if k not in func.cache:
-            func.cache[k] = func(*args, **kwargs)
+        try:
+            cache.move_to_end(k)
+            return cache[k]
+        except KeyError:
+            pass
+
+        value = cache[k] = func(self, *args, **kwargs)
+        if maxsize is not None and len(cache) > maxsize:
+            cache.popitem(last=False)
+
+        return value
+
+    return wrapper
+
+
+def invalidate(obj: Any, *names: str) -> None:
+    """Discard values cached on an object by `cached_property` or `cached_method`.
+
+    Parameters
+    ----------
+    obj : Any
+        Object whose cached values are discarded.
+    *names : str
+        Names of the properties or methods to discard, by default all.
+    """
+    cache = obj.__dict__.get(_CACHE_ATTRIBUTE)
+    if cache is None:
+        return
+    if not names:
+        cache.clear()
+    for name in names:
+        cache.pop(name, None)
+
+
+class Cached:
+    """Mixin invalidating cached values whenever a public attribute is assigned.
+
+    In-place modification of an attribute, e.g. of a NumPy array's elements,
+    is not detected and requires an explicit call to `invalidate`.
+    """
 
-        return func.cache[k]
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            invalidate(self)
 
-    return memoized
+    def __getstate__(self) -> Dict[str, Any]:
+        # cached values are derived data and must not affect pickled fingerprints
+        state = self.__dict__.copy()
+        state.pop(_CACHE_ATTRIBUTE, None)
+
+        return state
 
 
 def mkdir_safe(directory: str) -> None:
@@ -306,6 +543,60 @@ class Settings(collections.abc.MutableMapping):
 #
 
 
+def covalent_connectivity(
+    atomic_numbers: Iterable[int],
+    atomic_positions: np.ndarray,
+    scale: Optional[float] = 1.3,
+) -> scipy.sparse.csr_matrix:
+    """Find covalently bonded atoms by a neighbor search over covalent radii.
+
+    Atoms i and j are bonded if their distance is at most
+    `scale * (r_i + r_j)`, where r are covalent radii. Candidate pairs are found
+    with a KD-tree, so the cost grows linearly with the number of atoms.
+
+    Parameters
+    ----------
+    atomic_numbers : Iterable[int]
+        Atomic number of each atom.
+    atomic_positions : np.ndarray
+        (N,3) array of atomic positions in angstroms.
+    scale : Optional[float], optional
+        Factor applied to the covalent radii, by default 1.3
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Symmetric (N,N) adjacency matrix with ones for bonded pairs.
+    """
+    numbers = np.asarray(atomic_numbers, dtype=int)
+    positions = np.asarray(atomic_positions, dtype=float).reshape(-1, 3)
+    num_atoms = len(numbers)
+
+    pt = rdkit.Chem.GetPeriodicTable()
+    elements = np.unique(numbers)
+    radii_by_element = np.array([pt.GetRcovalent(int(Z)) for Z in elements]) * scale
+    radii = radii_by_element[np.searchsorted(elements, numbers)]
+
+    if num_atoms > 1:
+        tree = scipy.spatial.cKDTree(positions)
+        pairs = tree.query_pairs(r=2 * radii.max(), output_type="ndarray")
+    else:
+        pairs = np.empty((0, 2), dtype=int)
+
+    i, j = pairs.T
+    d = np.linalg.norm(positions[i] - positions[j], axis=1)
+    bonded = d <= radii[i] + radii[j]
+    i, j = i[bonded], j[bonded]
+
+    return scipy.sparse.csr_matrix(
+        (
+            np.ones(2 * len(i), dtype=int),
+            (np.concatenate([i, j]), np.concatenate([j, i])),
+        ),
+        shape=(num_atoms, num_atoms),
+    )
+
+
 def xyz2mol(
     atomic_numbers, charge, atomic_positions, charged_fragments: Optional[bool] = True
 ) -> rdkit.Chem.rdchem.Mol:
@@ -341,25 +632,19 @@ def _atom_connectivity(atomic_numbers: Iterable[int], atomic_positions):
 
     mol = rwMol.GetMol()
 
-    # compute atom connectivity matrix
+    # compute atom connectivity matrix, kept sparse so that bond perception
+    # scales with the number of bonds rather than the square of the atoms
+    ac = covalent_connectivity(atomic_numbers, atomic_positions)
 
-    dmat = scipy.spatial.distance_matrix(atomic_positions, atomic_positions)
-    pt = rdkit.Chem.GetPeriodicTable()
+    return ac, mol
 
-    num_atoms = len(atomic_numbers)
-    ac = np.zeros((num_atoms, num_atoms)).astype(int)
 
-    for i in range(num_atoms):
-        a_i = mol.GetAtomWithIdx(i)
-        Rcov_i = pt.GetRcovalent(a_i.GetAtomicNum()) * 1.30
-        for j in range(i + 1, num_atoms):
-            a_j = mol.GetAtomWithIdx(j)
-            Rcov_j = pt.GetRcovalent(a_j.GetAtomicNum()) * 1.30
-            if dmat[i, j] <= Rcov_i + Rcov_j:
-                ac[i, j] = 1
-                ac[j, i] = 1
+def _row_sums(m: scipy.sparse.csr_matrix) -> np.ndarray:
+    return np.asarray(m.sum(axis=1)).ravel()
 
-    return ac, mol
+
+def _count_single_bonds(m: scipy.sparse.csr_matrix, i: int) -> int:
+    return int(np.count_nonzero(m.data[m.indptr[i] : m.indptr[i + 1]] == 1))
 
 
 def _connected_mol(
@@ -429,7 +714,7 @@ def _bond_order(
     #
 
     for valences in valences_list:
-        ac_valence = list(ac.sum(axis=1))
+        ac_valence = _row_sums(ac)
         ua, du_from_ac = _get_unsaturated_atoms(valences, ac_valence)
 
         if len(ua) == 0 and _bond_order_is_ok(
@@ -456,7 +741,7 @@ def _bond_order(
             ):
                 return BO, atomic_valence_electrons
 
-            elif BO.sum() >= best_BO.sum() and (BO.sum(axis=1) <= valences).all():
+            elif BO.sum() >= best_BO.sum() and (_row_sums(BO) <= valences).all():
                 best_BO = BO.copy()
 
     return best_BO, atomic_valence_electrons
@@ -484,12 +769,12 @@ def _bond_order_is_ok(
     Q = 0  # total charge
     q_list = []
     if charged_fragments:
-        BO_valences = list(BO.sum(axis=1))
+        BO_valences = _row_sums(BO)
         for i, atom in enumerate(atomic_numbers):
             q = _get_atomic_charge(atom, atomic_valence_electrons[atom], BO_valences[i])
             Q += q
             if atom == 6:
-                number_of_single_bonds_to_C = list(BO[i, :]).count(1)
+                number_of_single_bonds_to_C = _count_single_bonds(BO, i)
                 if number_of_single_bonds_to_C == 2 and BO_valences[i] == 2:
                     Q += 1
                     q = 2
@@ -512,7 +797,7 @@ def _get_bond_orders(ac, ua, du, valences, ua_pairs):
             BO[i, j] += 1
             BO[j, i] += 1
 
-        BO_valence = list(BO.sum(axis=1))
+        BO_valence = _row_sums(BO)
         du_save = list(copy.copy(du))
         ua, du = _get_unsaturated_atoms(valences, BO_valence)
         ua_pairs, *_ = _get_ua_pairs(ua, ac)
@@ -586,9 +871,9 @@ def _bond_order_to_mol(
 ):
     # based on code written by Paolo Toscani
 
-    l1 = len(BO_matrix)
+    l1 = BO_matrix.shape[0]
     l2 = len(atomic_numbers)
-    BO_valences = list(BO_matrix.sum(axis=1))
+    BO_valences = _row_sums(BO_matrix)
 
     if l1 != l2:
         raise RuntimeError(
@@ -603,13 +888,17 @@ def _bond_order_to_mol(
         3: rdkit.Chem.BondType.TRIPLE,
     }
 
-    for i in range(l1):
-        for j in range(i + 1, l1):
-            bo = int(round(BO_matrix[i, j]))
-            if bo == 0:
-                continue
-            bt = bondTypeDict.get(bo, rdkit.Chem.BondType.SINGLE)
-            rwMol.AddBond(i, j, bt)
+    # bonds are added in order of (i,j), visiting only bonded pairs
+    upper = scipy.sparse.triu(BO_matrix, k=1).tocoo()
+    order = np.lexsort((upper.col, upper.row))
+    for i, j, bo in zip(
+        upper.row[order].tolist(), upper.col[order].tolist(), upper.data[order]
+    ):
+        bo = int(round(bo))
+        if bo == 0:
+            continue
+        bt = bondTypeDict.get(bo, rdkit.Chem.BondType.SINGLE)
+        rwMol.AddBond(i, j, bt)
     mol = rwMol.GetMol()
 
     if charged_fragments:
@@ -645,7 +934,7 @@ def set_atomic_charges(
         )
         q += charge
         if atom == 6:
-            number_of_single_bonds_to_C = list(BO_matrix[i, :]).count(1)
+            number_of_single_bonds_to_C = _count_single_bonds(BO_matrix, i)
             if number_of_single_bonds_to_C == 2 and BO_valences[i] == 2:
                 q += 1
                 charge = 0
@@ -683,10 +972,13 @@ def set_atomic_radicals(
 def _get_ua_pairs(ua, ac):
     bonds = []
 
-    for k, i in enumerate(ua):
-        for j in ua[k + 1 :]:
-            if ac[i, j] == 1:
-                bonds.append(tuple(sorted([i, j])))
+    # bonded pairs of unsaturated atoms, found from the neighbors of each
+    unsaturated = set(ua.tolist())
+    for i in ua.tolist():
+        row = slice(ac.indptr[i], ac.indptr[i + 1])
+        for j, a in zip(ac.indices[row].tolist(), ac.data[row].tolist()):
+            if j > i and j in unsaturated and a == 1:
+                bonds.append((i, j))
 
     if len(bonds) == 0:
         return [()]
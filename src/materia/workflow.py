@@ -1,18 +1,44 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
+import collections
+import contextlib
+import copy
 import dask
 import dask.distributed
+import hashlib
+import io
 import json
 import materia as mtr
+import os
 import pickle
+import queue
+import tempfile
+import threading
+import uuid
+import weakref
 
-__all__ = ["Workflow", "WorkflowResults"]
+__all__ = ["ResultCache", "Workflow", "WorkflowResults"]
 
 
 class WorkflowResults:
-    def __init__(self, results: Dict[str, Any]) -> None:
+    def __init__(
+        self,
+        results: Dict[str, Any],
+        fingerprints: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
         self.results = results
+        self.fingerprints = fingerprints or {}
+
+    def by_fingerprint(self) -> Dict[str, Any]:
+        # results saved before fingerprints were recorded have none
+        fingerprints = getattr(self, "fingerprints", {})
+
+        return {
+            fp: self.results[name]
+            for name, fp in fingerprints.items()
+            if fp is not None and name in self.results
+        }
 
     def __getitem__(self, key: str) -> Any:
         return self.results[key]
@@ -24,30 +50,543 @@ class WorkflowResults:
         with open(filepath, "wb") as f:
             pickle.dump(self, f)
 
+    @classmethod
+    def load(cls, checkpoint: str) -> WorkflowResults:
+        """Collect the results written to a checkpoint directory so far.
+
+        Parameters
+        ----------
+        checkpoint : str
+            Directory passed as checkpoint to Workflow.compute
+            or Workflow.as_completed.
+
+        Returns
+        -------
+        WorkflowResults
+            Results of all tasks completed so far, by task name.
+        """
+        results = {}
+        fingerprints = {}
+
+        with os.scandir(mtr.expand(checkpoint)) as entries:
+            for e in entries:
+                if e.name.endswith(".pkl"):
+                    name = e.name[: -len(".pkl")]
+                    with open(e.path, "rb") as f:
+                        results[name], fingerprints[name] = pickle.load(f)
+
+        return cls(results, fingerprints)
+
+
+class ResultCache:
+    """Content-addressed on-disk store of Task results.
+
+    Results are keyed by Task fingerprints, so a Task whose configuration and
+    inputs match a previously computed Task reuses its result, regardless of
+    Task name or process.
+
+    Attributes
+    ----------
+    directory : str
+        Directory in which results are stored.
+    max_size : Optional[int]
+        Maximum total size of stored results in bytes. Least recently used
+        results are evicted once exceeded. Unbounded if None.
+    version : Optional[str]
+        Tag mixed into every key, e.g. an engine version. Changing it
+        invalidates all previously stored results.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: Optional[int] = None,
+        version: Optional[str] = None,
+    ) -> None:
+        self.directory = mtr.expand(directory)
+        self.max_size = max_size
+        self.version = version
+        mtr.mkdir_safe(self.directory)
+
+    def key(
+        self, task: mtr.Task, memo: Optional[Dict[str, Optional[str]]] = None
+    ) -> Optional[str]:
+        """Return the key under which the result of a Task is stored.
+
+        Parameters
+        ----------
+        task : mtr.Task
+            Task to fingerprint.
+        memo : Optional[Dict[str, Optional[str]]], optional
+            Registry of fingerprints already computed, by Task name,
+            by default None
+
+        Returns
+        -------
+        Optional[str]
+            Hex digest identifying the result of the Task, or None if the
+            Task or one of its requirements cannot be fingerprinted.
+        """
+        fp = _fingerprint(task, {} if memo is None else memo)
+
+        return None if fp is None else _digest((self.version, fp))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def __getitem__(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            raise KeyError(key)
+
+        # mark as recently used for eviction purposes
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        mtr.mkdir_safe(os.path.dirname(path))
+
+        # write atomically so that concurrent readers never see partial results
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f)
+            os.replace(tmp, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+
+        if self.max_size is not None:
+            self.evict(self.max_size)
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        with os.scandir(self.directory) as shards:
+            for shard in shards:
+                if shard.is_dir():
+                    with os.scandir(shard.path) as files:
+                        entries.extend(f for f in files if f.name.endswith(".pkl"))
+
+        return entries
+
+    def size(self) -> int:
+        """Return the total size of stored results in bytes."""
+        return sum(e.stat().st_size for e in self._entries())
+
+    def evict(self, max_size: int) -> None:
+        """Remove least recently used results until at most max_size bytes remain.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum total size of stored results in bytes.
+        """
+        stats = []
+        for e in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                stats.append((e.stat().st_mtime, e.stat().st_size, e.path))
+
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all stored results."""
+        self.evict(0)
+
+
+def _canonical(obj: Any) -> Any:
+    # dicts and sets pickle in insertion (or hash) order, so equal mappings
+    # built in a different order are replaced by their items sorted by digest
+    cls = type(obj)
+    if cls is list or cls is tuple:
+        return cls(_canonical(v) for v in obj)
+    elif isinstance(obj, dict):
+        items = sorted(obj.items(), key=lambda kv: _digest(kv[0]))
+        return (cls, tuple((k, _canonical(v)) for k, v in items))
+    elif isinstance(obj, (set, frozenset)):
+        return (cls, tuple(sorted(map(_canonical, obj), key=_digest)))
+
+    return obj
+
+
+class _CanonicalPickler(pickle.Pickler):
+    # pickles the state of plain objects (e.g. Settings) in canonical form, so
+    # that fingerprints do not depend on the order in which it was assembled
+    def reducer_override(self, obj: Any) -> Any:
+        cls = type(obj)
+        if (
+            isinstance(obj, type)
+            or cls.__module__ == "builtins"
+            or cls.__reduce_ex__ is not object.__reduce_ex__
+            or cls.__reduce__ is not object.__reduce__
+        ):
+            return NotImplemented
+
+        rv = list(obj.__reduce_ex__(4))
+        rv[1:3] = map(_canonical, rv[1:3])
+        if len(rv) > 3 and rv[3] is not None:
+            rv[3] = iter(map(_canonical, rv[3]))
+        if len(rv) > 4 and rv[4] is not None:
+            # items of dict subclasses
+            rv[4] = iter(_canonical(dict(rv[4]))[1])
+
+        return tuple(rv)
+
+
+def _digest(obj: Any) -> str:
+    f = io.BytesIO()
+    _CanonicalPickler(f, protocol=4).dump(_canonical(obj))
+
+    return hashlib.sha256(f.getvalue()).hexdigest()
+
+
+def _fingerprint(task: mtr.Task, memo: Dict[str, Optional[str]]) -> Optional[str]:
+    # Merkle-style: a task's fingerprint covers its own configuration
+    # and the fingerprints of everything upstream of it
+    if task.name not in memo:
+        args = tuple(_fingerprint(t, memo) for t in task.requirements)
+        kwargs = tuple(
+            sorted(
+                (k, _fingerprint(t, memo)) for k, t in task.named_requirements.items()
+            )
+        )
+
+        if None in args or any(fp is None for _, fp in kwargs):
+            memo[task.name] = None
+        else:
+            try:
+                identity = task.fingerprint()
+                memo[task.name] = (
+                    None if identity is None else _digest((identity, args, kwargs))
+                )
+            except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+                # unpicklable (e.g. local functions) or self-referential
+                # inputs cannot be fingerprinted
+                memo[task.name] = None
+
+    return memo[task.name]
+
+
+# slot pools of this process by token, through which pickled tasks (e.g. for
+# the processes scheduler) find their pool rather than carrying its lock
+_SLOTS = weakref.WeakValueDictionary()
+_SLOTS_LOCK = threading.Lock()
+
+
+def _slots(token: str, capacity: Dict[str, float]) -> _Slots:
+    with _SLOTS_LOCK:
+        slots = _SLOTS.get(token)
+        if slots is None:
+            slots = _SLOTS[token] = _Slots(capacity, token)
+
+    return slots
+
+
+class _Slots:
+    # counting semaphore over named resources (cores, memory, ...)
+    # which keeps concurrently running tasks within the node's capacity
+    def __init__(self, capacity: Dict[str, float], token: Optional[str] = None) -> None:
+        self.capacity = dict(capacity)
+        self.available = dict(capacity)
+        self.condition = threading.Condition()
+        self.token = token or uuid.uuid4().hex
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_slots, (self.token, self.capacity))
+
+    @contextlib.contextmanager
+    def __call__(self, request: Dict[str, float]):
+        # resources without a declared capacity are unconstrained, and requests
+        # larger than the capacity are clamped so that such tasks run alone
+        request = {
+            k: min(v, self.capacity[k])
+            for k, v in request.items()
+            if k in self.capacity
+        }
+
+        with self.condition:
+            self.condition.wait_for(
+                lambda: all(self.available[k] >= v for k, v in request.items())
+            )
+            for k, v in request.items():
+                self.available[k] -= v
+        try:
+            yield
+        finally:
+            with self.condition:
+                for k, v in request.items():
+                    self.available[k] += v
+                self.condition.notify_all()
+
+
+def _compute(
+    task: mtr.Task,
+    cache: Optional[ResultCache],
+    key: Optional[str],
+    slots: Optional[_Slots],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    with slots(task.resources) if slots is not None else contextlib.nullcontext():
+        result = _run_with_handlers(task, *args, **kwargs)
+
+    if key is not None:
+        cache[key] = result
+
+    return result
+
+
+# key in the links of the dynamic graph whose target is the node
+# providing the final result, so that InsertTasks can redirect it
+_OUTPUT = "output"
+
+
+def _detached_copy(task: mtr.Task) -> mtr.Task:
+    # copy of task whose repairs do not leak into later computations, sharing
+    # rather than copying the graph of tasks upstream of it
+    upstream = (*task.requirements, *task.named_requirements.values())
+
+    return copy.deepcopy(task, {id(t): t for t in upstream})
+
+
+def _run_with_handlers(task: mtr.Task, *args: Any, **kwargs: Any) -> Any:
+    if not task.handlers:
+        return task.compute(*args, **kwargs)
+
+    # dynamic graph in the form expected by materia.actions: node 0 is (a copy
+    # of, so that repairs do not leak into later computations) the task itself,
+    # links[i] lists (kwarg, node) pairs whose results are inputs to node i,
+    # and further nodes may be inserted by actions
+    tasks = [_detached_copy(task)]
+    links = {0: [], _OUTPUT: [(None, 0)]}
+    done = {0: False}
+    results = {}
+    attempts = collections.Counter()
+
+    while not all(done.values()):
+        node = next(
+            n
+            for n in sorted(done)
+            if not done[n] and all(done[j] for _, j in links.get(n, []))
+        )
+        t = tasks[node]
+
+        # outputs of tasks run in temporary directories are kept until
+        # their handlers have read them; nested calls share the directory
+        io = getattr(t, "io", None)
+        with io() if isinstance(io, mtr.IO) and io.temp else contextlib.nullcontext():
+            try:
+                if node == 0:
+                    results[node] = t.compute(*args, **kwargs)
+                else:
+                    results[node] = t.compute(
+                        *(results[j] for kw, j in links.get(node, []) if kw is None),
+                        **{
+                            kw: results[j]
+                            for kw, j in links.get(node, [])
+                            if kw is not None
+                        },
+                    )
+            except mtr.ActionSignal as signal:
+                # raised by handlers monitoring the output of a running task
+                results[node], stopped, error = signal.result, signal, None
+            except Exception as e:
+                # failed jobs are still checked by handlers, which may repair them
+                results[node], stopped, error = None, None, e
+            else:
+                stopped = error = None
+            done[node] = True
+            attempts[node] += 1
+
+            try:
+                if stopped is not None:
+                    raise stopped
+                for h in t.handlers:
+                    h.run(result=results[node], task=t)
+            except mtr.ActionSignal as signal:
+                if attempts[node] > t.max_retries:
+                    raise RuntimeError(
+                        f"{t.name} could not be repaired within {t.max_retries} retries."
+                    ) from signal
+                for action in signal.actions:
+                    action.run(node, tasks, links, done)
+            else:
+                if error is not None:
+                    raise error
+
+    ((_, node),) = links[_OUTPUT]
+
+    return results[node]
+
+
+def _worker_resources() -> Optional[Set[str]]:
+    # names of resources advertised by the workers of the current
+    # dask.distributed client, or None if no client is active
+    try:
+        client = dask.distributed.default_client()
+    except ValueError:
+        return None
+
+    return set(
+        r
+        for w in client.scheduler_info()["workers"].values()
+        for r in w.get("resources", {})
+    )
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _local_as_completed(
+    delayeds: Dict[str, dask.delayed.Delayed],
+) -> Iterator[Tuple[str, Any]]:
+    # run the local scheduler in a background thread and
+    # hand each result over as soon as its task finishes
+    names = {d.key: name for name, d in delayeds.items()}
+    completed = queue.Queue()
+    cancelled = threading.Event()
+
+    def _pretask(key, dsk, state):
+        # once the consumer stops iterating, no further tasks are started
+        if cancelled.is_set():
+            raise _Cancelled()
+
+    def _posttask(key, result, dsk, state, worker_id):
+        if key in names:
+            completed.put(("result", names[key], result))
+
+    def _run():
+        try:
+            dask.compute(
+                delayeds,
+                optimize_graph=False,
+                # (start, start_state, pretask, posttask, finish)
+                callbacks=[(None, None, _pretask, _posttask, None)],
+            )
+        except BaseException as e:
+            completed.put(("error", None, e))
+        else:
+            completed.put(("done", None, None))
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            status, name, value = completed.get()
+            if status == "done":
+                return
+            elif status == "error":
+                raise value
+            yield name, value
+    finally:
+        # wait for tasks already running, so that none outlives the generator
+        cancelled.set()
+        thread.join()
+
+
+def _write_checkpoint(
+    directory: str, name: str, result: Any, fingerprint: Optional[str]
+) -> None:
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((result, fingerprint), f)
+        os.replace(tmp, os.path.join(directory, f"{name}.pkl"))
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+
 
 def _discover_tasks(*tasks: mtr.Task) -> List[mtr.Task]:
-    discovered = list(tasks)
+    # iterative traversal visiting each task once, so that
+    # discovery is linear in the size of the task graph
+    discovered = {}
+    stack = list(tasks)
 
-    for t in tasks:
-        requirements = list(t.requirements) + list(t.named_requirements.values())
-        discovered.extend(requirements + _discover_tasks(*requirements))
+    while stack:
+        t = stack.pop()
+        if id(t) not in discovered:
+            discovered[id(t)] = t
+            stack.extend(t.requirements)
+            stack.extend(t.named_requirements.values())
 
-    return list(set(discovered))
+    return list(discovered.values())
 
 
 def _build_delayed(
     task: mtr.Task,
     delayeds: Optional[Dict[str, dask.delayed.Delayed]],
     restart: Optional[WorkflowResults] = None,
+    cache: Optional[ResultCache] = None,
+    fingerprints: Optional[Dict[str, Optional[str]]] = None,
+    reusable: Optional[Dict[str, Any]] = None,
+    slots: Optional[_Slots] = None,
+    worker_resources: Optional[Set[str]] = None,
 ) -> Dict[str, dask.delayed.Delayed]:
+    fingerprints = {} if fingerprints is None else fingerprints
+    reusable = reusable or {}
+    worker_resources = worker_resources or set()
+
+    fp = _fingerprint(task, fingerprints)
+    key = (
+        cache.key(task, fingerprints)
+        if cache is not None and not isinstance(task, mtr.InputTask)
+        else None
+    )
+
     if restart is not None and task.name in restart.results:
         delayeds[task.name] = dask.delayed(mtr.InputTask(restart[task.name]).compute)()
+    elif delayeds[task.name] is None and fp is not None and fp in reusable:
+        delayeds[task.name] = dask.delayed(mtr.InputTask(reusable[fp]).compute)()
+    elif delayeds[task.name] is None and key is not None and key in cache:
+        delayeds[task.name] = dask.delayed(mtr.InputTask(cache[key]).compute)()
     elif delayeds[task.name] is None:
-        args = (_build_delayed(v, delayeds) for v in task.requirements)
+        build_args = (
+            restart,
+            cache,
+            fingerprints,
+            reusable,
+            slots,
+            worker_resources,
+        )
+        args = [_build_delayed(v, delayeds, *build_args) for v in task.requirements]
         kwargs = {
-            k: _build_delayed(v, delayeds) for k, v in task.named_requirements.items()
+            k: _build_delayed(v, delayeds, *build_args)
+            for k, v in task.named_requirements.items()
         }
-        delayeds[task.name] = dask.delayed(task.compute)(*args, **kwargs)
+
+        # dask.distributed workers schedule by the resources they advertise
+        annotated = {k: v for k, v in task.resources.items() if k in worker_resources}
+        with (
+            dask.annotate(resources=annotated)
+            if annotated
+            else contextlib.nullcontext()
+        ):
+            delayeds[task.name] = dask.delayed(_compute)(
+                task, cache, key, slots, *args, **kwargs
+            )
 
     return delayeds[task.name]
 
@@ -58,20 +597,178 @@ class Workflow:
         # required to compute the provided tasks
         self.tasks = _discover_tasks(*tasks)
 
-    def compute(
+    def fingerprints(self) -> Dict[str, Optional[str]]:
+        fingerprints = {}
+        for t in self.tasks:
+            _fingerprint(t, fingerprints)
+
+        return fingerprints
+
+    def dirty(self, previous: WorkflowResults) -> List[str]:
+        """Find the tasks whose inputs changed since a previous computation.
+
+        Parameters
+        ----------
+        previous : WorkflowResults
+            Results of a previous computation of this (or a similar) Workflow.
+
+        Returns
+        -------
+        List[str]
+            Names of tasks which would be recomputed by
+            compute(previous=previous).
+        """
+        reusable = previous.by_fingerprint()
+
+        return [
+            name
+            for name, fp in self.fingerprints().items()
+            if fp is None or fp not in reusable
+        ]
+
+    def _build(
         self,
         restart: Optional[WorkflowResults] = None,
-    ) -> WorkflowResults:
+        cache: Optional[ResultCache] = None,
+        previous: Optional[WorkflowResults] = None,
+        resources: Optional[Dict[str, float]] = None,
+    ) -> Tuple[Dict[str, dask.delayed.Delayed], Dict[str, Optional[str]]]:
         # create a registry of dask delayed objects
         # using this in _build_delayed prevents
         # creation of duplicate delayeds for a given task
         delayeds = {t.name: None for t in self.tasks}
 
+        # registry of task fingerprints, shared so that
+        # each task is fingerprinted only once
+        fingerprints = {}
+
+        # results of a previous computation, by fingerprint;
+        # tasks whose fingerprints are unchanged are not recomputed,
+        # so only the subgraph downstream of changed inputs runs
+        reusable = previous.by_fingerprint() if previous is not None else {}
+
+        # without a distributed client, tasks claim slots from a local pool
+        # so that multi-core external jobs do not oversubscribe the machine
+        worker_resources = _worker_resources()
+        slots = (
+            _slots(uuid.uuid4().hex, resources or {"cores": os.cpu_count()})
+            if worker_resources is None
+            else None
+        )
+
         # build each delayed object
         for t in self.tasks:
-            delayeds[t.name] = _build_delayed(t, delayeds, restart)
+            delayeds[t.name] = _build_delayed(
+                t,
+                delayeds,
+                restart,
+                cache,
+                fingerprints,
+                reusable,
+                slots,
+                worker_resources,
+            )
+
+        return delayeds, fingerprints
+
+    def as_completed(
+        self,
+        restart: Optional[WorkflowResults] = None,
+        cache: Optional[ResultCache] = None,
+        previous: Optional[WorkflowResults] = None,
+        resources: Optional[Dict[str, float]] = None,
+        checkpoint: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Compute all tasks in the Workflow, yielding results as they finish.
+
+        Parameters are as for compute.
+
+        Yields
+        -------
+        Tuple[str, Any]
+            Name and result of each task, in order of completion.
+        """
+        delayeds, fingerprints = self._build(restart, cache, previous, resources)
+
+        return self._as_completed(delayeds, fingerprints, checkpoint)
+
+    def _as_completed(
+        self,
+        delayeds: Dict[str, dask.delayed.Delayed],
+        fingerprints: Dict[str, Optional[str]],
+        checkpoint: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        if checkpoint is not None:
+            checkpoint = mtr.expand(checkpoint)
+            mtr.mkdir_safe(checkpoint)
+
+        try:
+            client = dask.distributed.default_client()
+        except ValueError:
+            client = None
+
+        if client is None:
+            futures = []
+            completed = _local_as_completed(delayeds)
+        else:
+            names, ds = zip(*delayeds.items()) if delayeds else ((), ())
+            futures = client.compute(list(ds))
+            names = dict(zip(futures, names))
+            completed = (
+                (names[future], result)
+                for future, result in dask.distributed.as_completed(
+                    futures, with_results=True
+                )
+            )
+
+        try:
+            for name, result in completed:
+                if checkpoint is not None:
+                    _write_checkpoint(checkpoint, name, result, fingerprints.get(name))
+                yield name, result
+        finally:
+            # stop computing once the consumer stops iterating
+            completed.close()
+            if futures:
+                client.cancel(futures)
+
+    def compute(
+        self,
+        restart: Optional[WorkflowResults] = None,
+        cache: Optional[ResultCache] = None,
+        previous: Optional[WorkflowResults] = None,
+        resources: Optional[Dict[str, float]] = None,
+        checkpoint: Optional[str] = None,
+    ) -> WorkflowResults:
+        """Compute all tasks in the Workflow.
+
+        Parameters
+        ----------
+        restart : Optional[WorkflowResults], optional
+            Results to reuse by task name, by default None
+        cache : Optional[ResultCache], optional
+            On-disk store of results to reuse and update, by default None
+        previous : Optional[WorkflowResults], optional
+            Results of a previous computation; only tasks whose fingerprints
+            changed since then are recomputed, by default None
+        resources : Optional[Dict[str, float]], optional
+            Capacity of the machine, e.g. {"cores": 32, "memory": 64e9}, against
+            which task resources are packed when no dask.distributed client
+            is active. By default all cores of the machine. With a client,
+            tasks are instead annotated with any resources its workers
+            advertise (e.g. LocalCluster(resources={"cores": 32})).
+        checkpoint : Optional[str], optional
+            Directory to which each result is written as soon as it is
+            computed, readable with WorkflowResults.load, by default None
 
-        # compute results
-        (results,) = dask.compute(delayeds)
+        Returns
+        -------
+        WorkflowResults
+            Results of all tasks, by task name.
+        """
+        # fingerprints are taken before any task runs, since
+        # tasks may modify their inputs while computing
+        delayeds, fingerprints = self._build(restart, cache, previous, resources)
+        results = dict(self._as_completed(delayeds, fingerprints, checkpoint))
 
-        return WorkflowResults(results)
+        return WorkflowResults(results, fingerprints)
@@ -1,5 +1,8 @@
 import materia as mtr
 import numpy as np
+import pytest
+
+from materia.dataseries.dataseries import _simpson, _simpson_weights
 
 
 def test_spd_spectrum_extrapolate_linear():
@@ -141,3 +144,76 @@ def test_spd_spectrum_interpolate_linear_spline_quadratic():
 
     assert line.x == check_result_x
     assert line.y == check_result_y
+
+
+def test_spd_xy_batch_matches_single_spectra():
+    spds = [mtr.BlackbodySPD(T=T) for T in (2000, 4500, 6500)]
+    x = spds[0].x
+    y = np.stack([spd.y.value for spd in spds])
+
+    xy = mtr.spd_xy(x=x, spds=y)
+    uv = mtr.spd_uv(x=x, spds=y[None])
+
+    assert xy.shape == (3, 2)
+    assert uv.shape == (1, 3, 2)
+    for spd, xy_i, uv_i in zip(spds, xy, uv[0]):
+        assert np.allclose(spd.xy, xy_i)
+        assert np.allclose(spd.uv, uv_i)
+
+    # CIE 1931 chromaticity of a 6500 K blackbody
+    assert np.allclose(xy[2], (0.3135, 0.3237), atol=1e-3)
+
+
+def test_spd_XYZ_batch_normalized():
+    x = np.linspace(380, 780, 81) * mtr.nm
+    y = np.random.default_rng(0).random((4, 81)) * mtr.watt
+
+    XYZ = mtr.spd_XYZ(x=x, spds=y)
+    LMS = mtr.spd_LMS(x=x, spds=y)
+
+    assert np.allclose(XYZ[:, 1], 1)
+    assert np.allclose(LMS, XYZ @ mtr.hunt_pointer_estevez_transform().T)
+
+
+def test_spd_CCT_DC_blackbody():
+    CCT, DC = mtr.BlackbodySPD(T=2700).CCT_DC
+
+    assert abs(CCT.value - 2700) < 0.1
+    assert DC < 1e-5
+
+
+def test_spd_cri_fluorescent():
+    # CIE 13.3 general color rendering index of illuminant F4 is 51
+    assert abs(mtr.CIEIlluminantF4().cri() - 51.9) < 0.1
+    assert mtr.CIEIlluminantA().cri() > 99.9
+
+
+def test_color_rendering_index_batch_matches_single_spectra():
+    spds = [mtr.CIEIlluminantF4(), mtr.CIEIlluminantD65()]
+    x = np.linspace(380, 780, 81) * mtr.nm
+    y = np.stack([spd.resample(x).value for spd in spds])
+
+    cri = mtr.color_rendering_index(x=x, spds=y)
+
+    for spd, cri_i in zip(spds, cri):
+        assert np.isclose(mtr.SPDSpectrum(x=x, y=spd.resample(x)).cri(), cri_i)
+
+
+def test_spd_cri_strict():
+    x = np.linspace(380, 780, 81) * mtr.nm
+    green = mtr.SPDSpectrum(x=x, y=np.exp(-(((x.value - 530) / 10) ** 2)) * mtr.watt)
+
+    with pytest.raises(ValueError):
+        green.cri()
+    with pytest.warns(UserWarning):
+        green.cri(strict=False)
+
+
+def test_simpson_weights_match_simpson():
+    rng = np.random.default_rng(0)
+
+    for n in (2, 5, 8):
+        x = np.cumsum(rng.random(n) + 0.1)
+        y = rng.random(n)
+
+        assert _simpson_weights(x) @ y == pytest.approx(_simpson(y, x=x))
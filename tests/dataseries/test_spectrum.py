@@ -155,3 +155,47 @@ def test_spectrum_extrapolate_ASTMG173():
     assert astmg173.y.value[0] == -1.8929525100000004e-19
     assert astmg173.y.value[-1] == -0.014035700000000047
     assert astmg173.y.unit == original_y_unit
+
+
+def test_spectrum_resample_matches_match():
+    x = np.linspace(1, 10, 10) * mtr.nm
+    line = mtr.Spectrum(x=x, y=x ** 2)
+
+    grid = mtr.Spectrum(x=np.linspace(1, 10, 25) * mtr.nm, y=None)
+    matched = line.match(match_to=grid, in_place=False)
+
+    assert np.allclose(line.resample(grid.x).value, matched.y.value)
+
+
+def test_spectrum_resample_extrapolate_linear():
+    x = np.linspace(1, 10, 10) * mtr.nm
+    line = mtr.Spectrum(x=x, y=x ** 2)
+
+    resampled = line.resample(np.array([0.0, 11.0]) * mtr.nm)
+
+    assert np.allclose(resampled.value, [-2.0, 119.0])
+
+
+def test_spectrum_resample_cached_per_grid():
+    x = np.linspace(1, 10, 10) * mtr.nm
+    line = mtr.Spectrum(x=x, y=2 * x)
+    grid = np.linspace(1, 10, 19) * mtr.nm
+
+    first = line.resample(grid)
+    assert line.resample(np.linspace(1, 10, 19) * mtr.nm).value is first.value
+    assert not first.value.flags.writeable
+
+    line.y = 3 * x
+    assert np.allclose(line.resample(grid).value, 3 * grid.value)
+
+
+def test_resample_reference_shared():
+    x = np.linspace(400, 700, 31) * mtr.nm
+
+    xbar = mtr.resample_reference(mtr.CIE1931ColorMatchingFunctionX, x)
+    matched = mtr.CIE1931ColorMatchingFunctionX().match(
+        match_to=mtr.Spectrum(x=x, y=None)
+    )
+
+    assert np.allclose(xbar.value, matched.y.value)
+    assert mtr.resample_reference(mtr.CIE1931ColorMatchingFunctionX, x) == xbar
@@ -0,0 +1,156 @@
+import materia as mtr
+import os
+import pickle
+import pytest
+import subprocess
+
+
+def _counting_check_output(monkeypatch):
+    calls = []
+    original = subprocess.check_output
+
+    def check_output(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(mtr.engines.qchem.subprocess, "check_output", check_output)
+
+    return calls
+
+
+def test_qchem_env_sourced_once(tmp_path, monkeypatch):
+    calls = _counting_check_output(monkeypatch)
+    qcenv = tmp_path / "qcenv.sh"
+    qcenv.write_text("export QC=/opt/qchem\n")
+
+    engine = mtr.QChem(qcenv=str(qcenv), scratch_dir=str(tmp_path))
+    env = engine.env()
+    assert env["QC"] == "/opt/qchem"
+    assert env["QCSCRATCH"] == str(tmp_path)
+
+    env["QC"] = "modified"
+    assert mtr.QChem(qcenv=str(qcenv)).env()["QC"] == "/opt/qchem"
+    assert pickle.loads(pickle.dumps(engine)).env()["QC"] == "/opt/qchem"
+    assert len(calls) == 1
+
+
+def test_qchem_env_resourced_when_qcenv_changes(tmp_path, monkeypatch):
+    calls = _counting_check_output(monkeypatch)
+    qcenv = tmp_path / "qcenv.sh"
+    qcenv.write_text("export QC=/opt/qchem\n")
+
+    engine = mtr.QChem(qcenv=str(qcenv))
+    engine.env()
+
+    qcenv.write_text("export QC=/opt/qchem-6\n")
+    os.utime(qcenv, ns=(0, 0))
+
+    assert engine.env()["QC"] == "/opt/qchem-6"
+    assert len(calls) == 2
+
+
+class FakeAIMDEngine(mtr.Engine):
+    def __init__(self):
+        super().__init__("qchem")
+
+    def execute(self, io, arguments=None, return_output=False, monitors=None):
+        frame = (
+            " TIME STEP #{}\n"
+            "             Standard Nuclear Orientation (Angstroms)\n"
+            "    I     Atom           X                Y                Z\n"
+            " ----------------------------------------------------------------\n"
+            "    1      H       0.0000000000     0.0000000000     {:.10f}\n"
+            " ----------------------------------------------------------------\n"
+        )
+        with io() as _io:
+            with open(_io.out, "w") as f:
+                f.write("".join(frame.format(i, 0.1 * i) for i in range(3)))
+
+
+def test_qchem_aimd_temp_io_loads_trajectory(tmp_path):
+    io = mtr.IO("aimd.inp", "aimd.out", tmp_path, temp=True)
+    task = mtr.engines.qchem.QChemAIMD(engine=FakeAIMDEngine(), io=io)
+    molecule = mtr.Molecule(
+        mtr.Structure(mtr.Atom(element="H", position=(0.0, 0.0, 0.0) * mtr.angstrom))
+    )
+
+    trajectory = task.compute(molecule)
+
+    assert os.listdir(tmp_path) == []
+    assert len(trajectory) == 3
+    assert trajectory[2][0, 2] == pytest.approx(0.2)
+
+
+class FakeKoopmanEngine(mtr.Engine):
+    def __init__(self):
+        super().__init__("qchem")
+        self.calls = []
+
+    def koopman_error(self, gs_io, cation_io, anion_io):
+        engine = self
+
+        class KoopmanError:
+            def compute(self, molecule, settings, resources=None):
+                engine.calls.append((gs_io.work_dir, resources))
+                omega = settings["rem", "omega"] / 1000
+                return (omega - 0.3) ** 2 * mtr.eV
+
+        return KoopmanError()
+
+
+def test_qchem_minimize_koopman_error_batches(tmp_path):
+    engine = FakeKoopmanEngine()
+    task = mtr.engines.qchem.QChemMinimizeKoopmanError(
+        engine=engine, io=mtr.IO(work_dir=tmp_path)
+    )
+    molecule = mtr.Molecule(
+        mtr.Structure(mtr.Atom(element="H", position=(0.0, 0.0, 0.0) * mtr.angstrom))
+    )
+
+    task.compute(molecule, alpha=0.2, num_evals=8, batch_size=4)
+
+    directories = [wd for wd, _ in engine.calls]
+    assert len(directories) == len(set(directories)) == 8
+    assert os.listdir(tmp_path) == []
+    assert all(r["cores"] <= max(os.cpu_count() // 4, 1) for _, r in engine.calls)
+
+
+def test_qchem_map(tmp_path):
+    engine = mtr.QChem()
+    settings = mtr.Settings()
+    settings["rem", "basis"] = "def2-svp"
+    handler = mtr.QChemSCFConvergence()
+    molecules = [
+        mtr.Molecule(
+            mtr.Structure(mtr.Atom(element="H", position=(0.0, 0.0, z) * mtr.angstrom))
+        )
+        for z in range(3)
+    ]
+
+    tasks = engine.map(
+        "single_point", molecules, tmp_path, settings=settings, handlers=[handler]
+    )
+
+    assert all(isinstance(t, mtr.engines.qchem.QChemSinglePoint) for t in tasks)
+    assert [t.name for t in tasks] == [
+        "single_point-0",
+        "single_point-1",
+        "single_point-2",
+    ]
+    assert [t.io.work_dir for t in tasks] == [str(tmp_path / t.name) for t in tasks]
+    assert all(t.io.inp == "single_point.in" for t in tasks)
+    assert all(t.engine is engine and t.handlers == [handler] for t in tasks)
+    assert [t.named_requirements["molecule"].compute() for t in tasks] == molecules
+    assert len(set(id(t.named_requirements["settings"]) for t in tasks)) == 1
+
+
+def test_qchem_minimize_koopman_error_fingerprint(tmp_path):
+    def koopman(executable):
+        return mtr.engines.qchem.QChemMinimizeKoopmanError(
+            engine=mtr.QChem(executable=executable),
+            io=mtr.IO(work_dir=tmp_path),
+            name="koopman",
+        )
+
+    assert koopman("qchem").fingerprint() == koopman("qchem").fingerprint()
+    assert koopman("qchem").fingerprint() != koopman("qchem.dev").fingerprint()
@@ -1,3 +1,194 @@
+import materia as mtr
+import numpy as np
+import os
+import pytest
+import textwrap
+
+OUTPUT = textwrap.dedent(
+    """\
+                      Welcome to Q-Chem
+    --------------------------------------------------------------
+                 Standard Nuclear Orientation (Angstroms)
+        I     Atom           X                Y                Z
+     ----------------------------------------------------------------
+        1      O       0.0000000000     0.0000000000     0.1173000000
+        2      H       0.0000000000     0.7572000000    -0.4692000000
+        3      H       0.0000000000    -0.7572000000    -0.4692000000
+     ----------------------------------------------------------------
+     There are        5 alpha and        5 beta electrons
+     ---------------------------------------
+      Cycle       Energy         DIIS error
+     ---------------------------------------
+        1     -75.9897318712      6.41e-02
+        2     -76.0107465155      1.00e-08  Convergence criterion met
+     ---------------------------------------
+     Total energy in the final basis set =      -76.0107465155
+     --------------------------------------------------------------
+                  Orbital Energies (a.u.)
+     --------------------------------------------------------------
+
+     Alpha MOs
+     -- Occupied --
+    -20.5584  -1.3428  -0.7077  -0.5719  -0.4979
+     -- Virtual --
+      0.2101   0.3023   1.0494   1.1325
+
+     Beta MOs
+     -- Occupied --
+    -20.5584  -1.3428  -0.7077  -0.5719  -0.4979
+     -- Virtual --
+      0.2101   0.3023   1.0494   1.1325
+     --------------------------------------------------------------
+     ---------------------------------------------------
+                TDDFT Excitation Energies
+     ---------------------------------------------------
+
+     Excited state   1: excitation energy (eV) =    8.1032
+        Total energy for state   1:                   -75.71295643 au
+        Multiplicity: Singlet
+        Trans. Mom.:  0.0000 X   -0.2516 Y  -0.0000 Z
+        Strength   :     0.0126
+        X: D(    5) --> V(    1) amplitude =  0.9950
+        Y: D(    5) --> V(    1) amplitude =  0.0520
+
+     Excited state   2: excitation energy (eV) =   10.0815
+        Total energy for state   2:                   -75.64026391 au
+        Multiplicity: Singlet
+        Trans. Mom.:  0.0000 X   0.0000 Y  -0.0000 Z
+        Strength   :     0.0000
+        X: D(    4) --> V(    1) amplitude =  0.9847
+
+     ---------------------------------------------------
+     Polarizability Matrix (a.u.)
+                 1             2             3
+       1       5.2001        0.0000        0.0000
+       2       0.0000        7.6003        0.0000
+       3       0.0000        0.0000        6.4002
+     Total job time:  10.53s(wall), 9.85s(cpu)
+     Wed Jun 10 11:32:48 2020
+    """
+)
+
+
+@pytest.fixture
+def output(tmp_path):
+    filepath = tmp_path / "qchem.out"
+    filepath.write_text(OUTPUT)
+
+    return mtr.QChemOutput(str(filepath))
+
+
+def test_qchem_output_sections(output):
+    assert {k: len(v) for k, v in output.sections.items()} == {
+        "job": 0,
+        "electrons": 1,
+        "geometry": 1,
+        "scf_energy": 1,
+        "orbital_energies": 1,
+        "excitations": 1,
+        "polarizability": 1,
+        "job_time": 1,
+    }
+
+
+def test_qchem_output_structure(output):
+    structure = output.structure
+
+    assert structure.atomic_symbols == ("O", "H", "H")
+    assert np.allclose(
+        structure.atomic_positions.convert(mtr.angstrom).value[:, 1],
+        [0.0, 0.7572, -0.4692],
+    )
+
+
+def test_qchem_output_total_energy(output):
+    assert np.allclose(output.total_energy.convert(mtr.hartree).value, [-76.0107465155])
+
+
+def test_qchem_output_frontier_energies(output):
+    frontier = output.frontier_energies
+
+    assert frontier["homo"].convert(mtr.hartree).value == pytest.approx(-0.4979)
+    assert frontier["lumo"].convert(mtr.hartree).value == pytest.approx(0.2101)
+
+
+def test_qchem_output_electronic_excitations(output):
+    first, second = output.electronic_excitations.excitations
+
+    assert first.energy.convert(mtr.eV).value == pytest.approx(8.1032)
+    assert first.oscillator_strength == pytest.approx(0.0126)
+    assert first.symmetry == "Singlet"
+    assert first.contributions == [((4, 0), (5, 0), 0.995)]
+    assert second.contributions == [((3, 0), (5, 0), 0.9847)]
+
+
+def _aimd_output(tmp_path, num_frames):
+    frames = []
+    for i in range(num_frames):
+        frames.append(
+            textwrap.dedent(
+                f"""\
+                 TIME STEP #{i}
+                             Standard Nuclear Orientation (Angstroms)
+                    I     Atom           X                Y                Z
+                 ----------------------------------------------------------------
+                    1      O       0.0000000000     0.0000000000     {0.1 * i:.10f}
+                    2      H       0.0000000000     0.7572000000    -0.4692000000
+                    3      H       0.0000000000    -0.7572000000    -0.4692000000
+                 ----------------------------------------------------------------
+                """
+            )
+        )
+
+    path = tmp_path / "aimd.out"
+    path.write_text("".join(frames))
+
+    return mtr.QChemOutput(str(path))
+
+
+def test_qchem_trajectory_random_access(tmp_path):
+    trajectory = _aimd_output(tmp_path, 5).trajectory
+
+    assert len(trajectory) == 5
+    assert trajectory.atomic_symbols == ("O", "H", "H")
+    assert trajectory[3].shape == (3, 3)
+    assert trajectory[3][0, 2] == pytest.approx(0.3)
+    assert trajectory[-1][0, 2] == pytest.approx(0.4)
+    assert np.allclose(trajectory[1:4][:, 0, 2], [0.1, 0.2, 0.3])
+
+
+def test_qchem_trajectory_to_array(tmp_path):
+    trajectory = _aimd_output(tmp_path, 4).trajectory
+
+    out = np.zeros((4, 3, 3))
+    assert trajectory.to_array(out=out) is out
+    assert np.allclose(out[:, 0, 2], [0.0, 0.1, 0.2, 0.3])
+    assert np.allclose(np.stack(list(trajectory)), out)
+
+
+def test_qchem_trajectory_load(tmp_path):
+    output = _aimd_output(tmp_path, 3)
+    trajectory = output.trajectory.load()
+    os.remove(output.filepath)
+
+    assert trajectory[2][0, 2] == pytest.approx(0.2)
+    assert trajectory.structure(0).atomic_symbols == ("O", "H", "H")
+
+
+def test_qchem_output_polarizability(output):
+    assert np.allclose(
+        output.polarizability.pol_tensor.convert(mtr.au_volume).value,
+        np.diag([5.2001, 7.6003, 6.4002]),
+    )
+
+
+def test_qchem_output_footer(output):
+    footer = output.footer
+
+    assert footer["walltime"].convert(mtr.second).value == pytest.approx(10.53)
+    assert footer["date"] == (2020, "Jun", 10, 11, 32, 48, "Wed")
+
+
 # import materia as mtr
 # import numpy as np
 
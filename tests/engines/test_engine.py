@@ -0,0 +1,109 @@
+import asyncio
+import materia as mtr
+import pytest
+import time
+
+
+def _io(tmp_path, name):
+    (tmp_path / f"{name}.in").write_text(f"{name}\n")
+    return mtr.IO(f"{name}.in", f"{name}.out", tmp_path)
+
+
+def test_execute_output_opt_in(tmp_path):
+    engine = mtr.Engine("cat")
+
+    assert engine.execute(_io(tmp_path, "a")) is None
+    assert (tmp_path / "a.out").read_text() == "a\n"
+    assert engine.execute(_io(tmp_path, "b"), return_output=True) == "b\n"
+
+
+def test_execute_async(tmp_path):
+    engine = mtr.Engine("cat")
+    limiter = mtr.ExecutionLimiter(max_executions=2)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                engine.execute_async(
+                    _io(tmp_path, str(i)), return_output=True, limiter=limiter
+                )
+                for i in range(6)
+            )
+        )
+
+    assert asyncio.run(run()) == [f"{i}\n" for i in range(6)]
+
+
+def test_execution_limiter():
+    limiter = mtr.ExecutionLimiter(max_executions=3)
+    running, peak = 0, 0
+
+    async def job():
+        nonlocal running, peak
+        async with limiter:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*(job() for _ in range(10)))
+
+    # the limiter is reusable across event loops
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert peak == 3
+
+
+class _Failed(Exception):
+    pass
+
+
+def _stop_on(word):
+    lines = []
+
+    def monitor(line):
+        lines.append(line)
+        if word in line:
+            raise _Failed(line)
+
+    return monitor, lines
+
+
+def test_execute_monitors_lines(tmp_path):
+    (tmp_path / "job.in").write_text("echo one; echo two; printf three\n")
+    monitor, lines = _stop_on("never")
+
+    mtr.Engine("sh").execute(mtr.IO("job.in", "job.out", tmp_path), monitors=[monitor])
+
+    assert lines == ["one", "two", "three"]
+
+
+def test_execute_monitor_stops_job_early(tmp_path):
+    (tmp_path / "job.in").write_text("echo start; echo failed; sleep 30; echo end\n")
+    monitor, _ = _stop_on("failed")
+    start = time.perf_counter()
+
+    with pytest.raises(_Failed):
+        mtr.Engine("sh").execute(
+            mtr.IO("job.in", "job.out", tmp_path), monitors=[monitor]
+        )
+
+    assert time.perf_counter() - start < 10
+    assert "end" not in (tmp_path / "job.out").read_text()
+
+
+def test_execute_async_monitor_stops_job_early(tmp_path):
+    (tmp_path / "job.in").write_text("echo failed; sleep 30\n")
+    monitor, _ = _stop_on("failed")
+    start = time.perf_counter()
+
+    with pytest.raises(_Failed):
+        asyncio.run(
+            mtr.Engine("sh").execute_async(
+                mtr.IO("job.in", "job.out", tmp_path), monitors=[monitor]
+            )
+        )
+
+    assert time.perf_counter() - start < 10
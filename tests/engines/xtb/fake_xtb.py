@@ -0,0 +1,27 @@
+"""Stand-in for the xtb executable.
+
+Reads an xyz file, "optimizes" it by contracting all positions by 10% and
+writes the result to xtbopt.xyz in the working directory, like xtb --opt.
+Structures containing helium fail without writing a result.
+"""
+import sys
+
+coord, *arguments = sys.argv[1:]
+assert "--opt" in arguments
+
+with open(coord, "r") as f:
+    num_atoms = int(f.readline())
+    f.readline()
+    atoms = [f.readline().split() for _ in range(num_atoms)]
+
+if any(symbol == "He" for symbol, *_ in atoms):
+    print("abnormal termination of xtb")
+    sys.exit(1)
+
+with open("xtbopt.xyz", "w") as f:
+    f.write(f"{num_atoms}\n\n")
+    for symbol, *position in atoms:
+        x, y, z = (0.9 * float(p) for p in position)
+        f.write(f"{symbol} {x} {y} {z}\n")
+
+print("optimized geometry written to: xtbopt.xyz")
@@ -0,0 +1,86 @@
+import materia as mtr
+import numpy as np
+import pathlib
+import pytest
+import subprocess
+import sys
+
+FAKE_XTB = f"{sys.executable} {pathlib.Path(__file__).with_name('fake_xtb.py')}"
+
+
+def _structure(i):
+    return mtr.Structure.from_arrays(
+        ["O", "H", "H"],
+        [[0.0, 0.0, 0.1 * i], [0.0, 0.76, -0.47], [0.0, -0.76, -0.47]],
+    )
+
+
+def test_xtb_optimize(tmp_path):
+    engine = mtr.XTB(executable=FAKE_XTB)
+    task = engine.optimize(io=mtr.IO(out="xtb.out", work_dir=tmp_path))
+
+    molecule = task.compute(mtr.Molecule(_structure(1)))
+
+    assert np.allclose(
+        molecule.structure.atomic_positions.value,
+        0.9 * _structure(1).atomic_positions.value,
+    )
+
+
+def test_xtb_optimize_structures(tmp_path):
+    engine = mtr.XTB(executable=FAKE_XTB)
+    structures = [_structure(i) for i in range(12)]
+
+    optimized = engine.optimize_structures(
+        structures, tmp_path, limiter=mtr.ExecutionLimiter(max_executions=4)
+    )
+
+    assert len(optimized) == 12
+    for s, opt in zip(structures, optimized):
+        assert opt.atomic_symbols == s.atomic_symbols
+        assert np.allclose(opt.atomic_positions.value, 0.9 * s.atomic_positions.value)
+    assert (tmp_path / "11" / "xtb.out").exists()
+
+
+def test_xtb_optimize_many(tmp_path):
+    engine = mtr.XTB(executable=FAKE_XTB)
+    task = engine.optimize_many(io=mtr.IO(out="opt.out", work_dir=tmp_path))
+
+    molecules = task.compute(mtr.Molecule(_structure(i)) for i in range(3))
+
+    assert np.allclose(
+        [m.structure.atomic_positions.value[2, 0] for m in molecules],
+        [0.0, 0.09, 0.18],
+    )
+
+
+def test_xtb_optimize_structures_failure(tmp_path):
+    engine = mtr.XTB(executable=FAKE_XTB)
+    failing = mtr.Structure.from_arrays(["He"], [[0.0, 0.0, 0.0]])
+    structures = [_structure(0), failing, _structure(2)]
+
+    optimized = engine.optimize_structures(structures, tmp_path)
+
+    assert isinstance(optimized[1], subprocess.CalledProcessError)
+    assert np.allclose(optimized[2].atomic_positions.value[2, 0], 0.18)
+
+
+class StopOnSuccess(mtr.Handler):
+    def check(self, result, task):
+        return False
+
+    def check_line(self, line, task):
+        return line.startswith("optimized geometry")
+
+    def handle(self, result, task):
+        return []
+
+
+def test_xtb_optimize_many_handlers(tmp_path):
+    engine = mtr.XTB(executable=FAKE_XTB)
+    task = engine.optimize_many(
+        io=mtr.IO(out="opt.out", work_dir=tmp_path), handlers=[StopOnSuccess()]
+    )
+
+    with pytest.raises(mtr.ActionSignal):
+        task.compute([mtr.Molecule(_structure(i)) for i in range(2)])
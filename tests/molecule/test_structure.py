@@ -1,7 +1,9 @@
 import collections
 import unittest.mock as mock
 import numpy as np
+import pickle
 import pytest
+import rdkit.Chem
 
 import materia as mtr
 
@@ -77,6 +79,147 @@ def test_structure_h2o():
     assert h2o.inertia_tensor.dimension == check_result_inertia_tensor.dimension
 
 
+def test_structure_from_arrays():
+    positions = np.array([[0.757, 0.586, 0.0], [-0.757, 0.586, 0.0], [0.0, 0.0, 0.0]])
+    h2o = mtr.Structure.from_arrays(["H", "H", 8], positions, mtr.angstrom)
+
+    assert h2o.num_atoms == 3
+    assert h2o.atomic_numbers == (1, 1, 8)
+    assert h2o.atomic_symbols == ("H", "H", "O")
+    assert np.allclose(h2o.atomic_positions.value, positions.T)
+    assert h2o.atomic_positions.unit == mtr.angstrom
+    assert np.allclose(h2o.atomic_masses.value, [1.008, 1.008, 15.999])
+
+    atoms = h2o.atoms
+    assert [a.atomic_symbol for a in atoms] == ["H", "H", "O"]
+    assert np.allclose(atoms[0].position.value.ravel(), positions[0])
+    assert atoms[0].position.unit == mtr.angstrom
+
+
+def test_structure_from_arrays_matches_atoms():
+    atoms = (
+        mtr.Atom(element="H", position=(0.757, 0.586, 0.000) * mtr.angstrom),
+        mtr.Atom(element="H", position=(-0.757, 0.586, 0.000) * mtr.angstrom),
+        mtr.Atom(element="O", position=(0.000, 0.000, 0.000) * mtr.angstrom),
+    )
+    from_atoms = mtr.Structure(*atoms)
+    from_arrays = mtr.Structure.from_arrays(
+        from_atoms.atomic_numbers, from_atoms.atomic_positions.T
+    )
+
+    assert from_arrays.atomic_symbols == from_atoms.atomic_symbols
+    assert np.allclose(
+        from_arrays.inertia_tensor.value, from_atoms.inertia_tensor.value
+    )
+
+
+def test_structure_from_arrays_mismatch():
+    with pytest.raises(ValueError):
+        mtr.Structure.from_arrays([1, 1], np.zeros((3, 3)))
+
+
+def test_structure_add():
+    h = mtr.Structure.from_arrays([1], np.zeros((1, 3)), mtr.angstrom)
+    o = mtr.Structure.from_arrays([8], np.ones((1, 3)), mtr.nm)
+
+    ho = h + o
+
+    assert ho.atomic_symbols == ("H", "O")
+    assert np.allclose(ho.atomic_positions.convert(mtr.angstrom).value[:, 1], 10)
+    assert ho.element_substructure(8).atomic_symbols == ("O",)
+
+
+def _water():
+    return mtr.Structure.from_arrays(
+        ["O", "H", "H"],
+        np.array([[0.0, 0.0, 0.1173], [0.0, 0.7572, -0.4692], [0.0, -0.7572, -0.4692]]),
+        mtr.angstrom,
+    )
+
+
+def test_structure_bonds():
+    assert _water().bonds == {0: [1, 2], 1: [0], 2: [0]}
+
+
+def test_structure_to_graph():
+    g = _water().to_graph()
+    assert sorted(g.edges) == [(0, 1), (0, 2)]
+
+    g = _water().to_graph(explicit_hydrogen=False)
+    assert list(g.nodes(data="num_H")) == [(0, 2)]
+    assert g.nodes[0]["Z"] == 8
+
+
+def test_covalent_connectivity_matches_brute_force():
+    rng = np.random.default_rng(0)
+    numbers = rng.choice([1, 6, 8], size=200)
+    positions = 10 * rng.random((200, 3))
+
+    ac = mtr.covalent_connectivity(numbers, positions).toarray()
+
+    pt = rdkit.Chem.GetPeriodicTable()
+    radii = 1.3 * np.array([pt.GetRcovalent(int(Z)) for Z in numbers])
+    d = np.linalg.norm(positions[:, None] - positions[None], axis=-1)
+    expected = (d <= radii[:, None] + radii[None]) & ~np.eye(200, dtype=bool)
+
+    assert (ac == expected).all()
+
+
+def test_xyz2mol_polyene_bond_orders():
+    # zig-zag chain of sp2 carbons, each with one hydrogen, capped at both ends
+    n = 100
+    numbers, positions = [], []
+    for i in range(n):
+        x, y = 1.25 * i, 0.7 * (i % 2)
+        numbers += [6, 1]
+        positions += [(x, y, 0.0), (x, y + (1.08 if i % 2 else -1.08), 0.0)]
+    numbers += [1, 1]
+    positions += [(-1.0, 0.0, 0.0), (1.25 * (n - 1) + 1.0, 0.7, 0.0)]
+
+    mol = mtr.xyz2mol(numbers, 0, np.array(positions))
+
+    bond_types = collections.Counter(str(b.GetBondType()) for b in mol.GetBonds())
+    assert bond_types == {"SINGLE": n + 2 + n // 2 - 1, "DOUBLE": n // 2}
+
+
+def test_structure_distance_matrix():
+    d = _water().distance_matrix
+
+    assert d.unit == mtr.angstrom ** 2
+    assert d.value[1, 2] == pytest.approx(1.5144 ** 2)
+    assert np.allclose(np.diag(d.value), 0)
+
+
+def test_structure_neighbor_pairs():
+    pairs, d = _water().neighbor_pairs(1.0 * mtr.angstrom)
+
+    assert pairs.tolist() == [[0, 1], [0, 2]]
+    assert d.unit == mtr.angstrom
+    assert np.allclose(d.value, np.sqrt(0.7572 ** 2 + 0.5865 ** 2))
+
+    pairs, _ = _water().neighbor_pairs(0.1 * mtr.nm)
+    assert len(pairs) == 2
+
+
+def test_structure_sparse_distance_matrix():
+    water = _water()
+    sparse = water.sparse_distance_matrix(1.0 * mtr.angstrom).toarray()
+    dense = np.sqrt(water.distance_matrix.value)
+
+    assert np.allclose(sparse, np.where(dense <= 1.0, dense, 0))
+
+
+def test_structure_distance_matrix_blocks():
+    water = _water()
+    blocks = list(water.distance_matrix_blocks(chunk_size=2))
+
+    assert [rows for rows, _ in blocks] == [slice(0, 2), slice(2, 3)]
+    assert all(b.unit == water.distance_matrix.unit for _, b in blocks)
+    assert np.allclose(
+        np.vstack([b.value for _, b in blocks]), water.distance_matrix.value
+    )
+
+
 def test_structure_generate_no_kwargs():
     try:
         mtr.Structure.generate()
@@ -147,3 +290,22 @@ def test_structure_retrieve_smiles():
 #     )
 #     assert structure.atomic_positions.unit == mtr.angstrom
 #     assert structure.atomic_symbols == ("C", "H", "H", "H", "H")
+
+
+def test_structure_pickle_independent_of_construction_and_use():
+    positions = np.array([[0.0, 0.0, 0.1173], [0.0, 0.7572, -0.4692]])
+    from_atoms = mtr.Structure(
+        *(
+            mtr.Atom(element=e, position=p * mtr.angstrom)
+            for e, p in zip("OH", positions)
+        )
+    )
+    from_arrays = mtr.Structure.from_arrays(["O", "H"], positions)
+    expected = pickle.dumps(from_arrays)
+
+    assert pickle.dumps(from_atoms) == expected
+
+    from_arrays.atoms
+    from_arrays.connectivity
+    assert pickle.dumps(from_arrays) == expected
+    assert pickle.loads(expected).atomic_symbols == ("O", "H")
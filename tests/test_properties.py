@@ -1,5 +1,6 @@
 import materia as mtr
 import numpy as np
+from pytest import approx
 
 
 def test_property_dipole():
@@ -32,3 +33,65 @@ def test_property_polarizability():
     assert p.anisotropy.unit == check_result_anisotropy.unit
     assert np.allclose(p.eigenvalues.value, check_result_eigenvalues.value)
     assert p.eigenvalues.unit == check_result_eigenvalues.unit
+
+
+def _excitation_spectrum(energies, strengths):
+    return mtr.ExcitationSpectrum(
+        [
+            mtr.Excitation(energy=e * mtr.eV, oscillator_strength=f)
+            for e, f in zip(energies, strengths)
+        ]
+    )
+
+
+def test_property_excitation_spectrum_broaden():
+    spectrum = _excitation_spectrum([3.0, 4.0], [0.5, 1.0])
+    energies = np.linspace(2, 5, 7) * mtr.eV
+    sigma = 0.2 * mtr.eV
+
+    x = energies.value[None, :] - np.array([3.0, 4.0])[:, None]
+    check_result = (np.array([0.5, 1.0]) @ np.exp(-0.5 * (x / 0.2) ** 2)) / (
+        0.2 * np.sqrt(2 * np.pi)
+    )
+
+    broadened = spectrum.broaden(sigma)(energies)
+
+    assert broadened.dimension == (1 / mtr.eV).dimension
+    assert np.allclose(broadened.convert(1 / mtr.eV).value, check_result)
+
+
+def test_property_broaden_lines_normalized():
+    x = np.linspace(-50, 50, 200001)
+
+    for sigma, gamma in ((0.5, None), (None, 0.5), (0.3, 0.2)):
+        y = mtr.broaden_lines([0.0], [2.0], x, sigma=sigma, gamma=gamma)
+        assert np.trapz(y, x) == approx(2.0, rel=1e-2)
+
+
+def test_property_broaden_lines_chunked():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 10, (3, 40))
+    strengths = rng.random((3, 40))
+    x = np.linspace(0, 10, 50)
+
+    full = mtr.broaden_lines(centers, strengths, x, sigma=0.3, gamma=0.1)
+    chunked = mtr.broaden_lines(
+        centers, strengths, x, sigma=0.3, gamma=0.1, chunk_size=100
+    )
+
+    assert full.shape == (3, 50)
+    assert np.allclose(full, chunked)
+
+
+def test_property_excitation_spectrum_broaden_many():
+    spectra = [
+        _excitation_spectrum([3.0, 4.0], [0.5, 1.0]),
+        _excitation_spectrum([3.5], [0.2]),
+    ]
+    energies = np.linspace(2, 5, 7) * mtr.eV
+    sigma = 0.2 * mtr.eV
+
+    many = mtr.ExcitationSpectrum.broaden_many(spectra, energies, sigma)
+
+    for row, spectrum in zip(many.value, spectra):
+        assert np.allclose(row, spectrum.broaden(sigma)(energies).value)
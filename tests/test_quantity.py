@@ -1,5 +1,7 @@
 import materia as mtr
 import numpy as np
+import pickle
+import pytest
 from pytest import approx
 
 
@@ -282,6 +284,193 @@ def test_qty_int_list_index_10():
     assert qty.index(5 * mtr.meter) == 4
 
 
+def test_dimension_interned():
+    assert mtr.Dimension(L=1) is mtr.Dimension(L=1)
+    assert mtr.Dimension(L=1) * mtr.Dimension(T=-1) is mtr.Dimension(L=1, T=-1)
+
+
+def test_dimension_pickle():
+    dimension = mtr.Dimension(L=2, M=1, T=-2)
+
+    assert pickle.loads(pickle.dumps(dimension)) is dimension
+
+
+def test_qty_unit_shared():
+    q1 = 2 * mtr.angstrom
+    q2 = np.array([1, 2]) * mtr.angstrom
+
+    assert q1.unit is q2.unit
+    assert q1.unit == mtr.angstrom
+
+
+def test_qty_inplace_does_not_modify_unit():
+    q = (2 * mtr.meter).unit
+    q *= 3
+    q += 1 * mtr.meter
+
+    assert q.value == 4
+    assert (2 * mtr.meter).unit.value == 1
+
+
+def test_qty_inplace_modifies_value():
+    q = np.array([1.0, 2.0]) * mtr.meter
+    alias = q
+    q += 1 * mtr.meter
+    q *= mtr.second
+
+    assert alias is q
+    assert alias.value == approx([2.0, 3.0])
+    assert alias.dimension == mtr.Dimension(L=1, T=1)
+
+
+def test_qty_inplace_does_not_modify_module_unit():
+    q = mtr.meter
+    q *= 2
+
+    assert q.value == 2
+    assert mtr.meter.value == 1
+
+
+def test_qty_transpose_copies():
+    q = np.array([[1.0, 2.0]]) * mtr.meter
+    t = q.T
+    t.value[0, 0] = 5.0
+
+    assert t.shape == (2, 1)
+    assert q.value[0, 0] == 1.0
+
+
+def test_qty_add_converts_units():
+    total = 1 * mtr.meter + 50 * mtr.cm
+
+    assert total.value == approx(1.5)
+    assert total.unit == mtr.meter
+
+
+def test_qty_pickle():
+    q = np.array([1.0, 2.0]) * mtr.angstrom
+
+    assert pickle.loads(pickle.dumps(q)) == q
+
+
+def test_qty_ufunc_same_unit():
+    q = np.array([1.0, -2.0]) * mtr.angstrom
+
+    assert np.abs(q) == np.array([1.0, 2.0]) * mtr.angstrom
+    assert np.add(q, 1 * mtr.nm).convert(mtr.angstrom).value == approx([11.0, 8.0])
+
+
+def test_qty_ufunc_dimension_propagation():
+    q = np.array([4.0, 9.0]) * mtr.meter
+
+    assert np.sqrt(q).dimension == mtr.Dimension(L=0.5)
+    assert np.square(q).dimension == mtr.Dimension(L=2)
+    assert np.power(q, 3).dimension == mtr.Dimension(L=3)
+    assert np.multiply(q, 2 * mtr.second).dimension == mtr.Dimension(L=1, T=1)
+    assert np.divide(q, 2 * mtr.second).dimension == mtr.Dimension(L=1, T=-1)
+
+
+def test_qty_ufunc_ndarray_operand():
+    q = np.array([1.0, 2.0]) * mtr.meter
+
+    assert np.array([2.0, 3.0]) * q == np.array([2.0, 6.0]) * mtr.meter
+    with pytest.raises(ValueError):
+        np.array([2.0, 3.0]) + q
+
+
+def test_qty_ufunc_dimensionless():
+    ratio = (1 * mtr.nm) / (5 * mtr.angstrom)
+
+    assert np.exp(ratio).value == approx(np.exp(2))
+    with pytest.raises(ValueError):
+        np.exp(1 * mtr.meter)
+
+
+def test_qty_ufunc_comparison():
+    q = np.array([1.0, 20.0]) * mtr.angstrom
+
+    assert np.less(q, 1 * mtr.nm).tolist() == [True, False]
+    assert np.array_equal(q > 1 * mtr.nm, [False, True])
+
+
+def test_qty_array_function_reductions():
+    q = np.array([3.0, 4.0]) * mtr.angstrom
+
+    assert np.sum(q) == 7.0 * mtr.angstrom
+    assert np.mean(q) == 3.5 * mtr.angstrom
+    assert np.max(q) == 4.0 * mtr.angstrom
+    assert np.linalg.norm(q) == 5.0 * mtr.angstrom
+    assert np.var(q).dimension == mtr.Dimension(L=2)
+    assert np.argmax(q) == 1
+
+
+def test_qty_array_function_concatenate():
+    q = np.concatenate([np.array([1.0]) * mtr.nm, np.array([5.0]) * mtr.angstrom])
+
+    assert q.unit == mtr.nm
+    assert q.value == approx([1.0, 0.5])
+
+
+def test_qty_array_function_products():
+    a = np.array([1.0, 2.0]) * mtr.meter
+    b = np.array([3.0, 4.0]) * mtr.newton
+
+    assert np.dot(a, b) == 11.0 * mtr.joule
+    assert np.trapz(np.ones(2) * mtr.newton, a).dimension == mtr.joule.dimension
+
+
+def test_qty_array_function_multiplicative():
+    q = np.array([[1.0, 2.0], [3.0, 4.0]]) * mtr.meter
+
+    assert np.prod(q).dimension == mtr.Dimension(L=4)
+    assert np.prod(q, axis=0).value == approx([3.0, 8.0])
+    assert np.prod(q, axis=0).dimension == mtr.Dimension(L=2)
+    assert np.einsum("ij,j->i", q, np.ones(2) * mtr.newton).dimension == (
+        mtr.joule.dimension
+    )
+    assert np.linalg.det(q).dimension == mtr.Dimension(L=2)
+    assert np.linalg.inv(q).dimension == mtr.Dimension(L=-1)
+    assert np.linalg.solve(q, np.ones(2) * mtr.joule).dimension == (
+        mtr.newton.dimension
+    )
+
+
+def test_qty_array_function_structural():
+    q = np.array([2.0, 1.0, 2.0, 4.0]) * mtr.meter
+    m = np.array([[2.0, 1.0], [1.0, 2.0]]) * mtr.eV
+
+    values, counts = np.unique(q, return_counts=True)
+    assert values.unit == mtr.meter and values.value == approx([1.0, 2.0, 4.0])
+    assert counts.tolist() == [1, 2, 1]
+    assert [p.unit for p in np.split(q, 2)] == [mtr.meter, mtr.meter]
+
+    w, v = np.linalg.eigh(m)
+    assert w.unit == mtr.eV and w.value == approx([1.0, 3.0])
+    assert not isinstance(v, mtr.Quantity)
+    assert np.linalg.eigh(m).eigenvalues.unit == mtr.eV
+
+    x, t = np.meshgrid(q, np.arange(3.0) * mtr.second)
+    assert x.unit == mtr.meter and t.unit == mtr.second
+
+    assert np.cov(q).dimension == mtr.Dimension(L=2)
+    assert np.gradient(q, 2 * mtr.second).dimension == mtr.Dimension(L=1, T=-1)
+    assert np.gradient(q, 2 * mtr.second).value == approx([-0.5, 0.0, 0.75, 1.0])
+
+    hist, edges = np.histogram(q, bins=3)
+    assert hist.tolist() == [1, 2, 1]
+    assert edges.unit == mtr.meter
+
+
+def test_qty_array_function_without_unit_rule():
+    q = np.array([1.0, 2.0]) * mtr.meter
+
+    assert np.shape(q) == (2,)
+    # functions without unit rules only accept dimensionless quantities
+    assert np.cumprod(q / mtr.cm).tolist() == approx([100.0, 20000.0])
+    with pytest.raises(TypeError):
+        np.cumprod(q)
+
+
 # def test_unit_meter():
 #     test_unit = mtr.Unit(L=1, value=1)
 
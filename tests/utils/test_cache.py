@@ -0,0 +1,84 @@
+import gc
+import materia as mtr
+import numpy as np
+import pickle
+import weakref
+
+
+class Counter(mtr.Cached):
+    def __init__(self, value):
+        self.value = value
+        self._calls = 0
+
+    @mtr.cached_property
+    def double(self):
+        self._calls += 1
+        return 2 * self.value
+
+    @mtr.cached_method(maxsize=2)
+    def scale(self, factor):
+        self._calls += 1
+        return factor * self.value
+
+
+def test_cached_property_per_instance():
+    a, b = Counter(1), Counter(2)
+
+    assert a.double == 2
+    assert a.double == 2
+    assert b.double == 4
+
+
+def test_cached_property_invalidated_on_assignment():
+    c = Counter(1)
+
+    assert c.double == 2
+    c.value = 5
+    assert c.double == 10
+
+
+def test_invalidate():
+    c = Counter(np.array([1.0]))
+
+    assert c.double[0] == 2
+    c.value[0] = 3.0
+    assert c.double[0] == 2
+
+    mtr.invalidate(c, "double")
+    assert c.double[0] == 6
+
+
+def test_cached_method_lru():
+    c = Counter(1)
+
+    c.scale(1)
+    c.scale(2)
+    c.scale(1)
+    c.scale(3)
+    calls = c._calls
+
+    # 2 was least recently used and has been evicted
+    c.scale(1)
+    assert c._calls == calls
+    c.scale(2)
+    assert c._calls == calls + 1
+
+
+def test_cached_property_does_not_keep_instance_alive():
+    c = Counter(1)
+    c.double
+    ref = weakref.ref(c)
+
+    del c
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_cached_values_not_pickled():
+    c = Counter(1)
+    c.double
+
+    copy = pickle.loads(pickle.dumps(c))
+    assert copy.double == 2
+    assert copy._calls == 2
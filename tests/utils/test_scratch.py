@@ -0,0 +1,70 @@
+import materia as mtr
+import os
+import pickle
+import pytest
+import threading
+import time
+
+
+def test_scratch_allocations_unique_and_cleaned(tmp_path):
+    scratch = mtr.ScratchManager(root=tmp_path)
+
+    with scratch.allocate() as a, scratch.allocate() as b:
+        assert a != b
+        assert os.path.dirname(a) == scratch.directory
+        with open(os.path.join(a, "file"), "w") as f:
+            f.write("x" * 10)
+        assert scratch.usage() == 10
+
+    assert not os.path.exists(a)
+    assert not os.path.exists(b)
+
+
+def test_scratch_quota(tmp_path):
+    scratch = mtr.ScratchManager(root=tmp_path, quota=100, job_size=60)
+    peak = []
+
+    def job():
+        with scratch.allocate():
+            peak.append(scratch.reserved)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=job) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 60
+    assert scratch.reserved == 0
+    with pytest.raises(ValueError):
+        with scratch.allocate(size=200):
+            pass
+
+
+def test_scratch_manager_pickle(tmp_path):
+    scratch = mtr.ScratchManager(root=tmp_path, quota=100)
+
+    with scratch.allocate(size=50):
+        copy = pickle.loads(pickle.dumps(scratch))
+
+    assert copy.quota == 100
+    assert copy.reserved == 0
+
+
+def test_io_scratch_dir(tmp_path):
+    io = mtr.IO(
+        "job.in", "job.out", tmp_path / "work", scratch=mtr.ScratchManager(tmp_path)
+    )
+
+    with io() as outer:
+        assert os.path.isdir(outer.scratch_dir)
+        with io() as inner:
+            assert inner.scratch_dir == outer.scratch_dir
+
+        env = mtr.QChem()._env(outer)
+        assert env["QCSCRATCH"] == outer.scratch_dir
+
+    assert not os.path.exists(outer.scratch_dir)
+    with mtr.IO(work_dir=tmp_path)() as plain:
+        assert plain.scratch_dir is None
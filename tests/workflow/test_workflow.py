@@ -1,5 +1,9 @@
+import dask
 import materia as mtr
 import numpy as np
+import os
+import pytest
+import time
 import unittest
 
 # TEST TASKS
@@ -168,3 +172,465 @@ def test_workflow_multiply_linear():
     assert results["mul1"] == 6
     assert results["mul2"] == -6
     assert results["mul3"] == -60
+
+
+CALLS = []
+
+
+def _record_add(x, y):
+    CALLS.append((x, y))
+    return x + y
+
+
+def test_result_cache_reused_across_workflows(tmp_path):
+    CALLS.clear()
+    cache = mtr.ResultCache(tmp_path)
+
+    for _ in range(2):
+        f = mtr.FunctionTask(_record_add)
+        g = Mul(name="g")
+        f.requires(x=1, y=3)
+        g.requires(a=f, b=-1)
+
+        results = mtr.Workflow(g).compute(cache=cache).results
+        assert results[f.name] == 4
+        assert results["g"] == -4
+
+    assert CALLS == [(1, 3)]
+
+
+def test_result_cache_distinguishes_closures_and_lambdas(tmp_path):
+    def make(n):
+        def add(x):
+            return x + n
+
+        return add
+
+    cache = mtr.ResultCache(tmp_path)
+    functions = [make(1), make(100), lambda x: x * 2, lambda x: x * 3]
+
+    results = []
+    for _ in range(2):
+        for f in functions:
+            t = mtr.FunctionTask(f, name="f")
+            t.requires(x=5)
+            results.append(mtr.Workflow(t).compute(cache=cache)["f"])
+
+    assert results == [6, 105, 10, 15] * 2
+
+
+def test_result_cache_skips_unidentifiable_functions(tmp_path):
+    def f(x):
+        return g(x)
+
+    assert mtr.FunctionTask(f).fingerprint() is None
+    t = mtr.FunctionTask(f, name="f")
+    t.requires(x=1)
+
+    assert mtr.ResultCache(tmp_path).key(t) is None
+
+    def g(x):
+        return x
+
+
+def test_result_cache_keys_depend_on_inputs_and_version(tmp_path):
+    a = Mul(name="a")
+    a.requires(a=2, b=3)
+    b = Mul(name="b")
+    b.requires(a=2, b=4)
+
+    cache = mtr.ResultCache(tmp_path)
+
+    assert cache.key(a) != cache.key(b)
+    assert cache.key(a) != mtr.ResultCache(tmp_path, version="1.0").key(a)
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = mtr.ResultCache(tmp_path)
+    cache["aa"] = np.zeros(1000)
+    cache["bb"] = np.zeros(1000)
+    cache["cc"] = np.zeros(1000)
+
+    os.utime(cache._path("aa"), (0, 0))
+    cache.evict(2 * cache.size() // 3)
+
+    assert "aa" not in cache
+    assert "bb" in cache
+    assert "cc" in cache
+
+
+def test_workflow_incremental_recomputes_only_dirty_tasks():
+    calls = []
+
+    class Record(mtr.Task):
+        def compute(self, a, b):
+            calls.append(self.name)
+            return a * b
+
+    mul1 = Record(name="mul1")
+    mul2 = Record(name="mul2")
+    mul3 = Record(name="mul3")
+
+    mul1.requires(a=2, b=3)
+    mul2.requires(a=5, b=-1)
+    mul3.requires(a=mul1, b=mul2)
+
+    wf = mtr.Workflow(mul3)
+    previous = wf.compute()
+    assert sorted(calls) == ["mul1", "mul2", "mul3"]
+
+    calls.clear()
+    mul2.named_requirements["b"] = mtr.InputTask(2)
+
+    wf = mtr.Workflow(mul3)
+    assert sorted(wf.dirty(previous)) == ["mul2", "mul3"]
+
+    results = wf.compute(previous=previous).results
+    assert sorted(calls) == ["mul2", "mul3"]
+    assert results["mul1"] == 6
+    assert results["mul2"] == 10
+    assert results["mul3"] == 60
+
+
+def test_workflow_incremental_recomputes_changed_functions():
+    def build(f):
+        t = mtr.FunctionTask(f, name="f")
+        t.requires(x=5)
+        return mtr.Workflow(t)
+
+    previous = build(lambda x: x * 2).compute()
+    wf = build(lambda x: x * 7)
+
+    assert wf.dirty(previous) == ["f"]
+    assert wf.compute(previous=previous)["f"] == 35
+    assert build(lambda x: x * 2).dirty(previous) == []
+
+
+def test_workflow_results_fingerprint_inputs_before_compute():
+    class Pop(mtr.Task):
+        def compute(self, values):
+            return values.pop()
+
+    values = mtr.InputTask([1, 2, 3], name="values")
+    p = Pop(name="pop")
+    p.requires(values=values)
+
+    wf = mtr.Workflow(p)
+    previous = wf.compute()
+    values.value = [1, 2, 3]
+
+    assert wf.dirty(previous) == []
+
+
+def test_workflow_fingerprint_ignores_attribute_order():
+    a = mtr.InputTask(None, name="a")
+    a.value = mtr.Settings()
+    b = mtr.InputTask(None, name="a")
+    b.value = mtr.Settings()
+    a.value.x, a.value.y = 1, 2
+    b.value.y, b.value.x = 2, 1
+
+    assert mtr.Workflow(a).fingerprints() == mtr.Workflow(b).fingerprints()
+
+
+def test_workflow_processes_scheduler():
+    mul1 = Mul(name="mul1")
+    mul1.requires(a=2, b=3)
+    mul2 = Mul(name="mul2")
+    mul2.requires(a=mul1, b=-1)
+
+    with dask.config.set(scheduler="processes", num_workers=2):
+        results = mtr.Workflow(mul2).compute(resources={"cores": 1})
+
+    assert results["mul2"] == -6
+
+
+def test_workflow_fingerprint_ignores_settings_order():
+    a = mtr.Settings()
+    a["rem", "basis"] = "def2-svp"
+    a["rem", "exchange"] = "b3lyp"
+    a["molecule", "charge"] = 0
+    b = mtr.Settings()
+    b["molecule", "charge"] = 0
+    b["rem", "exchange"] = "b3lyp"
+    b["rem", "basis"] = "def2-svp"
+
+    fingerprint = mtr.Workflow(mtr.InputTask(a, name="s")).fingerprints()
+
+    assert fingerprint == mtr.Workflow(mtr.InputTask(b, name="s")).fingerprints()
+    b["rem", "basis"] = "def2-tzvp"
+    assert fingerprint != mtr.Workflow(mtr.InputTask(b, name="s")).fingerprints()
+
+    c = mtr.InputTask({"x": 1, "y": {2, 3}}, name="s")
+    d = mtr.InputTask({"y": {3, 2}, "x": 1}, name="s")
+    assert mtr.Workflow(c).fingerprints() == mtr.Workflow(d).fingerprints()
+
+
+def test_workflow_resources_limit_concurrency():
+    running = []
+    peak = []
+
+    class Sleep(mtr.Task):
+        def compute(self):
+            running.append(self.name)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.remove(self.name)
+            return self.resources["cores"]
+
+    tasks = [Sleep(name=f"s{i}", resources={"cores": 2}) for i in range(6)]
+
+    results = mtr.Workflow(*tasks).compute(resources={"cores": 4}).results
+
+    assert all(results[t.name] == 2 for t in tasks)
+    assert max(peak) <= 2
+
+
+def test_workflow_as_completed_checkpoints_results(tmp_path):
+    slow = mtr.FunctionTask(lambda: time.sleep(0.2) or "slow", name="slow")
+    fast = mtr.FunctionTask(lambda: "fast", name="fast")
+
+    with dask.config.set(num_workers=2):
+        completed = mtr.Workflow(slow, fast).as_completed(checkpoint=tmp_path)
+
+        assert next(completed) == ("fast", "fast")
+        assert mtr.WorkflowResults.load(tmp_path).results == {"fast": "fast"}
+        assert list(completed) == [("slow", "slow")]
+    assert mtr.WorkflowResults.load(tmp_path).results == {
+        "fast": "fast",
+        "slow": "slow",
+    }
+
+
+def test_workflow_as_completed_stops_when_closed():
+    calls = []
+
+    class Record(mtr.Task):
+        def compute(self, previous=None):
+            calls.append(self.name)
+            time.sleep(0.1)
+            return self.name
+
+    a = Record(name="a")
+    b = Record(name="b")
+    b.requires(previous=a)
+    c = Record(name="c")
+    c.requires(previous=b)
+
+    completed = mtr.Workflow(c).as_completed()
+    assert next(completed) == ("a", "a")
+    completed.close()
+    time.sleep(0.3)
+
+    assert "c" not in calls
+
+
+def test_map_tasks(tmp_path):
+    class Scale(mtr.ExternalTask):
+        def compute(self, molecule, factor):
+            with self.io() as io:
+                return io.work_dir, molecule * factor
+
+    def scale(io, name):
+        return Scale(engine=mtr.Engine("true"), io=io, name=name)
+
+    tasks = mtr.map_tasks(scale, range(11), tmp_path, "scale.in", "scale.out", factor=2)
+
+    assert [t.name for t in tasks] == [f"scale-{i:02d}" for i in range(11)]
+    assert len(set(id(t.named_requirements["factor"]) for t in tasks)) == 1
+
+    results = mtr.Workflow(*tasks).compute().results
+
+    for i, t in enumerate(tasks):
+        work_dir, value = results[t.name]
+        assert work_dir == str(tmp_path / f"scale-{i:02d}")
+        assert value == 2 * i
+
+
+def test_discover_tasks_deduplicates_shared_requirements():
+    shared = Mul(name="shared")
+    shared.requires(a=1, b=2)
+
+    tasks = []
+    for i in range(1000):
+        t = Mul(name=f"mul{i}")
+        t.requires(a=shared, b=i)
+        tasks.append(t)
+
+    # 1000 tasks, their 1000 inputs, and the shared task with its 2 inputs
+    assert len(mtr.Workflow(*tasks).tasks) == 2003
+
+
+class Threshold(mtr.Task):
+    def __init__(self, name, handlers=None):
+        super().__init__(name=name, handlers=handlers)
+        self.max_iter = 1
+
+    def compute(self, n):
+        return min(n, self.max_iter)
+
+
+class DoubleMaxIter(mtr.Modify):
+    def modify(self, task):
+        task.max_iter *= 2
+        return task
+
+
+class NotConverged(mtr.Handler):
+    def check(self, result, task):
+        return result < task.max_iter or result < 8
+
+    def handle(self, result, task):
+        return [DoubleMaxIter(), mtr.Rerun()]
+
+
+def test_workflow_handlers_repair_and_rerun_task():
+    t = Threshold(name="t", handlers=[NotConverged()])
+    t.requires(n=100)
+    t2 = Mul(name="t2")
+    t2.requires(a=t, b=10)
+
+    results = mtr.Workflow(t2).compute().results
+
+    assert results["t"] == 8
+    assert results["t2"] == 80
+    # repairs are made to a copy of the task
+    assert t.max_iter == 1
+
+
+def test_workflow_handlers_give_up_after_max_retries():
+    t = Threshold(name="t", handlers=[NotConverged()])
+    t.max_retries = 2
+    t.requires(n=100)
+
+    with pytest.raises(RuntimeError):
+        mtr.Workflow(t).compute()
+
+
+class Identity(mtr.Task):
+    def compute(self, x):
+        return x
+
+
+class Negate(mtr.Task):
+    def compute(self, x):
+        return -x
+
+
+class Negative(mtr.Handler):
+    def check(self, result, task):
+        return result < 0
+
+    def handle(self, result, task):
+        return [mtr.InsertTasks(Negate(name="negate"), requires_kw="x")]
+
+
+def test_workflow_handlers_insert_tasks():
+    identity = Identity(name="identity", handlers=[Negative()])
+    identity.requires(x=-3)
+    mul = Mul(name="mul")
+    mul.requires(a=identity, b=2)
+
+    results = mtr.Workflow(mul).compute().results
+
+    assert results["identity"] == 3
+    assert results["mul"] == 6
+
+
+class Script(mtr.ExternalTask):
+    def __init__(self, engine, io, name=None, handlers=None):
+        super().__init__(engine=engine, io=io, name=name, handlers=handlers)
+        self.script = "echo diverged; sleep 30"
+
+    def compute(self):
+        with self.io() as io:
+            with open(io.inp, "w") as f:
+                f.write(self.script)
+            return self.engine.execute(
+                self.io, return_output=True, monitors=self.monitors()
+            )
+
+
+class FixScript(mtr.Modify):
+    def modify(self, task):
+        task.script = "echo converged"
+        return task
+
+
+class Diverged(mtr.Handler):
+    def check(self, result, task):
+        return False
+
+    def check_line(self, line, task):
+        return line == "diverged"
+
+    def handle(self, result, task):
+        return [FixScript(), mtr.Rerun()]
+
+
+def test_workflow_handlers_stop_running_task(tmp_path):
+    io = mtr.IO("script.sh", "script.out", tmp_path)
+    t = Script(engine=mtr.Engine("sh"), io=io, name="t", handlers=[Diverged()])
+    start = time.perf_counter()
+
+    results = mtr.Workflow(t).compute().results
+
+    assert results["t"] == "converged\n"
+    assert time.perf_counter() - start < 10
+
+
+class ParsedScript(Script):
+    def __init__(self, engine, io, name=None, handlers=None):
+        super().__init__(engine=engine, io=io, name=name, handlers=handlers)
+        self.script = "echo diverged"
+
+    def compute(self):
+        output = super().compute()
+        if "diverged" in output:
+            raise ValueError("Script diverged.")
+
+        return output
+
+
+class DivergedOutput(mtr.Handler):
+    def check(self, result, task):
+        with open(mtr.expand(task.io.out, task.io.work_dir), "r") as f:
+            return "diverged" in f.read()
+
+    def handle(self, result, task):
+        return [FixScript(), mtr.Rerun()]
+
+
+def test_workflow_handlers_repair_failed_temporary_task(tmp_path):
+    io = mtr.IO("script.sh", "script.out", tmp_path, temp=True)
+    t = ParsedScript(
+        engine=mtr.Engine("sh"), io=io, name="t", handlers=[DivergedOutput()]
+    )
+
+    results = mtr.Workflow(t).compute().results
+
+    assert results["t"] == "converged\n"
+    assert os.listdir(tmp_path) == []
+    assert t.script == "echo diverged"
+
+
+def test_workflow_handlers_do_not_copy_upstream_tasks():
+    class Uncopyable(mtr.InputTask):
+        def __deepcopy__(self, memo):
+            raise AssertionError("Upstream tasks must not be copied.")
+
+    class Never(mtr.Handler):
+        def check(self, result, task):
+            return False
+
+        def handle(self, result, task):
+            return []
+
+    class Double(mtr.Task):
+        def compute(self, x):
+            return 2 * x
+
+    d = Double(name="d", handlers=[Never()])
+    d.requires(x=Uncopyable(3))
+
+    assert mtr.Workflow(d).compute().results["d"] == 6